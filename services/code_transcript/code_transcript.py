@@ -8,6 +8,9 @@ Verwendung (vom Repo-Root):
     python3 services/code_transcript/code_transcript.py interviews/transcripts/IP-01.rtf
     python3 services/code_transcript/code_transcript.py interviews/transcripts/IP-01.rtf --interview-id IP-01
     python3 services/code_transcript/code_transcript.py interviews/transcripts/IP-01.rtf --dry-run
+    python3 services/code_transcript/code_transcript.py interviews/transcripts/IP-01.json
+
+JSON/JSONL-Transkripte (transcribe.py --formats json) werden direkt gelesen, ohne striprtf.
 
 Umgebungsvariablen (in services/.env):
     ANTHROPIC_API_KEY  — Anthropic API-Schlüssel (Claude)
@@ -19,6 +22,7 @@ import json
 import os
 import re
 import sys
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -176,9 +180,49 @@ def _require_env(key: str, hint: str = "") -> str:
     return value
 
 
-# ── RTF-Parser ─────────────────────────────────────────────────────────────────
+# ── Transkript-Parser ──────────────────────────────────────────────────────────
+
+class TranscriptParser(ABC):
+    """Gemeinsame Basis: bildet Sinneinheiten aus den Beiträgen der befragten Person."""
+
+    @abstractmethod
+    def parse(self, path: Path) -> List[Sinneinheit]:
+        ...
+
+    def _add_units(self, units: List[Sinneinheit], text_lines: List[str], timestamp: str) -> None:
+        """Hängt die Sinneinheiten eines Beitrags an (lange Beiträge an Satzgrenzen geteilt)."""
+        text = " ".join(t.strip() for t in text_lines if t.strip())
+        if not text:
+            return
+        for chunk in self._split_sinneinheiten(text):
+            units.append(Sinneinheit(
+                index=len(units) + 1,
+                text=chunk,
+                timestamp=timestamp,
+                raw_lines=text_lines[:],
+            ))
+
+    @staticmethod
+    def _split_sinneinheiten(text: str, max_chars: int = 900) -> List[str]:
+        if len(text) <= max_chars:
+            return [text]
+
+        sentence_end = re.compile(r"(?<=[.!?])\s+")
+        sentences = sentence_end.split(text)
+        chunks: List[str] = []
+        current = ""
+        for sent in sentences:
+            if current and len(current) + len(sent) + 1 > max_chars:
+                chunks.append(current.strip())
+                current = sent
+            else:
+                current = (current + " " + sent).strip() if current else sent
+        if current:
+            chunks.append(current.strip())
+        return chunks if chunks else [text]
 
-class RTFParser:
+
+class RTFParser(TranscriptParser):
     """Extrahiert B:-Sinneinheiten aus MAXQDA-kompatiblen RTF-Transkripten."""
 
     def parse(self, rtf_path: Path) -> List[Sinneinheit]:
@@ -207,22 +251,11 @@ class RTFParser:
         current_speaker: Optional[str] = None
         current_lines: List[str] = []
         current_timestamp = ""
-        unit_index = 0
 
         def flush(speaker: str, text_lines: List[str], ts: str) -> None:
-            nonlocal unit_index
+            # RTF trägt keine Rollen-Metadaten: B, B1, ... ist die befragte Person
             if speaker and speaker.upper().startswith("B"):
-                text = " ".join(t.strip() for t in text_lines if t.strip())
-                if not text:
-                    return
-                for chunk in self._split_sinneinheiten(text):
-                    unit_index += 1
-                    units.append(Sinneinheit(
-                        index=unit_index,
-                        text=chunk,
-                        timestamp=ts,
-                        raw_lines=text_lines[:],
-                    ))
+                self._add_units(units, text_lines, ts)
 
         for line in lines:
             stripped = line.strip()
@@ -251,24 +284,35 @@ class RTFParser:
         flush(current_speaker, current_lines, current_timestamp)
         return units
 
-    @staticmethod
-    def _split_sinneinheiten(text: str, max_chars: int = 900) -> List[str]:
-        if len(text) <= max_chars:
-            return [text]
 
-        sentence_end = re.compile(r"(?<=[.!?])\s+")
-        sentences = sentence_end.split(text)
-        chunks: List[str] = []
-        current = ""
-        for sent in sentences:
-            if current and len(current) + len(sent) + 1 > max_chars:
-                chunks.append(current.strip())
-                current = sent
+class JSONTranscriptParser(TranscriptParser):
+    """
+    Extrahiert Sinneinheiten der befragten Person aus dem strukturierten Transkript von
+    transcribe.py (--formats json/jsonl): Rolle ("role"), Sprecher und Zeitmarke liegen
+    je Absatz bereits vor.
+    """
+
+    def parse(self, path: Path) -> List[Sinneinheit]:
+        with open(path, encoding="utf-8") as f:
+            if path.suffix.lower() == ".jsonl":
+                paragraphs = [json.loads(line) for line in f if line.strip()]
             else:
-                current = (current + " " + sent).strip() if current else sent
-        if current:
-            chunks.append(current.strip())
-        return chunks if chunks else [text]
+                paragraphs = json.load(f)["paragraphs"]
+
+        units: List[Sinneinheit] = []
+        for paragraph in paragraphs:
+            if "role" not in paragraph:
+                raise ValueError(
+                    f"{path.name}: Absatz ohne Rollenangabe ('role') — Transkript mit "
+                    f"aktuellem transcribe.py neu exportieren (--formats json)."
+                )
+            if paragraph["role"] != "interviewee":
+                continue
+            text_lines = [
+                _TIMESTAMP_RE.sub("", line).strip() for line in paragraph["text"].splitlines()
+            ]
+            self._add_units(units, text_lines, paragraph.get("timestamp", ""))
+        return units
 
 
 # ── Kuckartz-Kodierer (Claude API) ────────────────────────────────────────────
@@ -510,7 +554,7 @@ def main() -> None:
     )
     parser.add_argument(
         "rtf_file",
-        help="Pfad zur RTF-Transkriptdatei (aus interviews/transcripts/)",
+        help="Pfad zur Transkriptdatei (.rtf, .json oder .jsonl aus interviews/transcripts/)",
     )
     parser.add_argument(
         "--interview-id",
@@ -536,7 +580,7 @@ def main() -> None:
 
     rtf_path = Path(args.rtf_file)
     if not rtf_path.exists():
-        print(f"\nFehler: RTF-Datei nicht gefunden: {rtf_path}")
+        print(f"\nFehler: Transkriptdatei nicht gefunden: {rtf_path}")
         sys.exit(1)
 
     repo_root = Path(__file__).parent.parent.parent
@@ -547,7 +591,7 @@ def main() -> None:
     print(f"\n{'='*60}")
     print(f"  Code-Transcript-Service — Kuckartz (2018), Phase 3")
     print(f"{'='*60}")
-    print(f"  RTF-Datei   : {rtf_path}")
+    print(f"  Transkript  : {rtf_path}")
     print(f"  Interview-ID: {args.interview_id}")
     print(f"  Ausgabe     : {output_path}")
     if args.dry_run:
@@ -566,19 +610,23 @@ def main() -> None:
 
     model = args.model or os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-6")
 
-    print("[1/3] RTF einlesen und Sinneinheiten extrahieren...")
-    rtf_parser = RTFParser()
+    if rtf_path.suffix.lower() in (".json", ".jsonl"):
+        print("[1/3] JSON-Transkript einlesen und Sinneinheiten extrahieren...")
+        rtf_parser = JSONTranscriptParser()
+    else:
+        print("[1/3] RTF einlesen und Sinneinheiten extrahieren...")
+        rtf_parser = RTFParser()
     try:
         units = rtf_parser.parse(rtf_path)
     except Exception as exc:
-        print(f"  FEHLER beim RTF-Parsing: {exc}")
+        print(f"  FEHLER beim Einlesen des Transkripts: {exc}")
         sys.exit(1)
 
     if not units:
         print("  WARNUNG: Keine B:-Sinneinheiten gefunden.")
         print("  Mögliche Ursachen:")
         print("  - Transkript enthält keine 'B:' Sprechermarkierungen")
-        print("  - RTF-Datei ist leer oder nicht im erwarteten Format")
+        print("  - Transkriptdatei ist leer oder nicht im erwarteten Format")
         print("  - Überprüfe, ob die Datei aus dem /transcribe-Skill stammt")
         sys.exit(1)
 
@@ -0,0 +1,11 @@
+"""
+Tests des Code-Transcript-Service (Parser, ohne API-Aufrufe).
+
+Ausführen im Verzeichnis services/code_transcript:
+    python3 -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
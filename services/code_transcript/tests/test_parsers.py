@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from code_transcript import JSONTranscriptParser, RTFParser
+
+
+def _paragraph(speaker, role, text, timestamp):
+    return {"speaker": speaker, "role": role, "text": text, "timestamp": timestamp}
+
+
+PARAGRAPHS = [
+    _paragraph("I", "interviewer", "Wie erleben Sie das?", "00:00:05"),
+    _paragraph("B", "interviewee", "Gut.\nFazit: es hilft.", "00:00:12"),
+    _paragraph("IP-01", "interviewee", "Als IP-01 gekennzeichnet.", "00:00:20"),
+    _paragraph("Beispiel", "other", "Kein Beitrag der befragten Person.", "00:00:25"),
+]
+
+
+def test_json_parser_selects_paragraphs_by_role(tmp_path):
+    path = tmp_path / "IP-01.json"
+    path.write_text(json.dumps({"paragraphs": PARAGRAPHS}), encoding="utf-8")
+
+    units = JSONTranscriptParser().parse(path)
+    assert [(u.index, u.text, u.timestamp) for u in units] == [
+        (1, "Gut. Fazit: es hilft.", "00:00:12"),
+        (2, "Als IP-01 gekennzeichnet.", "00:00:20"),
+    ]
+
+
+def test_jsonl_parser_matches_json(tmp_path):
+    path = tmp_path / "IP-01.jsonl"
+    path.write_text(
+        "".join(json.dumps({"index": i, **p}) + "\n" for i, p in enumerate(PARAGRAPHS, 1)),
+        encoding="utf-8",
+    )
+    assert [u.text for u in JSONTranscriptParser().parse(path)] == [
+        "Gut. Fazit: es hilft.", "Als IP-01 gekennzeichnet.",
+    ]
+
+
+def test_json_parser_rejects_paragraphs_without_role(tmp_path):
+    path = tmp_path / "alt.json"
+    path.write_text(json.dumps({"paragraphs": [{"speaker": "B", "text": "x", "timestamp": ""}]}))
+    with pytest.raises(ValueError, match="role"):
+        JSONTranscriptParser().parse(path)
+
+
+def test_rtf_segmentation_and_long_contributions_share_unit_logic():
+    long_text = " ".join(f"Satz Nummer {i} ist hier." for i in range(80))
+    lines = [
+        "I: Frage? #00:00:05#",
+        "B: Erste Zeile",
+        "zweite Zeile #00:00:12#",
+        "I: Weiter? #00:00:15#",
+        f"B1: {long_text} #00:01:00#",
+    ]
+    units = RTFParser()._segment(lines)
+    assert units[0].text == "Erste Zeile zweite Zeile" and units[0].timestamp == "00:00:12"
+    assert len(units) > 2
+    assert all(len(u.text) <= 900 for u in units[1:])
+    assert [u.index for u in units] == list(range(1, len(units) + 1))
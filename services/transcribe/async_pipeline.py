@@ -0,0 +1,236 @@
+"""
+asyncio-Variante der Chunk-Pipeline (--async).
+
+Statt zweier Thread-Pools laufen Whisper-Uploads und Claude-Formatierung als
+Coroutinen in einer Event-Loop: AsyncOpenAI und AsyncAnthropic warten auf das Netz,
+ohne je einen Thread zu blockieren. Gleichzeitige Whisper-Anfragen begrenzt ein
+asyncio.Semaphore (whisper_workers); Claude-Anfragen sind wie im Thread-Pool durch
+die Zahl der Ketten begrenzt (format_workers, je Kette eine Anfrage). Ein geteilter
+RateLimiter (Batch) gilt zusätzlich über `async with`.
+
+Asynchron sind nur die Whisper- und Formatierungsaufrufe innerhalb eines Interviews
+(eine Event-Loop je Interview, asyncio.run); Konsistenz-Pass und Pseudonymisierung
+laufen danach synchron, und batch_transcribe.py führt die Interviews weiterhin in
+eigenen Threads mit je einer Loop aus.
+
+Abschnitte, Ketten, Überlapp-Zuordnung, Job-Manifest und Diarisierung verhalten sich
+wie in ChunkPipeline. Nur das Erzeugen der Chunks (ffmpeg) und Datei-I/O laufen im
+Worker-Thread. Backends ohne Async-Client (lokales Whisper) werden über
+asyncio.to_thread eingebunden.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from audio_chunker import AudioChunk
+from chunk_pipeline import ChunkPipeline, PipelineError, _ChunkEntry, tail_context
+from speaker_diarizer import SpeakerTimeline
+
+
+class AsyncChunkPipeline(ChunkPipeline):
+    """ChunkPipeline mit asyncio statt Thread-Pools; gleiche Schnittstelle (run, owned_segments)."""
+
+    def run(self, chunks: Iterable[AudioChunk], total_duration: Optional[float] = None) -> List[str]:
+        """Wie ChunkPipeline.run(), ausgeführt in einer eigenen Event-Loop."""
+        return asyncio.run(self.arun(chunks, total_duration))
+
+    async def arun(
+        self,
+        chunks: Iterable[AudioChunk],
+        total_duration: Optional[float] = None,
+    ) -> List[str]:
+        if total_duration is None:
+            total_duration = max((c.end_time for c in chunks), default=0.0)
+
+        sections = self.sections(total_duration)
+        self._entries = []
+        self._stream_done = False
+        self._changed = asyncio.Condition()
+        self._timeline_lock = asyncio.Lock()
+        self._timeline = None
+        self._openai_slots = asyncio.Semaphore(self.whisper_workers)
+        in_flight = asyncio.Semaphore(2 * self.whisper_workers)
+        blocks: List[str] = [""] * len(sections)
+        transcriptions: List[asyncio.Task] = []
+
+        tasks = [
+            asyncio.create_task(self._aformat_chain(chain, sections, blocks))
+            for chain in self._chains(len(sections))
+        ]
+        tasks.append(asyncio.create_task(self._produce(chunks, in_flight, transcriptions)))
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            failure = next((t.exception() for t in done if t.exception() is not None), None)
+            if failure is not None:
+                raise failure
+        finally:
+            for task in tasks + transcriptions:
+                task.cancel()
+            await asyncio.gather(*tasks, *transcriptions, return_exceptions=True)
+            if isinstance(chunks, list):
+                for chunk in chunks:
+                    chunk.cleanup()
+            for entry in self._entries:
+                entry.chunk.cleanup()
+                if entry.slot.done() and not entry.slot.cancelled():
+                    entry.slot.exception()   # nicht abgeholte Fehler gelten als gemeldet
+
+        return [block for block in blocks if block]
+
+    async def _produce(
+        self,
+        chunks: Iterable[AudioChunk],
+        in_flight: asyncio.Semaphore,
+        transcriptions: List[asyncio.Task],
+    ) -> None:
+        """Erzeugt Chunks (ffmpeg im Worker-Thread) und startet ihre Transkription."""
+        loop = asyncio.get_running_loop()
+        iterator = iter(chunks)
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                await in_flight.acquire()
+                # Abgeschirmt: bei Abbruch läuft next() im Thread weiter und wird unten abgewartet
+                pending = asyncio.ensure_future(asyncio.to_thread(next, iterator, None))
+                try:
+                    chunk = await asyncio.shield(pending)
+                except Exception as exc:
+                    in_flight.release()
+                    raise PipelineError("Audio-Aufteilung", len(self._entries), exc) from exc
+                pending = None
+                if chunk is None:
+                    in_flight.release()
+                    break
+
+                entry = _ChunkEntry(chunk, self._owned_from(chunk), loop.create_future())
+                async with self._changed:
+                    self._entries.append(entry)
+                    self._changed.notify_all()
+
+                stored = self.manifest.whisper_result(chunk) if self.manifest else None
+                if stored is not None:
+                    print(f"      Whisper: Chunk {chunk.index + 1} aus Job-Manifest übernommen.")
+                    chunk.cleanup()
+                    in_flight.release()
+                    entry.slot.set_result(stored)
+                else:
+                    transcriptions.append(asyncio.create_task(self._atranscribe(entry, in_flight)))
+        finally:
+            if pending is not None:
+                # Ein Generator im Schritt lässt sich nicht schließen ("generator already executing")
+                await asyncio.wait([pending])
+                if not pending.cancelled() and pending.exception() is None:
+                    leftover = pending.result()
+                    if leftover is not None:
+                        leftover.cleanup()
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            async with self._changed:
+                self._stream_done = True
+                self._changed.notify_all()
+
+    async def _atranscribe(self, entry: _ChunkEntry, in_flight: asyncio.Semaphore) -> None:
+        chunk = entry.chunk
+        try:
+            async with self._openai_slots:
+                self._announce_chunk(chunk)
+                try:
+                    raw = await self._whisper_call(chunk)
+                except Exception as exc:
+                    raise PipelineError("Whisper-Transkription", chunk.index, exc) from exc
+            await asyncio.to_thread(self._store_whisper_result, chunk, raw)
+            entry.slot.set_result(raw)
+        except BaseException as exc:
+            if not entry.slot.done():
+                entry.slot.set_exception(exc)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+        finally:
+            chunk.cleanup()
+            in_flight.release()
+
+    async def _whisper_call(self, chunk: AudioChunk) -> Dict[str, Any]:
+        kwargs = dict(audio_path=chunk.path, language=self.language, time_offset=chunk.start_time)
+        atranscribe = getattr(self.whisper, "atranscribe", None)
+        if atranscribe is not None:
+            return await atranscribe(**kwargs)
+        return await asyncio.to_thread(self.whisper.transcribe, **kwargs)
+
+    async def _asection_segments(
+        self,
+        k: int,
+        sections: List[Tuple[float, float]],
+    ) -> List[Dict[str, Any]]:
+        """Wie _section_segments(); ein Whisper-Fehler wird hier weitergereicht."""
+        _, window_end = self._section_window(k, sections)
+        async with self._changed:
+            await self._changed.wait_for(lambda: (
+                self._stream_done
+                or (self._entries and self._entries[-1].owned_from >= window_end)
+            ))
+            entries = list(self._entries)
+        for entry, _ in self._covering(k, sections, entries):
+            await entry.slot
+        return self._collect_segments(k, sections, entries)
+
+    async def _await_diarization(self) -> SpeakerTimeline:
+        async with self._timeline_lock:
+            if self._timeline is None:
+                if self.diarization is None:
+                    self._timeline = SpeakerTimeline([])
+                else:
+                    if not self.diarization.done():
+                        print("      Claude: warte auf Speaker-Diarisierung...")
+                    # Fehler der Diarisierung wertet _timeline_from() aus
+                    await asyncio.wait([asyncio.wrap_future(self.diarization)])
+                    self._timeline = self._timeline_from(self.diarization)
+            return self._timeline
+
+    async def _aformat_chain(
+        self,
+        chain: range,
+        sections: List[Tuple[float, float]],
+        blocks: List[str],
+    ) -> None:
+        total = len(sections)
+        previous_context = ""
+        if chain.start > 0:
+            # Kettenanfang: Rohtext-Ende des Vorgängers statt formatiertem Text
+            prev_segments = await self._asection_segments(chain.start - 1, sections)
+            previous_context = tail_context(" ".join(seg["text"] for seg in prev_segments))
+
+        for k in chain:
+            stored = self._stored_section(k, total, blocks)
+            if stored is not None:
+                previous_context = tail_context(stored)
+                continue
+
+            segments = await self._asection_segments(k, sections)
+            if not segments:
+                continue
+
+            timeline = await self._await_diarization()
+            if len(timeline):
+                segments = timeline.label(segments)
+
+            self._announce_section(k, sections)
+            try:
+                formatted = await self._format_call(segments, previous_context, k)
+            except Exception as exc:
+                raise PipelineError("Claude-Formatierung", k, exc, unit="Abschnitt") from exc
+
+            await asyncio.to_thread(self._finish_section, k, formatted, blocks)
+            previous_context = tail_context(formatted)
+
+    async def _format_call(
+        self,
+        segments: List[Dict[str, Any]],
+        previous_context: str,
+        k: int,
+    ) -> str:
+        kwargs = dict(raw_segments=segments, previous_context=previous_context, chunk_index=k)
+        aformat_chunk = getattr(self.formatter, "aformat_chunk", None)
+        if aformat_chunk is not None:
+            return await aformat_chunk(**kwargs)
+        return await asyncio.to_thread(self.formatter.format_chunk, **kwargs)
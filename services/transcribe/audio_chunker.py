@@ -1,13 +1,79 @@
 """
 Audio-Splitting für Transkriptions-Service.
 Teilt Audiodateien in 5-Minuten-Chunks mit 15-Sekunden-Überlapp.
+
+Mit snap_to_silence werden die Schnitte per ffmpeg-silencedetect auf die nächstgelegene
+Sprechpause vor der Zielgrenze verschoben; solche Schnitte brauchen keinen Überlapp.
+Nur wo im Suchfenster keine Pause liegt, wird wie bisher mit Überlapp geschnitten.
+
+Drei Modi:
+  split()       — dekodiert die gesamte Datei mit pydub und exportiert alle Chunks vorab.
+  stream()      — schneidet jeden Chunk per ffmpeg-Seek (-ss/-t) direkt aus der Datei und
+                  liefert die Chunks lazy als Generator; der Speicherbedarf bleibt unabhängig
+                  von der Aufnahmelänge konstant.
+  stream_pipe() — dekodiert die Quelle (z.B. ein Video) genau einmal als 16-kHz-PCM in eine
+                  Pipe und reicht sie beim Lesen an den Encoder des Chunks weiter; gepuffert
+                  wird nur das Suchfenster vor jeder Grenze, keine Zwischen-Audiodatei.
+                  Schnitte werden per RMS in Python an Pausen gelegt.
 """
 
-import os
+import re
+import subprocess
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
+
+# Dateigröße (MB), bis zu der eine Datei ohne Aufteilung an Whisper geht
+MAX_UPLOAD_MB = 24
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Kodierung der exportierten Chunk-Dateien."""
+    codec: str                         # ffmpeg-Encoder, z.B. "libmp3lame", "libopus", "flac"
+    suffix: str                        # Dateiendung, bestimmt den Container
+    bitrate: Optional[str] = None      # z.B. "128k"; None bei verlustfreien Codecs
+    sample_rate: Optional[int] = None  # None = Sample-Rate der Quelle beibehalten
+    channels: Optional[int] = None     # None = Kanäle der Quelle beibehalten
+
+    def ffmpeg_args(self) -> List[str]:
+        args = ["-acodec", self.codec]
+        if self.bitrate:
+            args += ["-ab", self.bitrate]
+        if self.sample_rate:
+            args += ["-ar", str(self.sample_rate)]
+        if self.channels:
+            args += ["-ac", str(self.channels)]
+        return args + BITEXACT_ARGS
+
+    def nominal_bytes_per_minute(self) -> Optional[float]:
+        """Bytes pro Minute laut Bitrate (None bei variabler Bitrate, z.B. FLAC)."""
+        if not self.bitrate:
+            return None
+        kbit = float(self.bitrate.lower().rstrip("k"))
+        return kbit * 1000 / 8 * 60
+
+
+# Ohne bitexact schreibt ffmpeg u.a. zufällige Ogg-Stream-Seriennummern; gleiche Audiodaten
+# sollen aber byte-identische Chunks ergeben (Schlüssel des WhisperCache).
+BITEXACT_ARGS = ["-fflags", "+bitexact", "-flags:a", "+bitexact"]
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+# PCM der Pipe (stream_pipe): 16 kHz Mono, 16 bit little-endian
+PIPE_SAMPLE_RATE = 16000
+PIPE_BYTES_PER_SECOND = PIPE_SAMPLE_RATE * 2
+# Analyse-Fenster für die Pausensuche (Sekunden) und Schwelle wie silencedetect (-35 dB)
+_RMS_FRAME = 0.1
+_RMS_PAUSE_FRAMES = 5
+_RMS_SILENCE = 32768 * 10 ** (-35 / 20)
+# Leseblock der Pipe: PCM fließt in dieser Größe vom Decoder zum Encoder des Chunks
+_PIPE_BLOCK = 64 * 1024
+
+# Bisheriges Chunk-Format (Quelle unverändert, MP3 mit 128 kbit/s)
+MP3_128K = AudioFormat(codec="libmp3lame", suffix=".mp3", bitrate="128k")
 
 
 @dataclass
@@ -24,13 +90,35 @@ class AudioChunk:
 
 
 class AudioChunker:
-    def __init__(self, chunk_duration: int = 300, overlap: int = 15):
+    def __init__(
+        self,
+        chunk_duration: int = 300,
+        overlap: int = 15,
+        audio_format: AudioFormat = MP3_128K,
+        snap_to_silence: bool = False,
+        search_window: int = 30,
+    ):
         """
-        chunk_duration: Chunk-Länge in Sekunden (Standard: 5 Minuten)
-        overlap: Überlapp in Sekunden (verhindert abgeschnittene Sätze an Grenzen)
+        chunk_duration:  Chunk-Länge in Sekunden (Standard: 5 Minuten)
+        overlap:         Überlapp in Sekunden (verhindert abgeschnittene Sätze an Grenzen)
+        audio_format:    Kodierung der Chunk-Dateien (Standard: MP3 128k)
+        snap_to_silence: Schnitte an Sprechpausen ausrichten (dann ohne Überlapp)
+        search_window:   Sekunden vor der Zielgrenze, in denen nach einer Pause gesucht wird
         """
         self.chunk_duration = chunk_duration
         self.overlap = overlap
+        self.audio_format = audio_format
+        self.snap_to_silence = snap_to_silence
+        self.search_window = search_window
+
+    @staticmethod
+    def fit_duration(bytes_per_minute: float, max_mb: float = MAX_UPLOAD_MB) -> int:
+        """
+        Größte Chunk-Länge in Sekunden, deren Datei bei gegebener Datenrate unter max_mb
+        bleibt. 5 % Reserve für Container-Overhead und Bitraten-Schwankungen.
+        """
+        budget_bytes = max_mb * 1024 * 1024 * 0.95
+        return max(60, int(budget_bytes / bytes_per_minute * 60))
 
     def split(self, audio_path: Path) -> List[AudioChunk]:
         """
@@ -54,7 +142,7 @@ class AudioChunker:
         print(f"  Dauer: {total_seconds / 60:.1f} Minuten, Dateigröße: {file_size_mb:.1f} MB")
 
         # Datei passt in einen einzelnen Whisper-Aufruf
-        if total_seconds <= self.chunk_duration and file_size_mb < 24:
+        if self._fits_single(total_seconds, file_size_mb):
             print("  → Datei wird als einzelner Chunk verarbeitet.")
             return [AudioChunk(
                 path=audio_path,
@@ -65,37 +153,461 @@ class AudioChunker:
             )]
 
         chunks = []
-        chunk_ms = self.chunk_duration * 1000
-        overlap_ms = self.overlap * 1000
-        step_ms = chunk_ms - overlap_ms
-        start_ms = 0
-        index = 0
-
-        while start_ms < len(audio):
-            end_ms = min(start_ms + chunk_ms, len(audio))
-            segment = audio[start_ms:end_ms]
-
-            tmp = tempfile.NamedTemporaryFile(
-                suffix=".mp3",
-                prefix=f"transkript_chunk_{index:03d}_",
-                delete=False,
-            )
-            segment.export(tmp.name, format="mp3", bitrate="128k")
+        spans = self.plan(total_seconds, self.silences(audio_path, total_seconds))
+        for index, (start, end) in enumerate(spans):
+            segment = audio[int(start * 1000):int(end * 1000)]
+            tmp_path = self._temp_chunk_path(index, self.audio_format.suffix)
+            self._export_segment(segment, tmp_path)
 
             chunks.append(AudioChunk(
-                path=Path(tmp.name),
-                start_time=start_ms / 1000.0,
-                end_time=end_ms / 1000.0,
+                path=tmp_path,
+                start_time=start,
+                end_time=end,
                 index=index,
                 is_temp=True,
             ))
 
-            if end_ms >= len(audio):
+        print(f"  → Datei in {len(chunks)} Chunks aufgeteilt "
+              f"({self.chunk_duration // 60} Min., {self._describe_cuts(spans)}).")
+        return chunks
+
+    def _export_segment(self, segment, output_path: Path) -> None:
+        fmt = self.audio_format
+        parameters: List[str] = []
+        if fmt.sample_rate:
+            parameters += ["-ar", str(fmt.sample_rate)]
+        if fmt.channels:
+            parameters += ["-ac", str(fmt.channels)]
+        segment.export(
+            str(output_path),
+            format=fmt.suffix.lstrip("."),
+            codec=fmt.codec,
+            bitrate=fmt.bitrate,
+            parameters=parameters + BITEXACT_ARGS,
+        )
+
+    def plan(
+        self,
+        total_seconds: float,
+        silences: Optional[List[Tuple[float, float]]] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        Berechnet die Chunk-Grenzen (start, end) in Sekunden für eine Aufnahmelänge.
+        silences: Pausen (start, end) aus silences(); ohne sie wird fest mit Überlapp geschnitten.
+        """
+        spans: List[Tuple[float, float]] = []
+        start = 0.0
+        while start < total_seconds:
+            target = start + self.chunk_duration
+            if target >= total_seconds:
+                spans.append((start, total_seconds))
                 break
 
-            start_ms += step_ms
-            index += 1
+            cut = self._pause_before(target, start, silences) if silences else None
+            if cut is not None:
+                spans.append((start, cut))
+                start = cut
+            else:
+                spans.append((start, target))
+                start = target - self.overlap
+        return spans
 
-        print(f"  → Datei in {len(chunks)} Chunks aufgeteilt "
-              f"({self.chunk_duration // 60} Min. mit {self.overlap} Sek. Überlapp).")
-        return chunks
+    def _pause_before(
+        self,
+        target: float,
+        start: float,
+        silences: List[Tuple[float, float]],
+    ) -> Optional[float]:
+        """Mitte der spätesten Pause im Suchfenster vor target, sonst None."""
+        lower = max(start + self.overlap, target - self.search_window)
+        best: Optional[float] = None
+        for sil_start, sil_end in silences:
+            middle = (sil_start + sil_end) / 2
+            if middle > target:
+                break
+            if middle >= lower:
+                best = middle
+        return best
+
+    def silences(
+        self,
+        audio_path: Path,
+        total_seconds: float,
+        noise_db: int = -35,
+        min_duration: float = 0.5,
+    ) -> Optional[List[Tuple[float, float]]]:
+        """
+        Erkennt Sprechpausen via ffmpeg silencedetect (ein Dekodier-Durchlauf, ohne
+        Samples in Python zu laden). Gibt None zurück, wenn snap_to_silence deaktiviert
+        ist oder die Datei ohnehin in einen Chunk passt.
+        """
+        if not self.snap_to_silence or total_seconds <= self.chunk_duration:
+            return None
+
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i", str(audio_path),
+            "-vn",
+            "-af", f"silencedetect=noise={noise_db}dB:d={min_duration}",
+            "-f", "null",
+            "-",
+        ]
+        print("  Suche Sprechpausen (ffmpeg silencedetect)...")
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            print("  Hinweis: Pausenerkennung fehlgeschlagen — schneide mit festem Überlapp.")
+            return None
+
+        silences: List[Tuple[float, float]] = []
+        pending_start: Optional[float] = None
+        for line in result.stderr.splitlines():
+            match = _SILENCE_START.search(line)
+            if match:
+                pending_start = max(0.0, float(match.group(1)))
+                continue
+            match = _SILENCE_END.search(line)
+            if match and pending_start is not None:
+                silences.append((pending_start, float(match.group(1))))
+                pending_start = None
+        if pending_start is not None:
+            silences.append((pending_start, total_seconds))
+
+        print(f"  → {len(silences)} Pause(n) erkannt.")
+        return silences
+
+    def _describe_cuts(self, spans: List[Tuple[float, float]]) -> str:
+        cuts = len(spans) - 1
+        snapped = sum(1 for (_, end), (start, _) in zip(spans, spans[1:]) if start >= end)
+        if snapped == cuts:
+            return "alle Schnitte in Sprechpausen, ohne Überlapp" if cuts else "ohne Schnitt"
+        return (f"{snapped} von {cuts} Schnitten in Sprechpausen, "
+                f"übrige mit {self.overlap} Sek. Überlapp")
+
+    def stream(
+        self,
+        audio_path: Path,
+        spans: Optional[List[Tuple[float, float]]] = None,
+    ) -> Iterator[AudioChunk]:
+        """
+        Schneidet Chunks per ffmpeg-Seek, ohne die Datei vollständig zu dekodieren.
+        spans: vorab via plan() berechnete Grenzen (Standard: aus probe_duration()).
+        Jeder Chunk wird erst erzeugt, wenn der Generator weiterläuft.
+        """
+        total_seconds = self.probe_duration(audio_path)
+        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+        print(f"  Streaming: {audio_path.name} — Dauer: {total_seconds / 60:.1f} Minuten, "
+              f"Dateigröße: {file_size_mb:.1f} MB")
+
+        if self._fits_single(total_seconds, file_size_mb):
+            yield AudioChunk(
+                path=audio_path,
+                start_time=0.0,
+                end_time=total_seconds,
+                index=0,
+                is_temp=False,
+            )
+            return
+
+        if spans is None:
+            spans = self.plan(total_seconds, self.silences(audio_path, total_seconds))
+
+        for index, (start, end) in enumerate(spans):
+            tmp_path = self._temp_chunk_path(index, self.audio_format.suffix)
+            try:
+                self._cut_with_ffmpeg(audio_path, start, end, tmp_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            yield AudioChunk(
+                path=tmp_path,
+                start_time=start,
+                end_time=end,
+                index=index,
+                is_temp=True,
+            )
+
+    def stream_pipe(self, source_path: Path) -> Iterator[AudioChunk]:
+        """
+        Dekodiert die Audiospur von source_path einmal als PCM-Pipe und liefert Chunks
+        lazy als Generator. Das PCM geht beim Lesen direkt in den Encoder des Chunks;
+        gepuffert werden nur die letzten max(search_window, overlap) Sekunden vor der
+        Zielgrenze (ca. 1 MB), unabhängig von der Chunk-Länge.
+        Mit snap_to_silence wird in diesem Fenster die leiseste Stelle gesucht; liegt sie
+        unter -35 dB, wird dort ohne Überlapp geschnitten.
+        """
+        cmd = [
+            "ffmpeg",
+            "-v", "error",
+            "-i", str(source_path),
+            "-vn",
+            "-map", "0:a:0",
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-ar", str(PIPE_SAMPLE_RATE),
+            "-ac", "1",
+            "-",
+        ]
+        print(f"  Pipe: {source_path.name} → PCM {PIPE_SAMPLE_RATE // 1000} kHz Mono (ohne Zwischendatei)")
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError(
+                "ffmpeg ist nicht installiert oder nicht im PATH.\n"
+                "  macOS:  brew install ffmpeg\n"
+                "  Ubuntu: sudo apt install ffmpeg"
+            )
+
+        held_seconds = max(self.search_window, self.overlap)
+        buffer = bytearray()   # gelesenes, noch nicht verbrauchtes PCM ab start
+        start = 0.0            # Sekunde des ersten Bytes im Puffer = Beginn des Chunks
+        index = 0
+        try:
+            while True:
+                if not self._read_pcm(process, buffer, 2):
+                    break
+                target = start + self.chunk_duration
+                hold = max(start, target - held_seconds)
+
+                tmp_path = self._temp_chunk_path(index, self.audio_format.suffix)
+                encoder = self._open_encoder(tmp_path)
+                try:
+                    # Bis hold fließt das PCM blockweise durch, ohne sich im Puffer zu sammeln
+                    streamed = 0
+                    stream_bytes = self._pcm_offset(hold - start)
+                    while streamed < stream_bytes:
+                        if not self._read_pcm(process, buffer, min(stream_bytes - streamed, _PIPE_BLOCK)):
+                            break   # Ende der Aufnahme: der Rest folgt unten als letzter Chunk
+                        size = min(len(buffer), stream_bytes - streamed)
+                        self._feed(encoder, buffer, size)
+                        streamed += size
+                    window_start = start + streamed / PIPE_BYTES_PER_SECOND
+
+                    # Ein Sample über target hinaus lesen: so ist klar, ob noch Audio folgt
+                    window_bytes = self._pcm_offset(target - window_start) + 2
+                    if self._read_pcm(process, buffer, window_bytes):
+                        cut = (self._quiet_point(buffer, window_start, start, target)
+                               if self.snap_to_silence else None)
+                        end = cut if cut is not None else target
+                        next_start = cut if cut is not None else target - self.overlap
+                        self._feed(encoder, buffer, self._pcm_offset(end - window_start),
+                                   consume=self._pcm_offset(next_start - window_start))
+                    else:
+                        end = next_start = window_start + len(buffer) / PIPE_BYTES_PER_SECOND
+                        self._feed(encoder, buffer, len(buffer))
+                    self._close_encoder(encoder)
+                except BaseException:
+                    self._abort_encoder(encoder)
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                yield AudioChunk(
+                    path=tmp_path,
+                    start_time=start,
+                    end_time=end,
+                    index=index,
+                    is_temp=True,
+                )
+                index += 1
+                start = next_start
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            stderr = process.stderr.read().decode("utf-8", errors="replace")
+            process.stderr.close()
+            returncode = process.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg-Dekodierung fehlgeschlagen:\n{stderr[-1000:]}")
+
+    def measure_bytes_per_minute(self, source_path: Path, seconds: int = 120) -> float:
+        """
+        Gemessene Datenrate des Chunk-Formats für stream_pipe(), das vorab keine kodierte
+        Datei hat: kodiert die ersten `seconds` Sekunden wie die Pipe (16 kHz Mono) und
+        misst die Probe wie AudioPreprocessor.bytes_per_minute().
+        """
+        sample_path = self._temp_chunk_path(0, self.audio_format.suffix)
+        cmd = [
+            "ffmpeg",
+            "-v", "error",
+            "-t", str(seconds),
+            "-i", str(source_path),
+            "-vn",
+            "-map", "0:a:0",
+            "-ar", str(PIPE_SAMPLE_RATE),
+            "-ac", "1",
+            *self.audio_format.ffmpeg_args(),
+            "-y",
+            str(sample_path),
+        ]
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg-Probekodierung fehlgeschlagen:\n{result.stderr[-1000:]}")
+            return self.bytes_per_minute(sample_path)
+        finally:
+            sample_path.unlink(missing_ok=True)
+
+    @classmethod
+    def bytes_per_minute(cls, audio_path: Path) -> float:
+        """Gemessene Datenrate einer Datei (Bytes pro Minute Audio)."""
+        minutes = cls.probe_duration(audio_path) / 60
+        return audio_path.stat().st_size / max(minutes, 1 / 60)
+
+    @staticmethod
+    def _pcm_offset(seconds: float) -> int:
+        """Byte-Offset im PCM-Puffer (auf ganze Samples gerundet)."""
+        return int(round(seconds * PIPE_SAMPLE_RATE)) * 2
+
+    @staticmethod
+    def _read_pcm(process: subprocess.Popen, buffer: bytearray, size: int) -> bool:
+        """Liest aus der Pipe, bis der Puffer size Bytes hat; False bei vorzeitigem Ende."""
+        while len(buffer) < size:
+            data = process.stdout.read(min(size - len(buffer), _PIPE_BLOCK))
+            if not data:
+                return False
+            buffer += data
+        return True
+
+    @staticmethod
+    def _feed(
+        encoder: subprocess.Popen,
+        buffer: bytearray,
+        size: int,
+        consume: Optional[int] = None,
+    ) -> None:
+        """
+        Schreibt die ersten size Bytes des Puffers in den Encoder und entfernt die ersten
+        consume Bytes (Standard: size) in place; ein Rest bleibt für den Folge-Chunk stehen.
+        """
+        with memoryview(buffer) as view:
+            encoder.stdin.write(view[:size])
+        del buffer[:size if consume is None else consume]
+
+    def _quiet_point(
+        self,
+        buffer: bytearray,
+        buffer_start: float,
+        chunk_start: float,
+        target: float,
+    ) -> Optional[float]:
+        """
+        Mitte der leisesten Stelle (RMS über _RMS_PAUSE_FRAMES Frames) im Suchfenster vor
+        target; None, wenn dort keine Stelle unter der Pausenschwelle liegt.
+        buffer beginnt bei buffer_start und muss das Suchfenster ab dort abdecken.
+        """
+        lower = max(chunk_start + self.overlap, target - self.search_window, buffer_start)
+        if lower >= target:
+            return None
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError(
+                "numpy ist nicht installiert (Pausensuche der PCM-Pipe). Bitte ausführen:\n"
+                "  pip install -r services/transcribe/requirements.txt"
+            )
+
+        # Energie je Frame en bloc statt Sample für Sample in Python
+        frame = int(PIPE_SAMPLE_RATE * _RMS_FRAME)
+        first = self._pcm_offset(lower - buffer_start)
+        end = min(self._pcm_offset(target - buffer_start), len(buffer))
+        frames = (end - first) // (2 * frame)
+        if frames < _RMS_PAUSE_FRAMES:
+            return None
+        with memoryview(buffer) as view:
+            samples = np.frombuffer(view[first:first + 2 * frame * frames], dtype="<i2").astype(np.int64)
+        samples = samples.reshape(frames, frame)
+        energies = np.einsum("ij,ij->i", samples, samples)
+        windows = np.convolve(energies, np.ones(_RMS_PAUSE_FRAMES, dtype=np.int64), mode="valid")
+        # Bei Gleichstand die späteste Pause (wie _pause_before)
+        best_index = len(windows) - 1 - int(np.argmin(windows[::-1]))
+        best_energy = int(windows[best_index])
+        rms = (best_energy / (_RMS_PAUSE_FRAMES * frame)) ** 0.5
+        if rms > _RMS_SILENCE:
+            return None
+        return lower + (best_index + _RMS_PAUSE_FRAMES / 2) * _RMS_FRAME
+
+    def _open_encoder(self, output_path: Path) -> subprocess.Popen:
+        """Startet ffmpeg, das PCM von stdin in output_path kodiert."""
+        cmd = [
+            "ffmpeg",
+            "-v", "error",
+            "-f", "s16le",
+            "-ar", str(PIPE_SAMPLE_RATE),
+            "-ac", "1",
+            "-i", "-",
+            *self.audio_format.ffmpeg_args(),
+            "-y",
+            str(output_path),
+        ]
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    @staticmethod
+    def _close_encoder(encoder: subprocess.Popen) -> None:
+        encoder.stdin.close()
+        stderr = encoder.stderr.read().decode("utf-8", errors="replace")
+        encoder.stderr.close()
+        if encoder.wait() != 0:
+            raise RuntimeError(f"ffmpeg-Kodierung fehlgeschlagen:\n{stderr[-1000:]}")
+
+    @staticmethod
+    def _abort_encoder(encoder: subprocess.Popen) -> None:
+        if encoder.poll() is None:
+            encoder.kill()
+        for stream in (encoder.stdin, encoder.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass   # z.B. BrokenPipeError beim Leeren von stdin nach Encoder-Abbruch
+        encoder.wait()
+
+    def _fits_single(self, total_seconds: float, file_size_mb: float) -> bool:
+        return total_seconds <= self.chunk_duration and file_size_mb < MAX_UPLOAD_MB
+
+    @staticmethod
+    def _temp_chunk_path(index: int, suffix: str) -> Path:
+        tmp = tempfile.NamedTemporaryFile(
+            suffix=suffix,
+            prefix=f"transkript_chunk_{index:03d}_",
+            delete=False,
+        )
+        tmp.close()
+        return Path(tmp.name)
+
+    def _cut_with_ffmpeg(self, audio_path: Path, start: float, end: float, output_path: Path) -> None:
+        cmd = [
+            "ffmpeg",
+            "-v", "error",
+            "-ss", f"{start:.3f}",       # Input-Seek: nur der benötigte Bereich wird dekodiert
+            "-t", f"{end - start:.3f}",
+            "-i", str(audio_path),
+            "-vn",
+            *self.audio_format.ffmpeg_args(),
+            "-y",
+            str(output_path),
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg-Schnitt fehlgeschlagen:\n{result.stderr[-1000:]}")
+
+    @staticmethod
+    def probe_duration(audio_path: Path) -> float:
+        """Ermittelt die Dauer in Sekunden via ffprobe (ohne Dekodierung)."""
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            str(audio_path),
+        ]
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except FileNotFoundError:
+            raise RuntimeError(
+                "ffprobe ist nicht installiert oder nicht im PATH (Teil von ffmpeg).\n"
+                "  macOS:  brew install ffmpeg\n"
+                "  Ubuntu: sudo apt install ffmpeg"
+            )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffprobe fehlgeschlagen:\n{result.stderr[-1000:]}")
+        return float(result.stdout.strip())
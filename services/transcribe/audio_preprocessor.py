@@ -0,0 +1,94 @@
+"""
+Whisper-optimierte Audio-Vorverarbeitung via ffmpeg.
+
+Whisper arbeitet intern mit 16 kHz Mono. Höhere Sample-Raten, Stereo und 128k-MP3
+vergrößern nur Upload und Chunk-Anzahl. Dieser Schritt normalisiert Audio- und
+Videodateien in einem ffmpeg-Durchlauf auf 16 kHz Mono mit kompaktem Codec
+(Opus oder FLAC) und ermittelt die resultierende Datenrate, aus der AudioChunker
+die größtmögliche Chunk-Länge unter dem API-Limit ableitet.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+from audio_chunker import AudioChunker, AudioFormat
+
+WHISPER_SAMPLE_RATE = 16000
+
+WHISPER_FORMATS: Dict[str, AudioFormat] = {
+    # Opus ist für Sprache ausgelegt; 24 kbit/s ≈ 180 KB/Min.
+    "opus": AudioFormat(codec="libopus", suffix=".ogg", bitrate="24k",
+                        sample_rate=WHISPER_SAMPLE_RATE, channels=1),
+    # Verlustfrei, ca. 1 MB/Min. bei 16 kHz Mono
+    "flac": AudioFormat(codec="flac", suffix=".flac",
+                        sample_rate=WHISPER_SAMPLE_RATE, channels=1),
+}
+
+
+class AudioPreprocessor:
+    def __init__(self, codec: str = "opus"):
+        """
+        codec: "opus" (Standard, kleinste Dateien) oder "flac" (verlustfrei)
+        """
+        if codec not in WHISPER_FORMATS:
+            raise ValueError(
+                f"Unbekannter Codec '{codec}'. Erlaubt: {', '.join(WHISPER_FORMATS)}"
+            )
+        self.codec = codec
+        self.audio_format = WHISPER_FORMATS[codec]
+
+    def preprocess(self, input_path: Path, output_dir: Path) -> Path:
+        """
+        Normalisiert eine Audio- oder Videodatei auf 16 kHz Mono.
+
+        input_path: Audio- oder Videodatei (Videospur wird verworfen)
+        output_dir: Zielverzeichnis
+        Rückgabe:   Pfad zur Datei <name>.whisper.<ext>
+        """
+        output_path = output_dir / (input_path.stem + ".whisper" + self.audio_format.suffix)
+
+        if output_path.exists():
+            print(f"      Hinweis: {output_path.name} existiert bereits — überspringe Vorverarbeitung.")
+            return output_path
+
+        cmd = [
+            "ffmpeg",
+            "-v", "error",
+            "-i", str(input_path),
+            "-vn",
+            *self.audio_format.ffmpeg_args(),
+            "-y",
+            str(output_path),
+        ]
+        if self.codec == "opus":
+            # Encoder-Tuning für Sprache statt Musik
+            cmd[-2:-2] = ["-application", "voip"]
+
+        print(f"      ffmpeg: {input_path.name} → {output_path.name} "
+              f"({WHISPER_SAMPLE_RATE // 1000} kHz Mono, {self.codec})")
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except FileNotFoundError:
+            print(
+                "\nFehler: ffmpeg ist nicht installiert oder nicht im PATH.\n"
+                "  macOS:  brew install ffmpeg\n"
+                "  Ubuntu: sudo apt install ffmpeg\n"
+                "  Windows: https://ffmpeg.org/download.html"
+            )
+            sys.exit(1)
+
+        if result.returncode != 0:
+            output_path.unlink(missing_ok=True)
+            print(f"\nFehler bei der Audio-Vorverarbeitung:\n{result.stderr[-1000:]}")
+            sys.exit(1)
+
+        size_mb = output_path.stat().st_size / (1024 * 1024)
+        print(f"      → Vorverarbeitet: {output_path} ({size_mb:.1f} MB)")
+        return output_path
+
+    @staticmethod
+    def bytes_per_minute(audio_path: Path) -> float:
+        """Gemessene Datenrate einer Datei (Bytes pro Minute Audio)."""
+        return AudioChunker.bytes_per_minute(audio_path)
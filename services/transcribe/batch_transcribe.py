@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Batch-Transkription mehrerer Interviews nach Dresing & Pehl (2017).
+
+Verarbeitet alle Audio- und Videodateien aus Verzeichnissen oder Glob-Mustern mit
+einem Worker-Pool (ein Interview pro Worker). Whisper- und Claude-Aufrufe aller
+Interviews teilen sich je ein globales Budget (gleichzeitige Anfragen, Anfragen pro
+Minute), damit parallele Läufe nicht in die Rate-Limits der Anbieter laufen.
+Pro Interview entsteht wie bei transcribe.py eine RTF-Datei; am Ende wird eine
+Übersichtstabelle ausgegeben und als batch_summary_<Zeitstempel>.md gespeichert.
+
+Verwendung (vom Repo-Root):
+    python3 services/transcribe/batch_transcribe.py interviews/audio/
+    python3 services/transcribe/batch_transcribe.py "interviews/audio/IP-0*.mp3" --jobs 3
+    python3 services/transcribe/batch_transcribe.py interviews/audio/ --openai-rpm 40 --anthropic-concurrency 2
+
+Interview-IDs werden aus dem Dateinamen abgeleitet (z.B. "ip_03.mp3" → IP-03),
+sonst "B". Alle Optionen von transcribe.py (außer --interview-id) gelten für jede Datei.
+"""
+
+import argparse
+import glob
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from transcribe import (  # noqa: E402
+    add_pipeline_arguments,
+    load_services,
+    log_ki_usage,
+    output_dir_for,
+    start_diarization,
+    transcribe_file,
+    whisper_tool_name,
+)
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".opus", ".aac", ".wma"}
+
+_INTERVIEW_ID = re.compile(r"IP[-_ ]?(\d+)", re.IGNORECASE)
+
+
+@dataclass
+class BatchResult:
+    audio_path: Path
+    interview_id: str
+    status: str = "offen"
+    output_path: Optional[Path] = None
+    audio_minutes: Optional[float] = None
+    wall_seconds: float = 0.0
+    error: str = ""
+
+
+def collect_inputs(patterns: List[str]) -> List[Path]:
+    """
+    Sammelt Audio-/Videodateien aus Verzeichnissen und Glob-Mustern.
+    Zwischendateien (*.whisper.*) werden ignoriert; liegen Audio und Video mit
+    gleichem Namen vor, wird die Audiodatei verwendet.
+    Alle Ausgaben landen als <name>.rtf usw. in einem Verzeichnis; gleiche Namen aus
+    verschiedenen Verzeichnissen würden sich überschreiben und lösen ValueError aus.
+    """
+    from mp4_extractor import VIDEO_EXTENSIONS
+
+    candidates: List[Path] = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates.extend(sorted(p for p in path.iterdir() if p.is_file()))
+        else:
+            candidates.extend(sorted(Path(p) for p in glob.glob(pattern) if Path(p).is_file()))
+
+    by_stem = {}
+    for path in candidates:
+        suffix = path.suffix.lower()
+        if suffix not in AUDIO_EXTENSIONS and suffix not in VIDEO_EXTENSIONS:
+            continue
+        if path.stem.endswith(".whisper"):
+            continue
+        key = (path.parent.resolve(), path.stem)
+        existing = by_stem.get(key)
+        if existing is None or (
+            existing.suffix.lower() in VIDEO_EXTENSIONS and suffix in AUDIO_EXTENSIONS
+        ):
+            by_stem[key] = path
+
+    by_name: Dict[str, List[Path]] = {}
+    for path in by_stem.values():
+        by_name.setdefault(path.stem, []).append(path)
+    collisions = {stem: paths for stem, paths in by_name.items() if len(paths) > 1}
+    if collisions:
+        details = "\n".join(
+            f"  {stem}: " + ", ".join(str(p) for p in sorted(paths))
+            for stem, paths in sorted(collisions.items())
+        )
+        raise ValueError(
+            "Gleicher Dateiname in mehreren Verzeichnissen — die Ausgaben würden sich "
+            f"überschreiben. Bitte umbenennen oder getrennt verarbeiten:\n{details}"
+        )
+    return sorted(by_stem.values())
+
+
+def interview_id_for(audio_path: Path) -> str:
+    """Leitet die Interview-ID aus dem Dateinamen ab (IP-xx), sonst "B"."""
+    match = _INTERVIEW_ID.search(audio_path.stem)
+    return f"IP-{int(match.group(1)):02d}" if match else "B"
+
+
+def _run_one(result: BatchResult, args: argparse.Namespace, services) -> BatchResult:
+    from audio_chunker import AudioChunker
+    from chunk_pipeline import PipelineError
+
+    started = time.monotonic()
+    try:
+        result.audio_minutes = AudioChunker.probe_duration(result.audio_path) / 60
+    except Exception:
+        result.audio_minutes = None
+
+    try:
+        result.output_path = transcribe_file(result.audio_path, result.interview_id, args, services)
+        result.status = "ok"
+    except PipelineError as exc:
+        result.status = "Fehler"
+        result.error = str(exc)
+    except SystemExit:
+        # Hilfsklassen beenden bei Fehlern mit sys.exit — nur dieses Interview abbrechen
+        result.status = "Fehler"
+        result.error = "Abbruch (siehe Ausgabe oben)"
+    except Exception as exc:
+        result.status = "Fehler"
+        result.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        result.wall_seconds = time.monotonic() - started
+    return result
+
+
+def format_summary(results: List[BatchResult]) -> str:
+    """Übersichtstabelle (Markdown) über alle Interviews des Batches."""
+    lines = [
+        "| ID | Datei | Status | Audio (Min.) | Laufzeit (Min.) | Ausgabe | Fehler |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        audio = f"{r.audio_minutes:.1f}" if r.audio_minutes is not None else "—"
+        output = r.output_path.name if r.output_path else "—"
+        error = r.error.replace("|", "/").replace("\n", " ") or "—"
+        lines.append(
+            f"| {r.interview_id} | {r.audio_path.name} | {r.status} | {audio} | "
+            f"{r.wall_seconds / 60:.1f} | {output} | {error} |"
+        )
+    ok = sum(1 for r in results if r.status == "ok")
+    lines.append("")
+    lines.append(f"{ok} von {len(results)} Interview(s) erfolgreich transkribiert.")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Batch-Transkription mehrerer Interviews nach Dresing & Pehl (2017)."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Verzeichnisse, Dateien oder Glob-Muster (z.B. \"interviews/audio/*.mp3\")",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=2,
+        help="Gleichzeitig verarbeitete Interviews. Standard: 2",
+    )
+    parser.add_argument(
+        "--openai-concurrency",
+        type=int,
+        default=4,
+        help="Max. gleichzeitige Whisper-Anfragen über alle Interviews. Standard: 4",
+    )
+    parser.add_argument(
+        "--openai-rpm",
+        type=int,
+        default=None,
+        help="Max. Whisper-Anfragen pro Minute über alle Interviews. Standard: unbegrenzt",
+    )
+    parser.add_argument(
+        "--anthropic-concurrency",
+        type=int,
+        default=2,
+        help="Max. gleichzeitige Claude-Anfragen über alle Interviews. Standard: 2",
+    )
+    parser.add_argument(
+        "--anthropic-rpm",
+        type=int,
+        default=None,
+        help="Max. Claude-Anfragen pro Minute über alle Interviews. Standard: unbegrenzt",
+    )
+    add_pipeline_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        audio_files = collect_inputs(args.inputs)
+    except ValueError as exc:
+        print(f"\nFehler: {exc}")
+        sys.exit(1)
+    if not audio_files:
+        print("\nFehler: Keine Audio- oder Videodateien gefunden.")
+        sys.exit(1)
+
+    from rate_limiter import RateLimiter
+
+    services = load_services(
+        args,
+        openai_limiter=RateLimiter("OpenAI", args.openai_concurrency, args.openai_rpm),
+        anthropic_limiter=RateLimiter("Anthropic", args.anthropic_concurrency, args.anthropic_rpm),
+    )
+
+    results = [BatchResult(audio_path=p, interview_id=interview_id_for(p)) for p in audio_files]
+    print(f"\n  Batch: {len(results)} Interview(s), {args.jobs} gleichzeitig")
+    for r in results:
+        print(f"    {r.interview_id:6s} {r.audio_path}")
+
+    if args.diarize:
+        # Ein Diarisierungs-Prozess für alle Interviews: das Modell wird nur einmal geladen
+        services.diarization = start_diarization()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs), thread_name_prefix="interview") as pool:
+            futures = [pool.submit(_run_one, r, args, services) for r in results]
+            for future in futures:
+                future.result()
+    finally:
+        if services.diarization is not None:
+            services.diarization.close()
+
+    summary = format_summary(results)
+    print(f"\n{'='*60}")
+    print("  Batch abgeschlossen")
+    print(f"{'='*60}\n")
+    print(summary)
+
+    output_dir = output_dir_for(args)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / f"batch_summary_{datetime.now():%Y%m%d_%H%M%S}.md"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(f"# Batch-Transkription {datetime.now():%Y-%m-%d %H:%M}\n\n{summary}\n")
+    print(f"\n  Übersicht gespeichert: {summary_path}")
+
+    # KI-Nutzung protokollieren (pro erfolgreich transkribiertem Interview)
+    for r in results:
+        if r.status == "ok":
+            log_ki_usage(services.claude_model, r.interview_id, whisper_tool_name(args))
+
+    if any(r.status != "ok" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+Nebenläufige Chunk-Pipeline für den Transkriptions-Service.
+
+Alle Whisper-Aufrufe laufen in einem begrenzten Thread-Pool. Die Claude-Formatierung
+arbeitet nicht auf Audio-Chunks, sondern auf Abschnitten fester Länge (format_duration)
+der globalen Zeitachse: Audio-Chunks dürfen so groß sein, wie das Upload-Limit erlaubt,
+während jeder Formatierungsaufruf bei einigen Minuten Text bleibt. Ein Abschnitt wird
+formatiert, sobald die Whisper-Ergebnisse der ihn abdeckenden Chunks und das Ende des
+vorherigen formatierten Abschnitts (previous_context) vorliegen.
+
+Chunks dürfen lazy erzeugt werden (AudioChunker.stream); es existieren höchstens
+2 × whisper_workers Chunk-Dateien gleichzeitig. Überlappen sich zwei Chunks, gehört
+jedes Segment dem Chunk, in dessen Hälfte des Überlapps es beginnt — Doppelungen an
+Chunk-Grenzen fallen so schon vor der Formatierung weg.
+
+Mit einem JobManifest werden bereits vorhandene Whisper-Ergebnisse und formatierte
+Abschnitte übernommen statt neu angefragt; neue Ergebnisse werden sofort gesichert.
+
+Mit format_workers > 1 wird die Abschnittsfolge in zusammenhängende Ketten geteilt,
+die parallel formatiert werden. Innerhalb einer Kette bleibt die Kontinuität über den
+formatierten Vorgänger erhalten; der erste Abschnitt einer Kette erhält stattdessen
+das Ende des Whisper-Rohtexts seines Vorgängers als Kontext.
+
+Eine Speaker-Diarisierung läuft als Future neben der Pipeline (BackgroundDiarization);
+nur die Formatierung wartet auf ihr Ergebnis, Chunking und Whisper nicht. Die
+Whisper-Segmente jedes Abschnitts werden lokal dem Diarisierungs-Sprecher mit der
+größten Überlappung zugeordnet (SpeakerTimeline) und so beschriftet an Claude gegeben.
+"""
+
+import math
+import threading
+from concurrent.futures import FIRST_EXCEPTION, Future, InvalidStateError, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from audio_chunker import AudioChunk
+from speaker_diarizer import SpeakerTimeline
+from word_timeline import mark_pauses
+
+# Länge des Kontexts (Zeichen), der an den Folge-Abschnitt übergeben wird
+CONTEXT_CHARS = 400
+
+
+class PipelineError(RuntimeError):
+    """Fehler in einer Pipeline-Stufe, mit Angabe von Stufe und Chunk bzw. Abschnitt."""
+
+    def __init__(self, stage: str, index: int, cause: BaseException, unit: str = "Chunk"):
+        super().__init__(f"{stage} ({unit} {index + 1}): {cause}")
+        self.stage = stage
+        self.index = index
+        self.cause = cause
+
+
+def tail_context(text: str, limit: int = CONTEXT_CHARS) -> str:
+    """Letzte `limit` Zeichen eines Textes als Kontext für den nächsten Abschnitt."""
+    return text[-limit:] if len(text) > limit else text
+
+
+@dataclass
+class _ChunkEntry:
+    chunk: AudioChunk
+    owned_from: float  # Segmente ab hier gehören diesem Chunk (Mitte des Überlapps)
+    slot: Future       # Whisper-Ergebnis
+
+
+class ChunkPipeline:
+    def __init__(
+        self,
+        whisper,
+        formatter,
+        language: str = "de",
+        whisper_workers: int = 4,
+        format_workers: int = 1,
+        format_duration: float = 300,
+        diarization: Optional[Future] = None,
+        manifest=None,
+    ):
+        """
+        whisper:         WhisperClient (oder kompatibles Objekt mit transcribe())
+        formatter:       DresingPehlFormatter
+        whisper_workers: max. gleichzeitige Whisper-Uploads
+        format_workers:  Anzahl parallel formatierter Abschnitts-Ketten (1 = strikt sequenziell)
+        format_duration: Länge eines Formatierungsabschnitts in Sekunden (Standard: 5 Minuten)
+        diarization:     optionales Future mit SpeakerSegment-Liste (BackgroundDiarization);
+                         erst die Formatierung wartet darauf
+        manifest:        optionales JobManifest zum Sichern und Wiederaufnehmen
+        """
+        self.whisper = whisper
+        self.formatter = formatter
+        self.language = language
+        self.whisper_workers = max(1, whisper_workers)
+        self.format_workers = max(1, format_workers)
+        self.format_duration = format_duration
+        self.diarization = diarization
+        self._diarization_lock = threading.Lock()
+        self._timeline: Optional[SpeakerTimeline] = None
+        self.manifest = manifest
+        self._abort = threading.Event()
+        self._produced = threading.Condition()
+        self._entries: List[_ChunkEntry] = []
+        self._stream_done = False
+
+    def run(self, chunks: Iterable[AudioChunk], total_duration: Optional[float] = None) -> List[str]:
+        """
+        Transkribiert alle Chunks und formatiert die Aufnahme abschnittsweise.
+        chunks:         Liste oder Generator von AudioChunk-Objekten in zeitlicher Reihenfolge
+        total_duration: Gesamtdauer in Sekunden; nur bei Generatoren erforderlich.
+        Gibt die formatierten Blöcke in zeitlicher Reihenfolge zurück.
+        Wirft PipelineError beim ersten fehlgeschlagenen Schritt;
+        temporäre Chunk-Dateien werden in jedem Fall gelöscht.
+        """
+        if total_duration is None:
+            total_duration = max((c.end_time for c in chunks), default=0.0)
+
+        sections = self.sections(total_duration)
+        self._abort.clear()
+        self._entries = []
+        self._stream_done = False
+        blocks: List[str] = [""] * len(sections)
+        in_flight = threading.BoundedSemaphore(2 * self.whisper_workers)
+        failure: BaseException | None = None
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.whisper_workers, thread_name_prefix="whisper"
+            ) as whisper_pool, ThreadPoolExecutor(
+                max_workers=self.format_workers, thread_name_prefix="format"
+            ) as format_pool:
+                chain_futures = [
+                    format_pool.submit(self._format_chain, chain, sections, blocks)
+                    for chain in self._chains(len(sections))
+                ]
+                for future in chain_futures:
+                    future.add_done_callback(self._abort_on_error)
+
+                try:
+                    for chunk in chunks:
+                        if self._abort.is_set():
+                            chunk.cleanup()
+                            break
+                        stored = self.manifest.whisper_result(chunk) if self.manifest else None
+                        if stored is None:
+                            in_flight.acquire()
+                        entry = _ChunkEntry(chunk, self._owned_from(chunk), Future())
+                        with self._produced:
+                            self._entries.append(entry)
+                            self._produced.notify_all()
+                        if stored is not None:
+                            print(f"      Whisper: Chunk {chunk.index + 1} aus Job-Manifest übernommen.")
+                            chunk.cleanup()
+                            self._settle(entry.slot, result=stored)
+                        else:
+                            whisper_pool.submit(self._transcribe, entry, in_flight)
+                except Exception as exc:
+                    failure = PipelineError("Audio-Aufteilung", len(self._entries), exc)
+                    self._set_abort()
+                finally:
+                    close = getattr(chunks, "close", None)
+                    if close is not None:
+                        close()
+                    with self._produced:
+                        self._stream_done = True
+                        self._produced.notify_all()
+
+                wait(chain_futures, return_when=FIRST_EXCEPTION)
+                if failure is None:
+                    for future in chain_futures:
+                        if future.done() and future.exception() is not None:
+                            failure = future.exception()
+                            break
+
+                if failure is not None:
+                    self._set_abort()
+                    for future in chain_futures:
+                        future.cancel()
+        finally:
+            if isinstance(chunks, list):
+                for chunk in chunks:
+                    chunk.cleanup()
+            for entry in self._entries:
+                entry.chunk.cleanup()
+
+        if failure is not None:
+            raise failure
+        return [block for block in blocks if block]
+
+    def owned_segments(self) -> List[Dict[str, Any]]:
+        """
+        Alle Whisper-Segmente des letzten Laufs ohne Überlapp-Doppelungen, zeitlich
+        sortiert (z.B. für das Ergänzen fehlender Zeitmarken). Erst nach run() aufrufen.
+        """
+        segments: List[Dict[str, Any]] = []
+        for j, entry in enumerate(self._entries):
+            owned_to = self._entries[j + 1].owned_from if j + 1 < len(self._entries) else math.inf
+            raw = entry.slot.result()
+            segments.extend(
+                seg for seg in raw["segments"] if entry.owned_from <= seg["start"] < owned_to
+            )
+        return segments
+
+    def sections(self, total_duration: float) -> List[Tuple[float, float]]:
+        """Formatierungsabschnitte (start, end) in Sekunden über die gesamte Aufnahme."""
+        count = max(1, math.ceil(total_duration / self.format_duration))
+        return [
+            (k * self.format_duration, min((k + 1) * self.format_duration, total_duration))
+            for k in range(count)
+        ]
+
+    def _section_index(self, seconds: float, count: int) -> int:
+        return min(max(int(seconds // self.format_duration), 0), count - 1)
+
+    def _chains(self, total: int) -> List[range]:
+        """Teilt die Abschnittsindizes in format_workers zusammenhängende, gleich große Ketten."""
+        count = min(self.format_workers, total)
+        bounds = [round(k * total / count) for k in range(count + 1)]
+        return [range(bounds[k], bounds[k + 1]) for k in range(count)]
+
+    def _owned_from(self, chunk: AudioChunk) -> float:
+        if not self._entries:
+            return -math.inf
+        prev = self._entries[-1].chunk
+        if prev.end_time > chunk.start_time:
+            return (prev.end_time + chunk.start_time) / 2
+        return chunk.start_time
+
+    def _set_abort(self) -> None:
+        self._abort.set()
+        with self._produced:
+            self._produced.notify_all()
+
+    def _abort_on_error(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self._set_abort()
+
+    @staticmethod
+    def _settle(slot: Future, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        """Setzt Ergebnis oder Fehler eines Slots, falls dieser noch offen ist."""
+        try:
+            if exc is not None:
+                slot.set_exception(exc)
+            else:
+                slot.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _transcribe(self, entry: _ChunkEntry, in_flight: threading.BoundedSemaphore) -> None:
+        chunk = entry.chunk
+        try:
+            if self._abort.is_set():
+                raise PipelineError("Whisper-Transkription", chunk.index, RuntimeError("abgebrochen"))
+
+            self._announce_chunk(chunk)
+            try:
+                raw = self.whisper.transcribe(
+                    audio_path=chunk.path,
+                    language=self.language,
+                    time_offset=chunk.start_time,
+                )
+            except Exception as exc:
+                raise PipelineError("Whisper-Transkription", chunk.index, exc) from exc
+
+            self._store_whisper_result(chunk, raw)
+            self._settle(entry.slot, result=raw)
+        except BaseException as exc:
+            self._settle(entry.slot, exc=exc)
+        finally:
+            chunk.cleanup()
+            in_flight.release()
+
+    @staticmethod
+    def _announce_chunk(chunk: AudioChunk) -> None:
+        print(f"      Whisper: Chunk {chunk.index + 1} "
+              f"({chunk.start_time / 60:.1f}–{chunk.end_time / 60:.1f} Min.)...")
+
+    def _store_whisper_result(self, chunk: AudioChunk, raw: Dict[str, Any]) -> None:
+        print(f"      → Chunk {chunk.index + 1}: {len(raw['segments'])} Segment(e) "
+              f"(Sprache: {raw['language']}).")
+        if self.manifest is not None:
+            self.manifest.set_whisper_result(chunk, raw)
+
+    def _section_segments(
+        self,
+        k: int,
+        sections: List[Tuple[float, float]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Sammelt die Whisper-Segmente eines Abschnitts aus allen Chunks, die ihn abdecken.
+        Wartet, bis diese Chunks erzeugt und transkribiert sind.
+        Gibt None zurück, falls die Pipeline abgebrochen wurde.
+        """
+        window_start, window_end = self._section_window(k, sections)
+        with self._produced:
+            self._produced.wait_for(lambda: (
+                self._abort.is_set()
+                or self._stream_done
+                or (self._entries and self._entries[-1].owned_from >= window_end)
+            ))
+            entries = list(self._entries)
+        if self._abort.is_set():
+            return None
+        return self._collect_segments(k, sections, entries)
+
+    def _section_window(self, k: int, sections: List[Tuple[float, float]]) -> Tuple[float, float]:
+        """Zeitfenster eines Abschnitts; erster und letzter Abschnitt sind nach außen offen."""
+        count = len(sections)
+        window_start = sections[k][0] if k > 0 else -math.inf
+        window_end = sections[k][1] if k < count - 1 else math.inf
+        return window_start, window_end
+
+    def _covering(
+        self,
+        k: int,
+        sections: List[Tuple[float, float]],
+        entries: List[_ChunkEntry],
+    ) -> List[Tuple[_ChunkEntry, float]]:
+        """Chunks (mit Ende ihres Zuständigkeitsbereichs), die Abschnitt k abdecken."""
+        window_start, window_end = self._section_window(k, sections)
+        covering = []
+        for j, entry in enumerate(entries):
+            owned_to = entries[j + 1].owned_from if j + 1 < len(entries) else math.inf
+            if owned_to <= window_start or entry.owned_from >= window_end:
+                continue
+            covering.append((entry, owned_to))
+        return covering
+
+    def _collect_segments(
+        self,
+        k: int,
+        sections: List[Tuple[float, float]],
+        entries: List[_ChunkEntry],
+    ) -> List[Dict[str, Any]]:
+        """Segmente von Abschnitt k; die Slots der abdeckenden Chunks müssen erledigt sein."""
+        count = len(sections)
+        segments: List[Dict[str, Any]] = []
+        for entry, owned_to in self._covering(k, sections, entries):
+            raw = entry.slot.result()
+            owned = [
+                seg for seg in raw["segments"]
+                if entry.owned_from <= seg["start"] < owned_to
+                and self._section_index(seg["start"], count) == k
+            ]
+            if raw.get("words") is not None:
+                # Pausen ≥ 3 Sek. aus den Wort-Zeitstempeln als ( …) eintragen
+                owned = mark_pauses(owned, raw["words"])
+            segments.extend(owned)
+        return segments
+
+    def _wait_for_diarization(self) -> Optional[SpeakerTimeline]:
+        """
+        Sprecher-Zeitachse der Aufnahme; wartet beim ersten Aufruf auf die Diarisierung.
+        Schlägt sie fehl, wird ohne Sprecher-Kontext formatiert (leere Zeitachse).
+        None bei Pipeline-Abbruch.
+        """
+        with self._diarization_lock:
+            if self._timeline is None:
+                if self.diarization is None:
+                    self._timeline = SpeakerTimeline([])
+                    return self._timeline
+                if not self.diarization.done():
+                    print("      Claude: warte auf Speaker-Diarisierung...")
+                while not self.diarization.done():
+                    if self._abort.is_set():
+                        return None
+                    wait([self.diarization], timeout=0.5)
+                self._timeline = self._timeline_from(self.diarization)
+            return self._timeline
+
+    @staticmethod
+    def _timeline_from(diarization: Future) -> SpeakerTimeline:
+        """Zeitachse aus der erledigten Diarisierung; bei Fehler leer (ohne Sprecher-Kontext)."""
+        try:
+            timeline = SpeakerTimeline(diarization.result())
+            print(f"      Diarisierung: {len(timeline)} Sprecher-Segment(e) liegen vor.")
+            return timeline
+        except Exception as exc:
+            print(f"      Warnung: Diarisierung fehlgeschlagen ({exc}) — "
+                  f"formatiere ohne Sprecher-Kontext.")
+            return SpeakerTimeline([])
+
+    def _format_chain(
+        self,
+        chain: range,
+        sections: List[Tuple[float, float]],
+        blocks: List[str],
+    ) -> None:
+        total = len(sections)
+        previous_context = ""
+        if chain.start > 0:
+            # Kettenanfang: Rohtext-Ende des Vorgängers statt formatiertem Text
+            prev_segments = self._section_segments(chain.start - 1, sections)
+            if prev_segments is None:
+                return
+            previous_context = tail_context(" ".join(seg["text"] for seg in prev_segments))
+
+        for k in chain:
+            stored = self._stored_section(k, total, blocks)
+            if stored is not None:
+                previous_context = tail_context(stored)
+                continue
+
+            segments = self._section_segments(k, sections)
+            if segments is None:
+                return
+            if not segments:
+                continue
+
+            timeline = self._wait_for_diarization()
+            if timeline is None:
+                return
+            if len(timeline):
+                # Jedes Segment dem Sprecher mit der größten Überlappung zuordnen
+                segments = timeline.label(segments)
+
+            self._announce_section(k, sections)
+            try:
+                formatted = self.formatter.format_chunk(
+                    raw_segments=segments,
+                    previous_context=previous_context,
+                    chunk_index=k,
+                )
+            except Exception as exc:
+                raise PipelineError("Claude-Formatierung", k, exc, unit="Abschnitt") from exc
+
+            self._finish_section(k, formatted, blocks)
+            previous_context = tail_context(formatted)
+
+    def _stored_section(self, k: int, total: int, blocks: List[str]) -> Optional[str]:
+        """Übernimmt einen bereits formatierten Abschnitt aus dem Job-Manifest."""
+        stored = self.manifest.section_text(k) if self.manifest else None
+        if stored is not None:
+            blocks[k] = stored
+            print(f"      Claude: Abschnitt {k + 1}/{total} aus Job-Manifest übernommen.")
+        return stored
+
+    @staticmethod
+    def _announce_section(k: int, sections: List[Tuple[float, float]]) -> None:
+        start, end = sections[k]
+        print(f"      Claude: Formatierung Abschnitt {k + 1}/{len(sections)} "
+              f"({start / 60:.1f}–{end / 60:.1f} Min.)...")
+
+    def _finish_section(self, k: int, formatted: str, blocks: List[str]) -> None:
+        blocks[k] = formatted
+        if self.manifest is not None:
+            self.manifest.set_section_text(k, formatted)
+        print(f"      ✓ Abschnitt {k + 1} abgeschlossen.")
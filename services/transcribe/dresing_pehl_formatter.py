@@ -1,9 +1,22 @@
 """
 Claude API-basierter Formatter für Dresing & Pehl (2017) Transkriptionsstandard.
 Weist Sprecher zu (I: / B:) und wendet alle 15 Regeln des einfachen Systems an.
+
+Regelwerk und Interview-Kontext sind statisch und werden als System-Blöcke mit
+Prompt-Cache-Markierung gesendet: Innerhalb des Cache-Fensters verarbeitet die API
+sie nur einmal, alle weiteren Abschnitte und Abschnittsgrenzen lesen sie aus dem Cache.
 """
 
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, List, Tuple
+
+from run_metrics import RunMetrics
+from transcript_checks import join_paragraphs, split_paragraphs, validate
+
+# Zeichen pro Seite einer Abschnittsgrenze, die der Konsistenz-Pass zu sehen bekommt
+SEAM_CHARS = 1200
+_SEAM_MARKER = "=== ABSCHNITTSGRENZE ==="
 
 # Alle 15 Regeln des einfachen Transkriptionssystems nach Dresing & Pehl (2017)
 _DRESING_PEHL_REGELN = """
@@ -133,8 +146,23 @@ Mögliche Dialekte: Bairisch, Österreichisch, Schweizerisch, Norddeutsch.
 """
 
 
+def _system_blocks() -> List[Dict[str, Any]]:
+    """
+    Statische Prompt-Teile als cachebare System-Blöcke.
+    Formatierung und Grenz-Korrektur senden denselben Präfix und teilen sich den Cache.
+    """
+    return [
+        {"type": "text", "text": _DRESING_PEHL_REGELN, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": _INTERVIEW_KONTEXT, "cache_control": {"type": "ephemeral"}},
+    ]
+
+
 class DresingPehlFormatter:
-    def __init__(self, api_key: str, model: str = "claude-opus-4-8"):
+    def __init__(self, api_key: str, model: str = "claude-opus-4-8", limiter=None, metrics=None):
+        """
+        limiter: optionaler RateLimiter, geteilt mit anderen Anthropic-Clients
+        metrics: optionales RunMetrics (Spans und Tokens von claude.format / claude.finalize)
+        """
         try:
             import anthropic
             self.client = anthropic.Anthropic(api_key=api_key)
@@ -144,6 +172,10 @@ class DresingPehlFormatter:
                 "  pip install -r services/transcribe/requirements.txt"
             )
         self.model = model
+        self._api_key = api_key
+        self._async_client = None   # AsyncAnthropic, erst in der asyncio-Pipeline angelegt
+        self._limiter = limiter or nullcontext()
+        self.metrics = metrics or RunMetrics()
 
     @staticmethod
     def _format_time(seconds: float) -> str:
@@ -153,11 +185,17 @@ class DresingPehlFormatter:
         return f"{h:02d}:{m:02d}:{s:02d}"
 
     def _segments_to_prompt_text(self, segments: List[Dict[str, Any]]) -> str:
-        """Whisper-Segmente mit Timestamps für den Claude-Prompt aufbereiten."""
+        """
+        Whisper-Segmente mit Timestamps für den Claude-Prompt aufbereiten.
+        Segmente mit Diarisierungs-Sprecher erscheinen als [SPEAKER_00 00:03:12].
+        """
         lines = []
         for seg in segments:
             timestamp = self._format_time(seg["start"])
-            lines.append(f"[{timestamp}] {seg['text']}")
+            if seg.get("speaker"):
+                lines.append(f"[{seg['speaker']} {timestamp}] {seg['text']}")
+            else:
+                lines.append(f"[{timestamp}] {seg['text']}")
         return "\n".join(lines)
 
     def format_chunk(
@@ -165,14 +203,43 @@ class DresingPehlFormatter:
         raw_segments: List[Dict[str, Any]],
         previous_context: str = "",
         chunk_index: int = 0,
-        diarization_context: str = "",
     ) -> str:
         """
         Formatiert einen Transkript-Chunk nach Dresing & Pehl.
-        previous_context:    Letzten ~300 Zeichen des vorherigen Chunks für Kontinuität.
-        diarization_context: Optional — Sprecher-Zeitstempel aus pyannote.audio als Kontext.
+        previous_context: Letzten ~300 Zeichen des vorherigen Chunks für Kontinuität.
+        raw_segments mit Schlüssel "speaker" (SpeakerTimeline.label) werden mit dem
+        Diarisierungs-Label vor jedem Segment an Claude gegeben.
         Gibt formatierten Transkripttext zurück.
         """
+        request = self._chunk_request(raw_segments, previous_context)
+        with self._limiter, self.metrics.span("claude.format"):
+            response = self.client.messages.create(**request)
+        self.metrics.record_usage("anthropic", response)
+        return response.content[0].text.strip()
+
+    async def aformat_chunk(
+        self,
+        raw_segments: List[Dict[str, Any]],
+        previous_context: str = "",
+        chunk_index: int = 0,
+    ) -> str:
+        """Wie format_chunk(), über den AsyncAnthropic-Client (asyncio-Pipeline)."""
+        if self._async_client is None:
+            import anthropic
+            self._async_client = anthropic.AsyncAnthropic(api_key=self._api_key)
+        request = self._chunk_request(raw_segments, previous_context)
+        async with self._limiter:
+            with self.metrics.span("claude.format"):
+                response = await self._async_client.messages.create(**request)
+        self.metrics.record_usage("anthropic", response)
+        return response.content[0].text.strip()
+
+    def _chunk_request(
+        self,
+        raw_segments: List[Dict[str, Any]],
+        previous_context: str,
+    ) -> Dict[str, Any]:
+        """Parameter des messages.create-Aufrufs für einen Abschnitt."""
         raw_text = self._segments_to_prompt_text(raw_segments)
 
         kontext_abschnitt = ""
@@ -184,18 +251,17 @@ class DresingPehlFormatter:
             )
 
         diarization_abschnitt = ""
-        if diarization_context:
+        if any(seg.get("speaker") for seg in raw_segments):
             diarization_abschnitt = (
-                f"\n## Automatische Sprecher-Diarisierung (pyannote.audio):\n"
-                f"{diarization_context}\n"
-                f"Nutze diese Zeitstempel als Hilfe: SPEAKER_00 und SPEAKER_01 entsprechen I: und B:.\n"
-                f"Entscheide anhand des Inhalts, welcher Sprecher der Interviewer (I:) ist.\n"
-                f"---\n"
+                "\n## Automatische Sprecher-Diarisierung (pyannote.audio):\n"
+                "Vor jedem Segment steht das erkannte Sprecherlabel (z.B. SPEAKER_00). "
+                "Gleiches Label = gleiche Person. Entscheide anhand des Inhalts, welches Label "
+                "der Interviewer (I:) und welches die befragte Person (B:) ist. An Sprecherwechseln "
+                "kann ein Segment falsch zugeordnet sein — dann gilt der Inhalt.\n"
+                "---\n"
             )
 
         prompt = (
-            f"{_DRESING_PEHL_REGELN}\n\n"
-            f"{_INTERVIEW_KONTEXT}\n"
             f"{kontext_abschnitt}"
             f"{diarization_abschnitt}\n"
             f"## Deine Aufgabe:\n\n"
@@ -215,64 +281,119 @@ class DresingPehlFormatter:
             f"## Formatiertes Transkript nach Dresing & Pehl:"
         )
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        return response.content[0].text.strip()
+        return {
+            "model": self.model,
+            "max_tokens": 4096,
+            "system": _system_blocks(),
+            "messages": [{"role": "user", "content": prompt}],
+        }
 
-    def finalize(self, full_transcript: str) -> str:
+    def finalize(self, blocks: List[str], workers: int = 4) -> str:
         """
-        Abschließender Qualitäts- und Konsistenz-Pass über das vollständige Transkript.
-        Korrigiert Sprecherzuweisungsfehler, Zeitmarken-Lücken und Chunk-Übergänge.
-        Bei sehr langen Transkripten wird rekursiv in Hälften aufgeteilt.
+        Konsistenz-Pass nur an den Abschnittsgrenzen.
+        Pro Grenze gehen das Ende von Block N und der Anfang von Block N+1 an Claude
+        (Doppelungen, über die Grenze laufende Beiträge, Sprecherzuweisung); die Grenzen
+        werden parallel bearbeitet und an ihrer Stelle wieder eingesetzt. Korrekturen,
+        die bei der lokalen Prüfung (transcript_checks) schlechter abschneiden als das
+        Original, werden verworfen.
         """
-        return self._finalize_section(full_transcript)
+        parts = [split_paragraphs(block) for block in blocks]
+        parts = [p for p in parts if p]
+        if len(parts) < 2:
+            return join_paragraphs([para for p in parts for para in p])
+
+        # Jeder Block gibt Kopf (an die vorherige Grenze) und Ende (an die nächste) ab;
+        # beide Bereiche überschneiden sich nie.
+        heads, tails = [], []
+        for i, paragraphs in enumerate(parts):
+            head = 0 if i == 0 else self._seam_span(paragraphs, from_end=False,
+                                                    limit=len(paragraphs) // 2)
+            tail = 0 if i == len(parts) - 1 else self._seam_span(paragraphs, from_end=True,
+                                                                 limit=len(paragraphs) - head)
+            heads.append(head)
+            tails.append(tail)
+
+        windows = [
+            (parts[i][len(parts[i]) - tails[i]:], parts[i + 1][:heads[i + 1]])
+            for i in range(len(parts) - 1)
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="seam") as pool:
+            seams = list(pool.map(lambda args: self._finalize_seam(*args), enumerate(windows)))
+
+        result: List[str] = []
+        for i, paragraphs in enumerate(parts):
+            result.extend(paragraphs[heads[i]:len(paragraphs) - tails[i]])
+            if i < len(seams):
+                result.extend(seams[i])
+        return join_paragraphs(result)
 
-    def _finalize_section(self, transcript: str, depth: int = 0) -> str:
-        """Versucht einen Finalisierungs-Pass; halbiert rekursiv bei max_tokens-Überschreitung."""
-        if depth > 3:
-            return transcript
+    @staticmethod
+    def _seam_span(paragraphs: List[str], from_end: bool, limit: int) -> int:
+        """Anzahl Absätze am Blockanfang/-ende, die zusammen ca. SEAM_CHARS umfassen."""
+        ordered = reversed(paragraphs) if from_end else paragraphs
+        count, chars = 0, 0
+        for paragraph in ordered:
+            if count >= limit or (count and chars + len(paragraph) > SEAM_CHARS):
+                break
+            count += 1
+            chars += len(paragraph)
+        return count
+
+    def _finalize_seam(self, index: int, window: Tuple[List[str], List[str]]) -> List[str]:
+        """Korrigiert eine Grenze; gibt bei Fehlern oder verworfener Korrektur das Original zurück."""
+        tail, head = window
+        original = tail + head
+        if not tail or not head:
+            return original
 
         prompt = (
-            f"{_DRESING_PEHL_REGELN}\n\n"
-            f"Du bekommst ein vollständiges Interview-Transkript, das in Abschnitten "
-            f"verarbeitet wurde. Führe einen abschließenden Qualitätscheck durch:\n\n"
-            f"1. Korrigiere offensichtliche Fehler in der Sprecherzuweisung (I: vs. B:)\n"
-            f"2. Stelle sicher, dass alle Absätze eine Zeitmarke #HH:MM:SS# am Ende haben\n"
-            f"3. Entferne Doppelungen an Chunk-Übergängen (gleiche Sätze zweimal)\n"
-            f"4. Prüfe die Anwendung der 15 Regeln (Betonungen, Pausen, Nonverbales)\n"
-            f"5. Stelle sicher, dass zwischen Sprechern immer eine Leerzeile steht\n\n"
-            f"WICHTIG: Verändere den INHALT nicht. Nur Formatierung, Zeitmarken und "
-            f"Sprecherzuweisung korrigieren.\n"
-            f"Gib NUR das korrigierte Transkript aus.\n\n"
-            f"## Transkript:\n{transcript}\n\n"
-            f"## Korrigiertes Transkript:"
+            f"Du bekommst die Grenze zwischen zwei getrennt formatierten Abschnitten eines "
+            f"Interview-Transkripts: das Ende von Abschnitt A und den Anfang von Abschnitt B, "
+            f"getrennt durch die Zeile {_SEAM_MARKER}.\n\n"
+            f"Korrigiere NUR Fehler, die durch die Trennung entstanden sind:\n"
+            f"1. Entferne Doppelungen (gleiche Sätze oder Satzteile in A und B)\n"
+            f"2. Führe einen Sprecherbeitrag zusammen, der über die Grenze läuft\n"
+            f"3. Korrigiere die Sprecherzuweisung (I: vs. B:), wenn sie an der Grenze kippt\n"
+            f"4. Jeder Absatz endet mit einer Zeitmarke #HH:MM:SS#, zwischen Sprechern "
+            f"steht eine Leerzeile\n\n"
+            f"WICHTIG: Verändere den INHALT nicht. Gib NUR den korrigierten Ausschnitt aus, "
+            f"ohne die Trennzeile.\n\n"
+            f"## Ausschnitt:\n{join_paragraphs(tail)}\n\n{_SEAM_MARKER}\n\n{join_paragraphs(head)}\n\n"
+            f"## Korrigierter Ausschnitt:"
         )
 
-        collected = []
-        stop_reason = None
-        with self.client.messages.stream(
-            model=self.model,
-            max_tokens=16000,
-            messages=[{"role": "user", "content": prompt}],
-        ) as stream:
-            for text in stream.text_stream:
-                collected.append(text)
-            final_msg = stream.get_final_message()
-            stop_reason = final_msg.stop_reason
-
-        if stop_reason == "max_tokens":
-            mid = len(transcript) // 2
-            split_at = transcript.rfind("\n\nI:", mid) or transcript.rfind("\n\nB:", mid)
-            if split_at <= 0:
-                split_at = mid
-            first_half = transcript[:split_at].strip()
-            second_half = transcript[split_at:].strip()
-            finalized_first = self._finalize_section(first_half, depth + 1)
-            finalized_second = self._finalize_section(second_half, depth + 1)
-            return finalized_first + "\n\n" + finalized_second
-
-        return "".join(collected).strip()
+        try:
+            with self._limiter, self.metrics.span("claude.finalize"):
+                response = self.client.messages.create(
+                    model=self.model,
+                    max_tokens=2048,
+                    system=_system_blocks(),
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            self.metrics.record_usage("anthropic", response)
+        except Exception as exc:
+            print(f"      Warnung: Übergang {index + 1} nicht geprüft ({exc}).")
+            return original
+
+        if response.stop_reason == "max_tokens":
+            print(f"      Warnung: Übergang {index + 1}: Antwort abgeschnitten — Original bleibt.")
+            return original
+
+        corrected = split_paragraphs(response.content[0].text.replace(_SEAM_MARKER, ""))
+        reason = self._reject_seam(original, corrected)
+        if reason:
+            print(f"      Warnung: Übergang {index + 1}: Korrektur verworfen ({reason}).")
+            return original
+        return corrected
+
+    @staticmethod
+    def _reject_seam(original: List[str], corrected: List[str]) -> str:
+        """Lokale Plausibilitätsprüfung einer Grenz-Korrektur; leer = übernehmen."""
+        if not corrected:
+            return "leere Antwort"
+        ratio = len(join_paragraphs(corrected)) / max(1, len(join_paragraphs(original)))
+        if not 0.5 <= ratio <= 1.3:
+            return f"Länge {ratio:.0%} des Originals"
+        if len(validate(corrected)) > len(validate(original)):
+            return "mehr Formatfehler als vorher"
+        return ""
@@ -0,0 +1,162 @@
+"""
+Job-Manifest für wiederaufnehmbare Transkriptionen.
+
+Hält pro Interview fest, welche Schritte bereits erledigt sind: das Whisper-Ergebnis
+jedes Chunks, den formatierten Text jedes Formatierungsabschnitts und die Ergebnisse
+der nachgelagerten Stufen (Finalisierung, Pseudonymisierung). Das Manifest liegt als
+<name>.job.json neben der RTF-Datei und wird nach jedem Schritt atomar geschrieben;
+mit --resume überspringt transcribe.py alle bereits abgeschlossenen Schritte.
+Die Whisper-Ergebnisse (mit Wort-Zeitmarken mehrere MB) liegen je Chunk in einer
+eigenen Datei unter <name>.job.chunks/; das Manifest verweist nur darauf, damit nicht
+jeder Schritt alle bisherigen Ergebnisse neu schreibt.
+
+VERTRAULICH: Das Manifest enthält Klartext des Interviews (wie die .mapping.json)
+und darf samt <name>.job.chunks/ nicht ins Git eingecheckt werden.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from audio_chunker import AudioChunk
+from word_timeline import decode_result, encode_result
+
+
+class JobManifest:
+    VERSION = 2
+
+    def __init__(self, path: Path, fingerprint: Dict[str, Any]):
+        """
+        path:        Speicherort des Manifests
+        fingerprint: Parameter, bei deren Änderung gespeicherte Ergebnisse ungültig werden
+        """
+        self.path = path
+        self.chunk_dir = path.with_suffix(".chunks")
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {
+            "version": self.VERSION,
+            "fingerprint": fingerprint,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "note": "VERTRAULICH — nicht ins Git einchecken. Enthält Interview-Klartext.",
+            "chunks": {},
+            "sections": {},
+            "stages": {},
+        }
+
+    @classmethod
+    def open(cls, path: Path, fingerprint: Dict[str, Any], resume: bool) -> "JobManifest":
+        """
+        Lädt ein vorhandenes Manifest (nur mit resume=True und passendem Fingerprint)
+        oder legt ein neues an.
+        """
+        manifest = cls(path, fingerprint)
+        data = manifest._load() if resume else None
+        if data is None:
+            # Ergebnisse eines verworfenen Manifests nicht liegen lassen (Klartext)
+            manifest._remove_chunk_files()
+            return manifest
+
+        manifest._data = data
+        print(f"      Job-Manifest geladen: {len(data['chunks'])} Chunk(s) transkribiert, "
+              f"{len(data['sections'])} Abschnitt(e) formatiert, "
+              f"Stufen erledigt: {', '.join(data['stages']) or '—'}")
+        return manifest
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            print(f"      Hinweis: Kein Job-Manifest gefunden ({self.path.name}) — starte neu.")
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"      Warnung: Job-Manifest nicht lesbar ({exc}) — starte neu.")
+            return None
+        if data.get("version") != self.VERSION or data.get("fingerprint") != self.fingerprint:
+            print("      Hinweis: Job-Manifest passt nicht zu den aktuellen Parametern — starte neu.")
+            return None
+        return data
+
+    def _remove_chunk_files(self) -> None:
+        for chunk_file in self.chunk_dir.glob("*.json"):
+            chunk_file.unlink(missing_ok=True)
+
+    # ── Whisper-Ergebnisse pro Chunk ──────────────────────────────────────────
+
+    def whisper_result(self, chunk: AudioChunk) -> Optional[Dict[str, Any]]:
+        """Gespeichertes Whisper-Ergebnis, falls Chunk-Grenzen unverändert sind."""
+        with self._lock:
+            entry = self._data["chunks"].get(str(chunk.index))
+        if not entry:
+            return None
+        if (round(entry["start"], 3), round(entry["end"], 3)) != (
+            round(chunk.start_time, 3), round(chunk.end_time, 3)
+        ):
+            return None
+        try:
+            with open(self.chunk_dir / entry["file"], encoding="utf-8") as f:
+                return decode_result(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def set_whisper_result(self, chunk: AudioChunk, result: Dict[str, Any]) -> None:
+        file_name = f"{chunk.index:03d}.json"
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.chunk_dir / file_name, encode_result(result))
+        with self._lock:
+            self._data["chunks"][str(chunk.index)] = {
+                "start": chunk.start_time,
+                "end": chunk.end_time,
+                "status": "transcribed",
+                "file": file_name,
+            }
+            self._save()
+
+    # ── Formatierte Abschnitte ────────────────────────────────────────────────
+
+    def section_text(self, index: int) -> Optional[str]:
+        with self._lock:
+            entry = self._data["sections"].get(str(index))
+        return entry["text"] if entry else None
+
+    def set_section_text(self, index: int, text: str) -> None:
+        with self._lock:
+            self._data["sections"][str(index)] = {"status": "formatted", "text": text}
+            self._save()
+
+    # ── Nachgelagerte Stufen (finalize, pseudonymize, ...) ───────────────────
+
+    def stage_text(self, name: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data["stages"].get(name)
+        return entry["text"] if entry else None
+
+    def set_stage_text(self, name: str, text: str) -> None:
+        with self._lock:
+            self._data["stages"][name] = {
+                "status": "done",
+                "finished": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "text": text,
+            }
+            self._save()
+
+    def _save(self) -> None:
+        """Atomar schreiben (Aufrufer hält self._lock)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.path, self._data)
+
+
+def _write_atomic(path: Path, data: Any) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
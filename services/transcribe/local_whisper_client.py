@@ -0,0 +1,86 @@
+"""
+Lokales Whisper-Backend via faster-whisper (CTranslate2, CPU mit int8).
+
+Drop-in-Ersatz für WhisperClient (--engine local): gleiche Ergebnisform
+{'text', 'segments', 'language'[, 'words']}, aber ohne Upload. Für vertrauliche
+Interviews verlässt das Audio den Rechner nicht; der Durchsatz skaliert mit den
+lokalen Kernen statt mit API-Kontingenten. Das Modell wird einmal pro Instanz
+geladen; parallele Aufrufe der Pipeline-Worker teilen es sich.
+
+Voraussetzung:
+  pip install faster-whisper
+  Das Modell wird beim ersten Aufruf von Hugging Face geladen und lokal gecacht.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from whisper_client import WhisperEngine
+from word_timeline import WordTimeline
+
+
+class LocalWhisperClient(WhisperEngine):
+    def __init__(
+        self,
+        model_size: str = "large-v3",
+        compute_type: str = "int8",
+        device: str = "cpu",
+        workers: int = 4,
+        cache=None,
+        word_timestamps: bool = False,
+        metrics=None,
+    ):
+        """
+        model_size:   faster-whisper-Modell (z.B. "large-v3", "medium", "small")
+        compute_type: Quantisierung, auf CPU typischerweise "int8"
+        workers:      parallele Transkriptionen (= --whisper-workers); die CPU-Kerne
+                      werden gleichmäßig auf sie verteilt
+        """
+        super().__init__(cache=cache, word_timestamps=word_timestamps, metrics=metrics)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError(
+                "faster-whisper ist nicht installiert (nötig für --engine local). "
+                "Bitte ausführen:\n"
+                "  pip install faster-whisper"
+            )
+        self.MODEL = f"faster-whisper/{model_size}/{compute_type}"
+        workers = max(1, workers)
+        print(f"  Lade lokales Whisper-Modell ({model_size}, {device}, {compute_type})...")
+        self._model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=max(1, (os.cpu_count() or 1) // workers),
+            num_workers=workers,
+        )
+
+    def _request(self, audio_path: Path, language: str) -> Dict[str, Any]:
+        """Lokale Transkription; Timestamps relativ zum Dateianfang."""
+        segments_iter, info = self._model.transcribe(
+            str(audio_path),
+            language=language,
+            word_timestamps=self.word_timestamps,
+        )
+
+        segments: List[Dict[str, Any]] = []
+        words = []
+        for seg in segments_iter:
+            segments.append({
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text.strip(),
+            })
+            if self.word_timestamps:
+                words.extend((w.word, w.start, w.end) for w in (seg.words or []))
+
+        result = {
+            "text": " ".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+        if self.word_timestamps:
+            result["words"] = WordTimeline.from_words(words)
+        return result
@@ -1,52 +1,82 @@
 """
-MP4/Video → MP3 Audio-Extraktion via ffmpeg.
+MP4/Video → Audio-Extraktion via ffmpeg.
 Wird von transcribe.py automatisch aufgerufen, wenn die Eingabedatei ein Video ist.
+
+Liegt die Audiospur bereits in einem Codec vor, den Whisper direkt annimmt (z.B. AAC
+aus Zoom-/Teams-Aufnahmen), wird sie ohne Neukodierung kopiert (-c:a copy) — das
+dauert Sekunden statt Minuten. Andernfalls wird wie bisher nach MP3 transkodiert.
+In transcribe.py betrifft das nur --no-preprocess: Standardmäßig kodiert die
+Whisper-Vorverarbeitung Audio und Video ohnehin direkt nach 16 kHz Opus/FLAC.
 """
 
 import subprocess
 import sys
 from pathlib import Path
+from typing import Optional
 
 
 VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".webm", ".avi", ".m4v"}
 
+# Audio-Codecs, die unverändert übernommen werden → Container der Ausgabedatei
+COPY_CONTAINERS = {
+    "aac": ".m4a",
+    "mp3": ".mp3",
+    "opus": ".ogg",
+}
+
 
 def is_video_file(path: Path) -> bool:
     return path.suffix.lower() in VIDEO_EXTENSIONS
 
 
 class MP4Extractor:
-    def __init__(self, bitrate: str = "128k"):
+    def __init__(self, bitrate: str = "128k", stream_copy: bool = True):
+        """
+        bitrate:     MP3-Bitrate beim Transkodieren
+        stream_copy: kompatible Audiospuren ohne Neukodierung übernehmen
+        """
         self.bitrate = bitrate
+        self.stream_copy = stream_copy
 
     def extract_audio(self, video_path: Path, output_dir: Path) -> Path:
         """
-        Extrahiert die Audiospur aus einer Videodatei als MP3.
+        Extrahiert die Audiospur aus einer Videodatei.
 
         video_path:  Pfad zur Eingabe-Videodatei
-        output_dir:  Zielverzeichnis für die MP3-Datei
-        Rückgabe:    Pfad zur erzeugten MP3-Datei
+        output_dir:  Zielverzeichnis für die Audiodatei
+        Rückgabe:    Pfad zur erzeugten Audiodatei (.m4a/.mp3/.ogg bei Stream-Copy, sonst .mp3)
         """
         self._check_ffmpeg()
 
-        output_path = output_dir / (video_path.stem + ".mp3")
+        codec = self.probe_audio_codec(video_path) if self.stream_copy else None
+        container = COPY_CONTAINERS.get(codec)
+        output_path = output_dir / (video_path.stem + (container or ".mp3"))
 
         if output_path.exists():
             print(f"      Hinweis: {output_path.name} existiert bereits — überspringe Extraktion.")
             return output_path
 
+        if container:
+            audio_args = ["-c:a", "copy"]  # Audiospur unverändert übernehmen
+            print(f"      ffmpeg: {video_path.name} → {output_path.name} (Audiospur {codec}, ohne Neukodierung)")
+        else:
+            audio_args = [
+                "-acodec", "libmp3lame",
+                "-ab", self.bitrate,
+                "-ar", "44100",          # Sample-Rate für Whisper
+            ]
+            print(f"      ffmpeg: {video_path.name} → {output_path.name}")
+
         cmd = [
             "ffmpeg",
             "-i", str(video_path),
             "-vn",                   # kein Video
-            "-acodec", "libmp3lame",
-            "-ab", self.bitrate,
-            "-ar", "44100",          # Sample-Rate für Whisper
+            "-map", "0:a:0",         # erste Audiospur
+            *audio_args,
             "-y",                    # Überschreiben ohne Nachfrage
             str(output_path),
         ]
 
-        print(f"      ffmpeg: {video_path.name} → {output_path.name}")
         result = subprocess.run(
             cmd,
             stdout=subprocess.PIPE,
@@ -59,9 +89,28 @@ class MP4Extractor:
             sys.exit(1)
 
         size_mb = output_path.stat().st_size / (1024 * 1024)
-        print(f"      → MP3 erstellt: {output_path} ({size_mb:.1f} MB)")
+        print(f"      → Audio erstellt: {output_path} ({size_mb:.1f} MB)")
         return output_path
 
+    @staticmethod
+    def probe_audio_codec(video_path: Path) -> Optional[str]:
+        """Codec der ersten Audiospur via ffprobe (z.B. "aac"); None, falls nicht ermittelbar."""
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            str(video_path),
+        ]
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip().lower() or None
+
     @staticmethod
     def _check_ffmpeg() -> None:
         result = subprocess.run(
@@ -89,6 +138,14 @@ if __name__ == "__main__":
         default=None,
         help="Ausgabeverzeichnis. Standard: gleiches Verzeichnis wie Eingabedatei.",
     )
+    parser.add_argument(
+        "--transcode",
+        action="store_true",
+        help=(
+            "Immer nach MP3 transkodieren, auch wenn die Audiospur kopiert werden könnte. "
+            "(transcribe.py nutzt die Extraktion nur mit --no-preprocess.)"
+        ),
+    )
     args = parser.parse_args()
 
     video = Path(args.video_file)
@@ -99,6 +156,6 @@ if __name__ == "__main__":
     out_dir = Path(args.output_dir) if args.output_dir else video.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    extractor = MP4Extractor()
+    extractor = MP4Extractor(stream_copy=not args.transcode)
     result_path = extractor.extract_audio(video, out_dir)
     print(f"Ausgabe: {result_path}")
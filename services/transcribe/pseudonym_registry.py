@@ -0,0 +1,193 @@
+"""
+Projektweites Register bekannter Klarnamen → Pseudonyme (SQLite, verschlüsselt).
+
+Damit dieselbe Person in allen Interviews denselben Code erhält, merkt sich das
+Register jede Zuordnung. Vor der Namenserkennung werden bekannte Namen lokal
+ersetzt; Claude sieht nur noch unbekannte Namen, neue Codes setzen die vorhandene
+Nummerierung fort (KP-xx, Org-X, Ort-X, ...).
+
+Klarnamen liegen nur verschlüsselt in der Datenbank (Fernet, Paket cryptography);
+gesucht wird über einen HMAC-SHA256 des normalisierten Namens. Verschlüsselungs- und
+Suchschlüssel werden getrennt aus dem Hauptschlüssel abgeleitet (HMAC mit festem
+Verwendungszweck). Hauptschlüssel aus der Umgebungsvariable PSEUDONYM_REGISTRY_KEY,
+erzeugen mit:
+    python3 -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
+
+Das Register bleibt lokal (Standard: ~/.local/share/masterarbeit-transcribe/) und wird
+nie ins Git eingecheckt.
+"""
+
+import base64
+import hashlib
+import hmac
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+DEFAULT_REGISTRY_PATH = (
+    Path.home() / ".local" / "share" / "masterarbeit-transcribe" / "pseudonym_registry.sqlite"
+)
+
+_PERSON_CODE = re.compile(r"^KP-(\d+)$")
+# Buchstaben-Codes je Präfix (Org-A, Ort-B, ...)
+_LETTER_CODE = re.compile(r"^([^\W\d_]+)-([A-Z]+)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS names (
+    lookup     TEXT PRIMARY KEY,   -- HMAC des normalisierten Klarnamens
+    original   BLOB NOT NULL,      -- Klarname, Fernet-verschlüsselt
+    pseudonym  TEXT NOT NULL,
+    type       TEXT NOT NULL,
+    interview  TEXT NOT NULL,      -- Interview der ersten Nennung
+    created    TEXT NOT NULL
+)
+"""
+
+
+def derive_key(master: bytes, purpose: bytes) -> bytes:
+    """Unabhängiger Teilschlüssel (32 Byte) des Hauptschlüssels für einen Verwendungszweck."""
+    return hmac.new(master, b"pseudonym-registry/" + purpose, hashlib.sha256).digest()
+
+
+def letter_code(n: int) -> str:
+    """1 → A, 26 → Z, 27 → AA (Codes für Org-A, Org-B, ...)."""
+    code = ""
+    while n > 0:
+        n, rest = divmod(n - 1, 26)
+        code = chr(ord("A") + rest) + code
+    return code
+
+
+def letter_number(code: str) -> int:
+    """Umkehrung von letter_code: A → 1, AA → 27."""
+    n = 0
+    for char in code:
+        n = n * 26 + ord(char) - ord("A") + 1
+    return n
+
+
+class PseudonymRegistry:
+    def __init__(self, path: Path, key: str):
+        """
+        path: SQLite-Datei (wird angelegt)
+        key:  Fernet-Schlüssel (PSEUDONYM_REGISTRY_KEY)
+        """
+        try:
+            from cryptography.fernet import Fernet
+        except ImportError:
+            raise RuntimeError(
+                "cryptography ist nicht installiert (für --pseudonym-registry). Bitte ausführen:\n"
+                "  pip install cryptography"
+            )
+        try:
+            master = base64.urlsafe_b64decode(key.encode("ascii"))
+            Fernet(key.encode("ascii"))
+        except ValueError as exc:
+            raise RuntimeError(f"PSEUDONYM_REGISTRY_KEY ist kein gültiger Fernet-Schlüssel ({exc}).")
+        self._fernet = Fernet(base64.urlsafe_b64encode(derive_key(master, b"encrypt")))
+        self._hmac_key = derive_key(master, b"lookup")
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Eine Verbindung pro Vorgang: das Register wird aus mehreren Interview-Threads genutzt
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _lookup(self, original: str) -> str:
+        normalized = " ".join(original.split()).casefold()
+        return hmac.new(self._hmac_key, normalized.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def mappings(self) -> List[Dict[str, str]]:
+        """Alle bekannten Zuordnungen (entschlüsselt) im Format der .mapping.json."""
+        with closing(self._connect()) as db:
+            rows = db.execute("SELECT original, pseudonym, type FROM names ORDER BY rowid").fetchall()
+        return [
+            {"original": self._fernet.decrypt(original).decode("utf-8"), "pseudonym": pseudonym, "type": kind}
+            for original, pseudonym, kind in rows
+        ]
+
+    def register(self, mappings: List[Dict[str, str]], interview_id: str) -> List[Dict[str, str]]:
+        """
+        Trägt neu erkannte Zuordnungen ein und gibt sie mit endgültigen Codes zurück.
+        Einträge mit gleichem Pseudonym gelten als eine Person bzw. Organisation: ist
+        einer ihrer Namen schon bekannt, gilt dessen Code für alle (bei mehreren
+        verschiedenen Codes der zuerst gefundene, mit Warnung); sonst wird KP-xx bzw.
+        ein Buchstaben-Code (Org-X, Ort-X, ...) nach dem höchsten vorhandenen Code mit
+        gleichem Präfix vergeben. Andere Codes (IP-xx, (Interviewer)) bleiben unverändert.
+        """
+        groups: Dict[str, List[Dict[str, str]]] = {}
+        for m in mappings:
+            groups.setdefault(m["pseudonym"], []).append(m)
+
+        created = datetime.now().strftime("%Y-%m-%d %H:%M")
+        result: List[Dict[str, str]] = []
+        with self._lock, closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                persons, letters = self._highest_codes(db)
+                for pseudonym, members in groups.items():
+                    known: List[str] = []
+                    for m in members:
+                        row = db.execute(
+                            "SELECT pseudonym FROM names WHERE lookup = ?", (self._lookup(m["original"]),)
+                        ).fetchone()
+                        if row is not None and row[0] not in known:
+                            known.append(row[0])
+                    if len(known) > 1:
+                        # Namen derselben Person stehen aus früheren Interviews unter
+                        # verschiedenen Codes; das lässt sich nicht automatisch auflösen.
+                        print(f"      Warnung: Pseudonym-Register ({interview_id}): eine Person bzw. "
+                              f"Organisation ist unter {', '.join(known)} eingetragen — im Transkript "
+                              f"gilt {known[0]}. Bitte das Register prüfen.")
+                    if known:
+                        code = known[0]
+                    elif _PERSON_CODE.match(pseudonym):
+                        persons += 1
+                        code = f"KP-{persons:02d}"
+                    elif _LETTER_CODE.match(pseudonym):
+                        prefix = _LETTER_CODE.match(pseudonym).group(1)
+                        letters[prefix] = letters.get(prefix, 0) + 1
+                        code = f"{prefix}-{letter_code(letters[prefix])}"
+                    else:
+                        code = pseudonym
+
+                    for m in members:
+                        db.execute(
+                            "INSERT OR IGNORE INTO names VALUES (?, ?, ?, ?, ?, ?)",
+                            (
+                                self._lookup(m["original"]),
+                                self._fernet.encrypt(m["original"].encode("utf-8")),
+                                code,
+                                m.get("type", ""),
+                                interview_id,
+                                created,
+                            ),
+                        )
+                        result.append({**m, "pseudonym": code})
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return result
+
+    @staticmethod
+    def _highest_codes(db: sqlite3.Connection) -> Tuple[int, Dict[str, int]]:
+        """Höchste KP-Nummer und höchster Buchstaben-Code je Präfix."""
+        persons = 0
+        letters: Dict[str, int] = {}
+        for (pseudonym,) in db.execute("SELECT DISTINCT pseudonym FROM names"):
+            person = _PERSON_CODE.match(pseudonym)
+            lettered = _LETTER_CODE.match(pseudonym)
+            if person:
+                persons = max(persons, int(person.group(1)))
+            elif lettered:
+                prefix = lettered.group(1)
+                letters[prefix] = max(letters.get(prefix, 0), letter_number(lettered.group(2)))
+        return persons, letters
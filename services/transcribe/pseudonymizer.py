@@ -4,13 +4,41 @@ Claude-basierte Pseudonymisierung von Interview-Transkripten.
 Erkennt Personennamen und identifizierende Informationen, ersetzt sie durch
 systematische Codes und speichert eine Zuordnungstabelle (.mapping.json).
 Die Zuordnungstabelle bleibt lokal und wird nicht ins Git eingecheckt.
+
+Lange Transkripte werden an Absatzgrenzen in Fenster geteilt, die parallel analysiert
+werden. Die Zuordnungen der Fenster werden danach zusammengeführt (gleiches Original
+bzw. gleiches Pseudonym innerhalb eines Fensters = dieselbe Person) und die Codes
+deterministisch nach erstem Vorkommen im Transkript neu vergeben.
+
+Mit einem PseudonymRegistry werden bereits bekannte Namen vorab lokal ersetzt; nur
+unbekannte Namen gehen an Claude, und neue Codes setzen die Nummerierung des
+Registers fort (gleiche Person = gleicher Code über alle Interviews).
 """
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from pseudonym_registry import letter_code
+from run_metrics import RunMetrics
+from transcript_checks import join_paragraphs, split_paragraphs
+
+# Zeichen pro Erkennungsfenster (ein Claude-Aufruf pro Fenster)
+WINDOW_CHARS = 12000
+
+# Vorrang, falls Fenster dasselbe Original unterschiedlich einordnen
+# Bereits eingesetzte Codes (z.B. aus dem Register) sind keine Klarnamen
+_CODE = re.compile(r"^(?:IP-\d+|KP-\d+|Org-[A-Z]+|Ort-[A-Z]+|\(Interviewer\))$")
+
+# Code-Präfix je Typ; übrige Typen behalten das Präfix aus Claudes Vorschlag (z.B. "Info-A")
+_TYPE_PREFIX = {"organization": "Org", "location": "Ort"}
+_PROPOSED_PREFIX = re.compile(r"^([^\W\d_]+)-")
+
+_TYPE_PRIORITY = ["person_interviewee", "person_interviewer", "person_other", "organization", "location"]
 
 _DETECT_PROMPT = """Du bist Datenschutzexperte für qualitative Forschungsinterviews.
 Analysiere das folgende Transkript und identifiziere ALLE personenbezogenen Daten,
@@ -23,6 +51,7 @@ die pseudonymisiert werden müssen.
 - Vorname, Nachname anderer genannter Personen → KP-01, KP-02, KP-03, ...
 - Name des Interviewers (falls im Transkript erwähnt) → (Interviewer)
 - Spezifische Institutionsnamen, die die Person identifizierbar machen → Org-A, Org-B, ...
+- Konkrete Orte, die die Person identifizierbar machen (z.B. Filialstandort, kleine Gemeinde) → Ort-A, Ort-B, ...
 
 **NICHT pseudonymisieren:**
 - Allgemeine Begriffe: "die Bank", "das Unternehmen", "die Abteilung"
@@ -30,6 +59,7 @@ die pseudonymisiert werden müssen.
 - Allgemeine Regionen: Wien, Steiermark, Österreich, Deutschland, DACH
 - Berufsbezeichnungen: Vorstand, Abteilungsleiter, Kundenberater
 - Branchentypen: Raiffeisenbank (als Typ, nicht als spezifisches Institut)
+- Bereits eingesetzte Codes: IP-xx, KP-xx, Org-X, Ort-X, (Interviewer)
 
 ## Ausgabe — NUR dieses JSON, ohne Erklärungen:
 {
@@ -54,7 +84,21 @@ Regeln für das JSON:
 
 
 class Pseudonymizer:
-    def __init__(self, api_key: str, model: str = "claude-opus-4-8"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-opus-4-8",
+        limiter=None,
+        workers: int = 4,
+        registry=None,
+        metrics=None,
+    ):
+        """
+        limiter:  optionaler RateLimiter, geteilt mit anderen Anthropic-Clients
+        workers:  gleichzeitig analysierte Transkript-Fenster
+        registry: optionales PseudonymRegistry (interviewübergreifende Codes)
+        metrics:  optionales RunMetrics (Spans und Tokens von claude.pseudonymize)
+        """
         try:
             import anthropic
             self.client = anthropic.Anthropic(api_key=api_key)
@@ -64,6 +108,10 @@ class Pseudonymizer:
                 "  pip install -r services/transcribe/requirements.txt"
             )
         self.model = model
+        self._limiter = limiter or nullcontext()
+        self.workers = max(1, workers)
+        self.registry = registry
+        self.metrics = metrics or RunMetrics()
 
     def pseudonymize(
         self,
@@ -75,29 +123,72 @@ class Pseudonymizer:
         Erkennt Namen im Transkript, ersetzt sie durch Codes und speichert die Zuordnung.
         Gibt das pseudonymisierte Transkript zurück.
         """
+        known: List[Dict[str, str]] = []
+        if self.registry is not None:
+            known = self._present(transcript, self.registry.mappings())
+            if known:
+                print(f"      {len(known)} bekannte(r) Name(n) aus dem Register ersetzt.")
+                transcript = self._apply_mappings(transcript, known)
+
         mappings = self._detect_names(transcript, interview_id)
+        if self.registry is not None and mappings:
+            mappings = self.registry.register(mappings, interview_id)
 
-        if not mappings:
+        if not mappings and not known:
             print("      Keine pseudonymisierungspflichtigen Daten gefunden.")
             self._save_mapping(mappings, interview_id, mapping_output_path)
             return transcript
 
-        print(f"      {len(mappings)} Einträge erkannt:")
+        if mappings:
+            print(f"      {len(mappings)} neue Einträge erkannt:")
         for m in mappings:
             print(f"        {m['original']!r} → {m['pseudonym']!r}  ({m['type']})")
 
         pseudonymized = self._apply_mappings(transcript, mappings)
-        self._save_mapping(mappings, interview_id, mapping_output_path)
+        self._save_mapping(known + mappings, interview_id, mapping_output_path)
         return pseudonymized
 
     def _detect_names(self, transcript: str, interview_id: str) -> List[Dict[str, str]]:
-        prompt = _DETECT_PROMPT.replace("{interview_id}", interview_id).replace("{transcript}", transcript)
+        windows = self._windows(transcript)
+        if len(windows) > 1:
+            print(f"      Namenserkennung in {len(windows)} Fenstern "
+                  f"({min(self.workers, len(windows))} parallel)...")
+        with ThreadPoolExecutor(
+            max_workers=min(self.workers, len(windows)), thread_name_prefix="pseudonym"
+        ) as pool:
+            found = list(pool.map(lambda w: self._detect_window(w, interview_id), windows))
+        return self._merge_mappings(found, transcript, interview_id)
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2048,
-            messages=[{"role": "user", "content": prompt}],
-        )
+    @staticmethod
+    def _windows(transcript: str, limit: int = WINDOW_CHARS) -> List[str]:
+        """Teilt das Transkript an Absatzgrenzen in Fenster von höchstens ~limit Zeichen."""
+        windows: List[str] = []
+        current: List[str] = []
+        size = 0
+        for paragraph in split_paragraphs(transcript):
+            if current and size + len(paragraph) > limit:
+                windows.append(join_paragraphs(current))
+                current, size = [], 0
+            current.append(paragraph)
+            size += len(paragraph) + 2
+        if current:
+            windows.append(join_paragraphs(current))
+        return windows or [transcript]
+
+    def _detect_window(self, window: str, interview_id: str) -> List[Dict[str, str]]:
+        prompt = _DETECT_PROMPT.replace("{interview_id}", interview_id).replace("{transcript}", window)
+
+        with self._limiter, self.metrics.span("claude.pseudonymize"):
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=4096,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        self.metrics.record_usage("anthropic", response)
+
+        if getattr(response, "stop_reason", None) == "max_tokens":
+            print("      Warnung: Antwort der Namenserkennung bei max_tokens abgeschnitten — "
+                  "Zuordnungen dieses Fensters können unvollständig sein.")
 
         raw = response.content[0].text.strip()
 
@@ -111,22 +202,145 @@ class Pseudonymizer:
             data = json.loads(raw)
             return data.get("mappings", [])
         except json.JSONDecodeError as exc:
-            print(f"      Warnung: JSON-Parsing fehlgeschlagen ({exc}). Pseudonymisierung übersprungen.")
+            print(f"      Warnung: JSON-Parsing fehlgeschlagen ({exc}). Fenster übersprungen.")
             return []
 
+    @staticmethod
+    def _merge_mappings(
+        found: List[List[Dict[str, str]]],
+        transcript: str,
+        interview_id: str,
+    ) -> List[Dict[str, str]]:
+        """
+        Führt die Zuordnungen aller Fenster zusammen (Union-Find): gleiches Original
+        (ohne Groß-/Kleinschreibung) und gleiches Pseudonym im selben Fenster gehören zu
+        einer Person bzw. Organisation. Jede Gruppe erhält einen Code; KP-xx, Org-X, Ort-X
+        und alle übrigen Typen werden je Präfix nach erstem Vorkommen im Transkript neu
+        vergeben — gleiche Vorschläge verschiedener Fenster bleiben so getrennt.
+        """
+        windows = [
+            (w, m) for w, mappings in enumerate(found) for m in mappings
+            if m.get("original", "").strip() and m.get("pseudonym", "").strip()
+            and not _CODE.match(m["original"].strip()) and m["original"].strip() != interview_id
+        ]
+        entries = [m for _, m in windows]
+        parent = list(range(len(entries)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        first_seen: Dict[tuple, int] = {}
+        for i, (w, m) in enumerate(windows):
+            for key in (("original", m["original"].strip().casefold()),
+                        ("pseudonym", w, m["pseudonym"].strip())):
+                if key in first_seen:
+                    parent[find(i)] = find(first_seen[key])
+                else:
+                    first_seen[key] = i
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(entries)):
+            groups.setdefault(find(i), []).append(i)
+
+        folded = transcript.casefold()
+
+        def position(members: List[int]) -> int:
+            hits = [folded.find(entries[i]["original"].strip().casefold()) for i in members]
+            return min((h for h in hits if h >= 0), default=len(folded))
+
+        def group_type(members: List[int]) -> str:
+            types = [entries[i].get("type", "") for i in members]
+            return min(types, key=lambda t: _TYPE_PRIORITY.index(t) if t in _TYPE_PRIORITY else len(_TYPE_PRIORITY))
+
+        counters: Dict[str, int] = {}
+        merged: List[Dict[str, str]] = []
+        for members in sorted(groups.values(), key=lambda g: (position(g), g[0])):
+            kind = group_type(members)
+            if kind == "person_interviewee":
+                pseudonym = interview_id
+            elif kind == "person_interviewer":
+                pseudonym = "(Interviewer)"
+            elif kind == "person_other":
+                counters["KP"] = counters.get("KP", 0) + 1
+                pseudonym = f"KP-{counters['KP']:02d}"
+            else:
+                proposed = _PROPOSED_PREFIX.match(entries[members[0]]["pseudonym"].strip())
+                prefix = _TYPE_PREFIX.get(kind) or (proposed.group(1) if proposed else "Info")
+                counters[prefix] = counters.get(prefix, 0) + 1
+                pseudonym = f"{prefix}-{letter_code(counters[prefix])}"
+
+            seen = set()
+            for i in members:
+                original = entries[i]["original"].strip()
+                if original.casefold() in seen:
+                    continue
+                seen.add(original.casefold())
+                merged.append({"original": original, "pseudonym": pseudonym, "type": kind})
+        return merged
+
     @staticmethod
     def _apply_mappings(text: str, mappings: List[Dict[str, str]]) -> str:
-        # Sort longest first to avoid partial replacements (e.g. "Max Müller" before "Max")
-        sorted_mappings = sorted(mappings, key=lambda m: len(m.get("original", "")), reverse=True)
-        for mapping in sorted_mappings:
+        """
+        Ersetzt alle Originale in einem Durchlauf (eine Alternation, längste Namen zuerst,
+        z.B. "Max Müller" vor "Max"). Bereits eingesetzte Pseudonyme werden nicht erneut
+        durchsucht; Groß-/Kleinschreibung wird ignoriert, nur ganze Wörter zählen.
+        """
+        matcher = Pseudonymizer._matcher(mappings)
+        if matcher is None:
+            return text
+        pattern, replacements, originals = matcher
+
+        def replace(match: "re.Match") -> str:
+            found = match.group(0)
+            pseudonym = replacements.get(found.casefold())
+            if pseudonym is None:
+                # Sonderfälle der Groß-/Kleinschreibung (z.B. "İ"): Original einzeln prüfen
+                pseudonym = next((
+                    replacements[key] for key, original in originals.items()
+                    if re.fullmatch(re.escape(original), found, flags=re.IGNORECASE)
+                ), None)
+            if pseudonym is None:
+                # StopIteration darf nicht aus re.sub entkommen; Stelle bleibt sichtbar
+                print("      Warnung: Treffer ohne zugehöriges Original — Stelle nicht ersetzt.")
+                return found
+            return pseudonym
+
+        return pattern.sub(replace, text)
+
+    @staticmethod
+    def _matcher(
+        mappings: List[Dict[str, str]],
+    ) -> Optional[Tuple["re.Pattern", Dict[str, str], Dict[str, str]]]:
+        """Alternation aller Originale plus Pseudonym und Original je casefold-Schlüssel."""
+        replacements: Dict[str, str] = {}
+        originals: Dict[str, str] = {}
+        for mapping in mappings:
             original = mapping.get("original", "").strip()
             pseudonym = mapping.get("pseudonym", "").strip()
-            if not original or not pseudonym:
-                continue
-            # Word-boundary replacement, case-insensitive
-            pattern = r'(?<!\w)' + re.escape(original) + r'(?!\w)'
-            text = re.sub(pattern, pseudonym, text, flags=re.IGNORECASE)
-        return text
+            if original and pseudonym and original.casefold() not in replacements:
+                replacements[original.casefold()] = pseudonym
+                originals[original.casefold()] = original
+        if not replacements:
+            return None
+
+        alternation = "|".join(
+            re.escape(original) for original in sorted(originals.values(), key=len, reverse=True)
+        )
+        pattern = re.compile(r"(?<!\w)(?:" + alternation + r")(?!\w)", flags=re.IGNORECASE)
+        return pattern, replacements, originals
+
+    @staticmethod
+    def _present(text: str, mappings: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Zuordnungen, deren Original im Text vorkommt."""
+        matcher = Pseudonymizer._matcher(mappings)
+        if matcher is None:
+            return []
+        pattern, _, _ = matcher
+        found = {match.group(0).casefold() for match in pattern.finditer(text)}
+        return [m for m in mappings if m.get("original", "").strip().casefold() in found]
 
     def _save_mapping(
         self,
@@ -0,0 +1,103 @@
+"""
+Globale API-Budgets für parallel laufende Transkriptionen.
+
+Ein RateLimiter begrenzt pro Anbieter (OpenAI, Anthropic) die Zahl gleichzeitiger
+Anfragen und optional die Anfragen pro Minute (gleitendes 60-Sekunden-Fenster).
+Alle Clients eines Prozesses teilen sich dieselbe Instanz, sodass mehrere Interviews
+gemeinsam im Budget bleiben. Verwendung als Kontextmanager um jeden API-Aufruf —
+synchron (with) oder in der asyncio-Pipeline (async with).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+
+class RateLimiter:
+    def __init__(self, name: str, max_concurrent: int = 4, requests_per_minute: Optional[int] = None):
+        """
+        name:                Anbieter, nur für Meldungen
+        max_concurrent:      max. gleichzeitig laufende Anfragen
+        requests_per_minute: max. gestartete Anfragen pro 60 Sekunden (None = unbegrenzt)
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.requests_per_minute = requests_per_minute
+        # Belegte Slots; synchrone Aufrufer warten an der Condition, Coroutinen auf einem
+        # Future ihrer Event-Loop (kein blockierter Executor-Thread)
+        self._slots = threading.Condition()
+        self._active = 0
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._lock = threading.Lock()
+        self._started: Deque[float] = deque()
+
+    def __enter__(self) -> "RateLimiter":
+        with self._slots:
+            self._slots.wait_for(lambda: self._active < self.max_concurrent)
+            self._active += 1
+        try:
+            while self.requests_per_minute and (delay := self._budget_delay()) > 0:
+                time.sleep(delay)
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._release()
+
+    async def __aenter__(self) -> "RateLimiter":
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._slots:
+                if self._active < self.max_concurrent:
+                    self._active += 1
+                    break
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            finally:
+                with self._slots:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+        try:
+            while self.requests_per_minute and (delay := self._budget_delay()) > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        with self._slots:
+            self._active -= 1
+            self._slots.notify()
+            waiters, self._async_waiters = self._async_waiters, []
+        # Alle wartenden Coroutinen versuchen es erneut (abgebrochene gehen so nicht verloren)
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass   # Event-Loop bereits geschlossen
+
+    def _budget_delay(self) -> float:
+        """Reserviert einen Start im 60-Sekunden-Fenster (0) oder gibt die Wartezeit zurück."""
+        with self._lock:
+            now = time.monotonic()
+            while self._started and now - self._started[0] >= 60:
+                self._started.popleft()
+            if len(self._started) < self.requests_per_minute:
+                self._started.append(now)
+                return 0.0
+            return 60 - (now - self._started[0])
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -1,10 +1,41 @@
 """
 RTF-Writer für MAXQDA-kompatible Transkriptdateien.
 Erzeugt einfaches RTF mit Unicode-Kodierung nach Regel 15 von Dresing & Pehl (2017).
+
+Escaping über eine str.translate-Tabelle (Nicht-ASCII-Zeichen werden beim ersten
+Auftreten berechnet und zwischengespeichert); reine ASCII-Zeilen ohne RTF-Steuerzeichen
+werden unverändert übernommen. Die Datei wird zeilenweise geschrieben.
 """
 
+import re
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterator
+
+# Zeichen, die auch in reinen ASCII-Zeilen escaped werden müssen
+_RTF_SPECIAL = re.compile(r"[\\{}\n]")
+
+
+class _RTFEscapes(dict):
+    """Übersetzungstabelle für str.translate; Einträge entstehen bei Bedarf."""
+
+    def __missing__(self, code: int) -> str:
+        if code < 128:
+            value = chr(code)
+        else:
+            # RTF \uN erwartet vorzeichenbehaftete 16-bit-Ganzzahl
+            signed = code if code <= 32767 else code - 65536
+            value = f"\\u{signed}?"
+        self[code] = value
+        return value
+
+
+_ESCAPES: Dict[int, str] = _RTFEscapes({
+    ord("\\"): "\\\\",
+    ord("{"): "\\{",
+    ord("}"): "\\}",
+    ord("\n"): "\\line\n",
+})
 
 
 class RTFWriter:
@@ -25,11 +56,9 @@ class RTFWriter:
         if not date_str:
             date_str = datetime.now().strftime("%d.%m.%Y")
 
-        rtf_body = self._build_rtf(transcript, interview_name, date_str)
-
         # RTF-Dateien werden in Windows-1252 kodiert; Unicode-Escape für Nicht-ASCII
         with open(output_path, "w", encoding="ascii", errors="replace") as f:
-            f.write(rtf_body)
+            f.writelines(self._iter_rtf(transcript, interview_name, date_str))
 
     @staticmethod
     def _rtf_unicode(text: str) -> str:
@@ -37,53 +66,36 @@ class RTFWriter:
         Wandelt Unicode-Zeichen in RTF-Escape-Sequenzen um.
         \\uN? = Unicode-Codepoint N (vorzeichenbehaftet 16-bit) per RTF-Spec.
         """
-        result = []
-        for char in text:
-            code = ord(char)
-            if code < 128:
-                if char == "\\":
-                    result.append("\\\\")
-                elif char == "{":
-                    result.append("\\{")
-                elif char == "}":
-                    result.append("\\}")
-                elif char == "\n":
-                    result.append("\\line\n")
-                else:
-                    result.append(char)
-            else:
-                # RTF \uN erwartet vorzeichenbehaftete 16-bit-Ganzzahl
-                signed = code if code <= 32767 else code - 65536
-                result.append(f"\\u{signed}?")
-        return "".join(result)
+        if text.isascii() and not _RTF_SPECIAL.search(text):
+            return text
+        return text.translate(_ESCAPES)
 
     def _build_rtf(self, transcript: str, interview_name: str, date_str: str) -> str:
-        lines = []
+        return "".join(self._iter_rtf(transcript, interview_name, date_str))
 
+    def _iter_rtf(self, transcript: str, interview_name: str, date_str: str) -> Iterator[str]:
+        """RTF-Dokument zeilenweise (jede Zeile außer der letzten mit Zeilenumbruch)."""
         # RTF-Header — MAXQDA-kompatibel
-        lines.append(r"{\rtf1\ansi\ansicpg1252\uc1\deff0")
-        lines.append(r"{\fonttbl{\f0\fswiss\fcharset0 Arial;}{\f1\froman\fcharset0 Times New Roman;}}")
-        lines.append(r"{\colortbl;\red0\green0\blue0;}")
-        lines.append(r"\f0\fs24\sl360\slmult1")
-        lines.append("")
+        yield "{\\rtf1\\ansi\\ansicpg1252\\uc1\\deff0\n"
+        yield "{\\fonttbl{\\f0\\fswiss\\fcharset0 Arial;}{\\f1\\froman\\fcharset0 Times New Roman;}}\n"
+        yield "{\\colortbl;\\red0\\green0\\blue0;}\n"
+        yield "\\f0\\fs24\\sl360\\slmult1\n"
+        yield "\n"
 
         # Titelblock
         name_rtf = self._rtf_unicode(interview_name)
-        lines.append(f"\\b\\fs28 {name_rtf}\\b0\\fs24\\line")
-        lines.append(f"Datum: {date_str}\\line")
-        lines.append("\\line")
+        yield f"\\b\\fs28 {name_rtf}\\b0\\fs24\\line\n"
+        yield f"Datum: {date_str}\\line\n"
+        yield "\\line\n"
 
         # Transkripttext zeilenweise verarbeiten
         for line in transcript.split("\n"):
             stripped = line.strip()
             if not stripped:
-                lines.append("\\line")
+                yield "\\line\n"
                 continue
 
             # Zeitmarken #HH:MM:SS# bleiben als Plain Text (MAXQDA erkennt sie)
-            rtf_line = self._rtf_unicode(stripped)
-            lines.append(f"{rtf_line}\\line")
-
-        lines.append("}")
+            yield f"{self._rtf_unicode(stripped)}\\line\n"
 
-        return "\n".join(lines)
+        yield "}"
@@ -0,0 +1,123 @@
+"""
+Laufzeit-, Token- und Byte-Messung für einen Transkriptionslauf.
+
+RunMetrics sammelt Spans (Kontextmanager, Dauer und Anzahl je Name) und Zähler
+(z.B. Anthropic-Tokens aus response.usage, hochgeladene Bytes). Die Clients erhalten
+das Objekt eines Interviews und zählen selbst; transcribe.py misst die Stufen und
+schreibt am Ende einen JSON-Bericht (<name>.metrics.json) neben das Transkript,
+optional zusätzlich im Prometheus-Textformat (<name>.metrics.prom) für den
+Textfile-Collector des node_exporter.
+
+Spans paralleler Aufrufe (z.B. Whisper-Worker) werden aufsummiert: "seconds" ist die
+gesamte Bearbeitungszeit, nicht die Wanduhr-Zeit der Stufe.
+"""
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+# Felder von response.usage (Anthropic), die als Zähler übernommen werden
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Misst die Dauer des Blocks unter `name` (auch bei Fehlern)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                entry = self.spans.setdefault(name, {"count": 0, "seconds": 0.0})
+                entry["count"] += 1
+                entry["seconds"] += elapsed
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_usage(self, name: str, response) -> None:
+        """Übernimmt die Token-Zahlen einer Anthropic-Antwort als Zähler `<name>.<feld>`."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for field in USAGE_FIELDS:
+            value = getattr(usage, field, None)
+            if value:
+                self.add(f"{name}.{field}", value)
+
+    def report(self, **meta: Any) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **meta,
+                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "wall_seconds": round(time.monotonic() - self._started, 3),
+                "spans": {
+                    name: {"count": entry["count"], "seconds": round(entry["seconds"], 3)}
+                    for name, entry in sorted(self.spans.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def write_json(self, path: Path, **meta: Any) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(**meta), f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path: Path, **labels: str) -> None:
+        """
+        Schreibt Spans und Zähler im Prometheus-Textformat (Exposition 0.0.4), wie es der
+        Textfile-Collector des node_exporter einliest. Die Datei wird per Umbenennen
+        ersetzt, damit der Collector nie eine halb geschriebene Datei sieht.
+        """
+        label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+        braces = f"{{{label_text}}}" if label_text else ""
+        report = self.report()
+        lines = [
+            "# TYPE transcribe_run_seconds gauge",
+            f"transcribe_run_seconds{braces} {report['wall_seconds']}",
+        ]
+        samples = []
+        for name, entry in report["spans"].items():
+            metric = f"transcribe_{_metric_name(name)}"
+            samples.append((f"{metric}_seconds_total", entry["seconds"]))
+            samples.append((f"{metric}_calls_total", entry["count"]))
+        for name, value in report["counters"].items():
+            samples.append((f"transcribe_{_metric_name(name)}_total", value))
+        for metric, value in samples:
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{braces} {value}")
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        tmp_path.replace(path)
+
+    def write_openmetrics(self, path: Path, **labels: str) -> None:
+        """Veraltet — schreibt wie write_prometheus() das Prometheus-Textformat."""
+        self.write_prometheus(path, **labels)
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
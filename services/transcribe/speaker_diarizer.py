@@ -2,9 +2,9 @@
 Speaker-Diarisierung via pyannote.audio (Phase 2 — optional).
 
 Identifiziert, wer wann spricht, auf Basis von Audiomerkmalen (kein Video nötig).
-Gibt Zeitstempel-Segmente pro Sprecher zurück, die dann als Kontext an Claude
-übergeben werden. Damit muss Claude nur noch SPEAKER_00 / SPEAKER_01 auf I: / B:
-abbilden statt beides selbst zu erkennen.
+Gibt Zeitstempel-Segmente pro Sprecher zurück; SpeakerTimeline ordnet damit jedes
+Whisper-Segment lokal einem Sprecher zu. Claude muss so nur noch SPEAKER_00 /
+SPEAKER_01 auf I: / B: abbilden statt beides selbst zu erkennen.
 
 Voraussetzungen:
   pip install pyannote.audio
@@ -13,16 +13,25 @@ Voraussetzungen:
 
 Verwendung:
   from speaker_diarizer import SpeakerDiarizer
-  segments = SpeakerDiarizer(hf_token="hf_...").diarize(audio_path)
+  diarizer = SpeakerDiarizer(hf_token="hf_...")
+  segments = diarizer.diarize(audio_path)   # weitere Aufrufe nutzen das geladene Modell
   # → [{"speaker": "SPEAKER_00", "start": 0.0, "end": 4.2}, ...]
 
-Aufruf über transcribe.py: --diarize Flag aktiviert dieses Modul.
+Aufruf über transcribe.py: --diarize Flag aktiviert dieses Modul. Dort läuft die
+Diarisierung über BackgroundDiarization in einem eigenen Prozess, parallel zu den
+Whisper-Uploads; die Formatierung wartet erst auf das Ergebnis, wenn sie es braucht.
 """
 
 from __future__ import annotations
 
+import bisect
+import functools
+import importlib.util
+import multiprocessing
 import os
 import sys
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 from typing import NamedTuple
 
@@ -33,6 +42,57 @@ class SpeakerSegment(NamedTuple):
     end: float
 
 
+class SpeakerTimeline:
+    """
+    Intervall-Index über SpeakerSegments für zeitliche Ausschnitte.
+
+    Aufeinanderfolgende Segmente desselben Sprechers werden zusammengefasst. Starts
+    und Enden liegen in sortierten Listen; eine Präfix-Maximum-Liste der Enden macht
+    die Überlappungsabfrage per bisect möglich, obwohl sich Segmente überschneiden
+    können (gleichzeitiges Sprechen).
+    """
+
+    def __init__(self, segments: list[SpeakerSegment]):
+        merged: list[SpeakerSegment] = []
+        for seg in sorted(segments, key=lambda s: (s.start, s.end)):
+            if merged and merged[-1].speaker == seg.speaker:
+                last = merged[-1]
+                merged[-1] = last._replace(end=max(last.end, seg.end))
+            else:
+                merged.append(seg)
+
+        self.segments = merged
+        self.starts = [seg.start for seg in merged]
+        self.ends = [seg.end for seg in merged]
+        self._max_end: list[float] = []
+        running = float("-inf")
+        for end in self.ends:
+            running = max(running, end)
+            self._max_end.append(running)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def overlapping(self, start: float, end: float) -> list[SpeakerSegment]:
+        """Alle Segmente, die das Intervall [start, end] schneiden, nach Startzeit."""
+        lo = bisect.bisect_right(self._max_end, start)   # davor endet alles vor `start`
+        hi = bisect.bisect_left(self.starts, end)        # ab hier beginnt alles nach `end`
+        return [self.segments[i] for i in range(lo, hi) if self.ends[i] > start]
+
+    def speaker_for(self, start: float, end: float) -> str | None:
+        """Sprecher mit der größten zeitlichen Überlappung mit [start, end], sonst None."""
+        overlap: dict[str, float] = {}
+        for seg in self.overlapping(start, end):
+            overlap[seg.speaker] = overlap.get(seg.speaker, 0.0) + min(seg.end, end) - max(seg.start, start)
+        if not overlap:
+            return None
+        return max(overlap, key=overlap.get)
+
+    def label(self, segments: list[dict]) -> list[dict]:
+        """Whisper-Segmente (Kopien) mit Schlüssel "speaker" aus der Diarisierung versehen."""
+        return [{**seg, "speaker": self.speaker_for(seg["start"], seg["end"])} for seg in segments]
+
+
 class SpeakerDiarizer:
     MODEL_ID = "pyannote/speaker-diarization-3.1"
 
@@ -44,6 +104,8 @@ class SpeakerDiarizer:
         """
         self.hf_token = hf_token or os.environ.get("HF_TOKEN", "")
         self.num_speakers = num_speakers
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
 
         if not self.hf_token:
             raise ValueError(
@@ -55,6 +117,32 @@ class SpeakerDiarizer:
                 "https://huggingface.co/pyannote/speaker-diarization-3.1"
             )
 
+    def load_pipeline(self):
+        """
+        Lädt das pyannote-Modell beim ersten Aufruf und hält es für weitere Aufnahmen
+        vor — Gewichte und Graph werden pro Instanz nur einmal aufgebaut.
+        """
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                self._check_pyannote()
+
+                from pyannote.audio import Pipeline
+                import torch
+
+                print(f"  Lade Diarisierungs-Modell ({self.MODEL_ID})...")
+                pipeline = Pipeline.from_pretrained(
+                    self.MODEL_ID,
+                    use_auth_token=self.hf_token,
+                )
+
+                # MPS (Apple Silicon) oder CUDA falls verfügbar
+                device = self._best_device()
+                if device:
+                    print(f"  Nutze Device: {device}")
+                    pipeline.to(torch.device(device))
+                self._pipeline = pipeline
+            return self._pipeline
+
     def diarize(self, audio_path: Path) -> list[SpeakerSegment]:
         """
         Führt Speaker-Diarisierung durch.
@@ -62,22 +150,7 @@ class SpeakerDiarizer:
         audio_path:  Pfad zur MP3/WAV-Audiodatei
         Rückgabe:    Sortierte Liste von SpeakerSegment (speaker, start, end)
         """
-        self._check_pyannote()
-
-        from pyannote.audio import Pipeline
-        import torch
-
-        print(f"  Lade Diarisierungs-Modell ({self.MODEL_ID})...")
-        pipeline = Pipeline.from_pretrained(
-            self.MODEL_ID,
-            use_auth_token=self.hf_token,
-        )
-
-        # MPS (Apple Silicon) oder CUDA falls verfügbar
-        device = self._best_device()
-        if device:
-            print(f"  Nutze Device: {device}")
-            pipeline.to(torch.device(device))
+        pipeline = self.load_pipeline()
 
         print(f"  Diarisierung läuft: {audio_path.name}")
         diarization = pipeline(
@@ -97,15 +170,16 @@ class SpeakerDiarizer:
         print(f"  → {len(segments)} Sprecher-Segment(e) erkannt.")
         return segments
 
-    def segments_to_context(self, segments: list[SpeakerSegment]) -> str:
+    @staticmethod
+    def segments_to_context(segments: list[SpeakerSegment]) -> str:
         """
-        Formatiert Diarisierungs-Ergebnis als lesbaren Kontext-String für Claude.
-        Claude nutzt diese Zeitstempel, um I: / B: zuzuordnen.
+        Formatiert das Diarisierungs-Ergebnis als lesbaren Text (Ausgabe des Modul-CLI).
         """
         lines = ["Sprecher-Diarisierung (wer spricht wann):"]
         for seg in segments:
             lines.append(
-                f"  {seg.speaker}: {self._fmt_time(seg.start)} – {self._fmt_time(seg.end)}"
+                f"  {seg.speaker}: {SpeakerDiarizer._fmt_time(seg.start)} – "
+                f"{SpeakerDiarizer._fmt_time(seg.end)}"
             )
         return "\n".join(lines)
 
@@ -140,22 +214,108 @@ class SpeakerDiarizer:
             sys.exit(1)
 
 
+# Im Diarisierungs-Prozess: eine Instanz für alle Aufträge, Modell bleibt geladen
+_worker_diarizer: SpeakerDiarizer | None = None
+
+
+def _init_worker(hf_token: str, num_speakers: int) -> None:
+    global _worker_diarizer
+    _worker_diarizer = SpeakerDiarizer(hf_token=hf_token, num_speakers=num_speakers)
+
+
+def _diarize_in_worker(audio_path: str) -> list[SpeakerSegment]:
+    """Einstiegspunkt im Diarisierungs-Prozess (muss auf Modulebene liegen)."""
+    try:
+        return _worker_diarizer.diarize(Path(audio_path))
+    except SystemExit:
+        # Ein sys.exit im Pool-Worker würde den Auftrag verlieren statt ihn fehlschlagen zu lassen
+        raise RuntimeError("Diarisierung abgebrochen (siehe Ausgabe oben)")
+
+
+class BackgroundDiarization:
+    """
+    Führt SpeakerDiarizer.diarize in einem separaten Prozess aus. pyannote ist
+    CPU-lastig, die Whisper-Uploads warten auf das Netz — beide überlappen so.
+
+    Der Prozess ist langlebig: Das Modell wird beim ersten Auftrag geladen und für
+    alle weiteren Aufnahmen wiederverwendet (Batch-Läufe teilen sich eine Instanz).
+    Aufträge werden nacheinander abgearbeitet.
+    """
+
+    def __init__(self, diarizer: SpeakerDiarizer):
+        # Nur prüfen, nicht importieren — torch lädt erst im Diarisierungs-Prozess
+        try:
+            installed = importlib.util.find_spec("pyannote.audio") is not None
+        except ModuleNotFoundError:
+            installed = False
+        if not installed:
+            diarizer._check_pyannote()
+        self.diarizer = diarizer
+        # spawn statt fork: torch und die Thread-Pools des Elternprozesses vertragen fork nicht
+        self._pool = multiprocessing.get_context("spawn").Pool(
+            processes=1,
+            initializer=_init_worker,
+            initargs=(diarizer.hf_token, diarizer.num_speakers),
+        )
+        self._futures: list[Future] = []
+        # Ergebnis-Callbacks (Thread des Pools) und close() setzen Futures nie gleichzeitig
+        self._settle_lock = threading.Lock()
+
+    def submit(self, audio_path: Path) -> Future:
+        """Startet die Diarisierung; das Future liefert die Liste von SpeakerSegment."""
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        self._pool.apply_async(
+            _diarize_in_worker,
+            (str(audio_path),),
+            callback=functools.partial(self._settle, future),
+            error_callback=functools.partial(self._settle, future, failed=True),
+        )
+        self._futures.append(future)
+        return future
+
+    def _settle(self, future: Future, outcome, failed: bool = False) -> None:
+        """Setzt Ergebnis oder Fehler, falls das Future noch offen ist."""
+        with self._settle_lock:
+            if future.done():
+                return
+            if failed:
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def close(self) -> None:
+        """Beendet den Prozess; noch laufende Diarisierungen werden abgebrochen."""
+        with self._settle_lock:
+            pending = [future for future in self._futures if not future.done()]
+        if pending:
+            self._pool.terminate()
+            for future in pending:
+                # Ein Ergebnis, das noch vor dem Abbruch eintraf, bleibt gültig
+                self._settle(future, RuntimeError("Diarisierung abgebrochen"), failed=True)
+        else:
+            self._pool.close()
+        self._pool.join()
+
+
 if __name__ == "__main__":
     import argparse
 
-    parser = argparse.ArgumentParser(description="Speaker-Diarisierung für Audiodatei.")
-    parser.add_argument("audio_file", help="Pfad zur Audiodatei (MP3, WAV)")
+    parser = argparse.ArgumentParser(description="Speaker-Diarisierung für Audiodateien.")
+    parser.add_argument("audio_files", nargs="+", help="Pfad(e) zu Audiodateien (MP3, WAV)")
     parser.add_argument("--num-speakers", type=int, default=2, help="Anzahl Sprecher (Standard: 2)")
     args = parser.parse_args()
 
-    audio = Path(args.audio_file)
-    if not audio.exists():
-        print(f"Fehler: Datei nicht gefunden: {audio}")
-        sys.exit(1)
+    audio_files = [Path(a) for a in args.audio_files]
+    for audio in audio_files:
+        if not audio.exists():
+            print(f"Fehler: Datei nicht gefunden: {audio}")
+            sys.exit(1)
 
     hf_token = os.environ.get("HF_TOKEN", "")
     diarizer = SpeakerDiarizer(hf_token=hf_token, num_speakers=args.num_speakers)
-    segs = diarizer.diarize(audio)
+    for audio in audio_files:
+        segs = diarizer.diarize(audio)   # Modell wird nur beim ersten Durchlauf geladen
 
-    print("\nErgebnis:")
-    print(diarizer.segments_to_context(segs))
+        print(f"\nErgebnis ({audio.name}):")
+        print(diarizer.segments_to_context(segs))
@@ -0,0 +1,12 @@
+"""
+Tests des Transkriptions-Service (reine Python-Logik, ohne API-Aufrufe und ffmpeg).
+
+Ausführen im Verzeichnis services/transcribe:
+    python3 -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+# Die Module des Service werden flach importiert (wie in transcribe.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
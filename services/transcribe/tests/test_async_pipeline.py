@@ -0,0 +1,61 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from async_pipeline import AsyncChunkPipeline
+from audio_chunker import AudioChunk
+from chunk_pipeline import PipelineError
+
+
+class FakeWhisper:
+    def transcribe(self, audio_path, language, time_offset):
+        seg = {"start": time_offset + 1, "end": time_offset + 2, "text": f"t{int(time_offset)}"}
+        return {"segments": [seg], "text": seg["text"], "language": language}
+
+
+class FakeFormatter:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def format_chunk(self, raw_segments, previous_context, chunk_index):
+        if self.fail:
+            raise RuntimeError("API-Fehler")
+        return " ".join(seg["text"] for seg in raw_segments)
+
+
+def _chunk(index, start, end):
+    return AudioChunk(Path(f"chunk_{index}.mp3"), start, end, index, is_temp=False)
+
+
+def test_async_pipeline_matches_thread_pipeline_output():
+    chunks = [_chunk(0, 0, 100), _chunk(1, 100, 200)]
+    pipeline = AsyncChunkPipeline(FakeWhisper(), FakeFormatter(), format_duration=100)
+    assert pipeline.run(chunks) == ["t0", "t100"]
+
+
+def test_failure_waits_for_running_generator_before_closing_it():
+    release = threading.Event()
+    closed = []
+
+    def chunks():
+        try:
+            yield _chunk(0, 0, 100)
+            yield _chunk(1, 100, 200)
+            release.wait(5)   # ffmpeg liefert den nächsten Chunk erst später
+            yield _chunk(2, 200, 300)
+        finally:
+            closed.append(True)
+
+    # Freigabe erst, nachdem der Formatierungsfehler die Pipeline abbricht
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+    pipeline = AsyncChunkPipeline(FakeWhisper(), FakeFormatter(fail=True), format_duration=100)
+    stream = chunks()
+    try:
+        with pytest.raises(PipelineError, match="Claude-Formatierung"):
+            pipeline.run(stream, total_duration=300)
+    finally:
+        timer.cancel()
+        release.set()
+    assert closed == [True]
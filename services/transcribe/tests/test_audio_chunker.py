@@ -0,0 +1,164 @@
+import io
+import subprocess
+from array import array
+
+import pytest
+
+import audio_chunker
+from audio_chunker import PIPE_BYTES_PER_SECOND, PIPE_SAMPLE_RATE, AudioChunker
+
+
+def _pcm(*parts):
+    """PCM aus (Sekunden, Amplitude)-Abschnitten; Amplitude 0 = Stille."""
+    samples = array("h")
+    for seconds, amplitude in parts:
+        count = int(seconds * PIPE_SAMPLE_RATE)
+        # Rechteckwelle, damit der RMS der Amplitude entspricht
+        samples.extend(amplitude if i % 2 else -amplitude for i in range(count))
+    return samples.tobytes()
+
+
+class _FakeDecoder:
+    def __init__(self, pcm):
+        self.stdout = io.BytesIO(pcm)
+        self.stderr = io.BytesIO(b"")
+        self.returncode = 0
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+    def wait(self):
+        return self.returncode
+
+
+class _FakeEncoder:
+    def __init__(self, output_path, decoder):
+        self.stdin = io.BytesIO()
+        self.stderr = io.BytesIO(b"")
+        self.output_path = output_path
+        self.decoder = decoder
+        self.log = []   # (Lesestand des Decoders, bisher geschriebene Bytes) je Schreibvorgang
+        close = self.stdin.close
+
+        def write(data):
+            # Wie weit der Decoder gelesen hatte, als der Encoder Daten bekam
+            self.log.append((self.decoder.stdout.tell(), self.stdin.tell()))
+            return io.BytesIO.write(self.stdin, data)
+
+        def finish():
+            with open(self.output_path, "wb") as f:
+                f.write(self.stdin.getvalue())
+            close()
+
+        self.stdin.write = write
+        self.stdin.close = finish
+
+    def poll(self):
+        return 0
+
+    def kill(self):
+        pass
+
+    def wait(self):
+        return 0
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    state = {"encoders": []}
+
+    def popen(cmd, stdin=None, **kwargs):
+        if stdin == subprocess.PIPE:
+            encoder = _FakeEncoder(cmd[-1], state["decoder"])
+            state["encoders"].append(encoder.log)
+            return encoder
+        state["decoder"] = _FakeDecoder(state["pcm"])
+        return state["decoder"]
+
+    monkeypatch.setattr(audio_chunker.subprocess, "Popen", popen)
+    return state
+
+
+def _chunks(chunker, tmp_path):
+    result = []
+    for chunk in chunker.stream_pipe(tmp_path / "interview.mp4"):
+        result.append((chunk.start_time, chunk.end_time, chunk.path.read_bytes()))
+        chunk.cleanup()
+    return result
+
+
+def test_stream_pipe_cuts_with_overlap(fake_ffmpeg, tmp_path):
+    pcm = _pcm((150, 3000))
+    fake_ffmpeg["pcm"] = pcm
+    chunker = AudioChunker(chunk_duration=60, overlap=15)
+
+    chunks = _chunks(chunker, tmp_path)
+
+    assert [(start, end) for start, end, _ in chunks] == [(0, 60), (45, 105), (90, 150)]
+    for start, end, data in chunks:
+        assert data == pcm[int(start) * PIPE_BYTES_PER_SECOND:int(end) * PIPE_BYTES_PER_SECOND]
+
+
+def test_stream_pipe_snaps_to_pause_without_overlap(fake_ffmpeg, tmp_path):
+    pytest.importorskip("numpy")
+    pcm = _pcm((50, 3000), (0.5, 0), (49.5, 3000))
+    fake_ffmpeg["pcm"] = pcm
+    chunker = AudioChunker(chunk_duration=60, overlap=15, snap_to_silence=True)
+
+    chunks = _chunks(chunker, tmp_path)
+
+    assert [(start, end) for start, end, _ in chunks] == [(0, 50.25), (50.25, 100)]
+    assert b"".join(data for _, _, data in chunks) == pcm
+
+
+def test_stream_pipe_buffers_only_the_search_window(fake_ffmpeg, tmp_path):
+    fake_ffmpeg["pcm"] = _pcm((600, 3000))
+    chunker = AudioChunker(chunk_duration=300, overlap=15, search_window=30)
+
+    _chunks(chunker, tmp_path)
+
+    # Erster Chunk: gelesen, aber noch nicht an den Encoder übergeben ist höchstens das
+    # Suchfenster (plus ein Leseblock), nie der ganze Chunk
+    first = fake_ffmpeg["encoders"][0]
+    assert first[0][0] <= 64 * 1024
+    assert max(read - written for read, written in first) <= 30 * PIPE_BYTES_PER_SECOND + 64 * 1024
+
+
+def test_stream_pipe_empty_source_yields_nothing(fake_ffmpeg, tmp_path):
+    fake_ffmpeg["pcm"] = b""
+    assert _chunks(AudioChunker(chunk_duration=60), tmp_path) == []
+
+
+def test_quiet_point_finds_latest_pause():
+    pytest.importorskip("numpy")
+    chunker = AudioChunker(chunk_duration=60, overlap=15, search_window=30)
+    buffer = bytearray(_pcm((5, 3000), (0.5, 0), (10.5, 3000), (0.5, 0), (13.5, 3000)))
+
+    # Fenster beginnt bei 30 s, Ziel 60 s; Pausen bei 35–35,5 s und 46–46,5 s
+    assert chunker._quiet_point(buffer, 30.0, 0.0, 60.0) == pytest.approx(46.25)
+
+
+def test_quiet_point_none_without_pause():
+    pytest.importorskip("numpy")
+    chunker = AudioChunker(chunk_duration=60, overlap=15, search_window=30)
+    buffer = bytearray(_pcm((30, 3000)))
+    assert chunker._quiet_point(buffer, 30.0, 0.0, 60.0) is None
+
+
+def test_quiet_point_prefers_latest_of_equal_pauses():
+    pytest.importorskip("numpy")
+    chunker = AudioChunker(chunk_duration=60, overlap=15, search_window=30)
+    # Durchgehende Stille: alle Fenster gleich leise, gewählt wird das späteste
+    buffer = bytearray(_pcm((30, 0)))
+    assert chunker._quiet_point(buffer, 30.0, 0.0, 60.0) == pytest.approx(59.75)
+
+
+def test_quiet_point_respects_overlap_after_chunk_start():
+    pytest.importorskip("numpy")
+    chunker = AudioChunker(chunk_duration=20, overlap=15, search_window=30)
+    # Pause bei 5–5,5 s liegt vor chunk_start + overlap und darf nicht gewählt werden
+    buffer = bytearray(_pcm((5, 3000), (0.5, 0), (14.5, 3000)))
+    assert chunker._quiet_point(buffer, 0.0, 0.0, 20.0) is None
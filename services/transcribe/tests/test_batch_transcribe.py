@@ -0,0 +1,38 @@
+import pytest
+
+from batch_transcribe import collect_inputs, interview_id_for
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return path
+
+
+def test_prefers_audio_over_video_and_skips_intermediates(tmp_path):
+    audio = _touch(tmp_path / "IP-01.mp3")
+    _touch(tmp_path / "IP-01.mp4")
+    video = _touch(tmp_path / "IP-02.mov")
+    _touch(tmp_path / "IP-02.whisper.ogg")
+    _touch(tmp_path / "notizen.txt")
+
+    assert collect_inputs([str(tmp_path)]) == [audio, video]
+
+
+def test_same_file_from_directory_and_glob_counts_once(tmp_path):
+    audio = _touch(tmp_path / "IP-01.mp3")
+    assert collect_inputs([str(tmp_path), str(tmp_path / "*.mp3")]) == [audio]
+
+
+def test_rejects_same_name_in_different_directories(tmp_path):
+    _touch(tmp_path / "a" / "IP-01.mp3")
+    _touch(tmp_path / "b" / "IP-01.wav")
+    _touch(tmp_path / "b" / "IP-02.wav")
+
+    with pytest.raises(ValueError, match="IP-01"):
+        collect_inputs([str(tmp_path / "a"), str(tmp_path / "b")])
+
+
+def test_interview_id_from_file_name(tmp_path):
+    assert interview_id_for(tmp_path / "ip_3.mp3") == "IP-03"
+    assert interview_id_for(tmp_path / "gespraech.mp3") == "B"
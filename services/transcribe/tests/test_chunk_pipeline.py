@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from audio_chunker import AudioChunk
+from chunk_pipeline import ChunkPipeline
+
+
+class FakeWhisper:
+    """Liefert je Chunk vorgegebene Segmente (globale Zeiten)."""
+
+    def __init__(self, segments_by_start):
+        self.segments_by_start = segments_by_start
+
+    def transcribe(self, audio_path, language, time_offset):
+        segments = self.segments_by_start[time_offset]
+        return {"segments": segments, "text": " ".join(s["text"] for s in segments), "language": language}
+
+
+class FakeFormatter:
+    def __init__(self):
+        self.calls = []
+
+    def format_chunk(self, raw_segments, previous_context, chunk_index):
+        self.calls.append((chunk_index, [seg["text"] for seg in raw_segments]))
+        return " ".join(seg["text"] for seg in raw_segments)
+
+
+def _chunk(index, start, end):
+    return AudioChunk(Path(f"chunk_{index}.mp3"), start, end, index, is_temp=False)
+
+
+def _seg(start, text):
+    return {"start": start, "end": start + 2, "text": text}
+
+
+def test_overlap_segments_belong_to_chunk_of_their_half():
+    # Chunk 0: 0–100, Chunk 1: 90–200 → Überlapp 90–100, Mitte bei 95
+    whisper = FakeWhisper({
+        0: [_seg(10, "a"), _seg(91, "vor-mitte"), _seg(96, "nach-mitte-0")],
+        90: [_seg(91, "vor-mitte-1"), _seg(96, "nach-mitte"), _seg(150, "b")],
+    })
+    pipeline = ChunkPipeline(whisper, FakeFormatter(), whisper_workers=2, format_duration=1000)
+    pipeline.run([_chunk(0, 0, 100), _chunk(1, 90, 200)])
+
+    texts = [seg["text"] for seg in pipeline.owned_segments()]
+    assert texts == ["a", "vor-mitte", "nach-mitte", "b"]
+
+
+def test_chunks_without_overlap_own_from_their_start():
+    whisper = FakeWhisper({0: [_seg(5, "a"), _seg(99, "b")], 100: [_seg(100, "c")]})
+    pipeline = ChunkPipeline(whisper, FakeFormatter(), format_duration=1000)
+    pipeline.run([_chunk(0, 0, 100), _chunk(1, 100, 200)])
+
+    assert [seg["text"] for seg in pipeline.owned_segments()] == ["a", "b", "c"]
+
+
+def test_sections_split_timeline_independently_of_chunks():
+    whisper = FakeWhisper({
+        # Überlapp 50–80, Mitte bei 65: das Segment bei 70 gehört Chunk 1
+        0: [_seg(10, "a"), _seg(70, "b-0")],
+        50: [_seg(70, "b"), _seg(130, "c")],
+    })
+    formatter = FakeFormatter()
+    pipeline = ChunkPipeline(whisper, formatter, format_duration=60)
+    blocks = pipeline.run([_chunk(0, 0, 80), _chunk(1, 50, 150)])
+
+    assert sorted(formatter.calls) == [(0, ["a"]), (1, ["b"]), (2, ["c"])]
+    assert blocks == ["a", "b", "c"]
+
+
+def test_chains_cover_all_sections_in_order():
+    pipeline = ChunkPipeline(None, None, format_workers=3)
+    chains = pipeline._chains(7)
+    assert [list(chain) for chain in chains] == [[0, 1], [2, 3, 4], [5, 6]]
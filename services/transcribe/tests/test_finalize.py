@@ -0,0 +1,104 @@
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from dresing_pehl_formatter import _SEAM_MARKER, DresingPehlFormatter
+from transcript_checks import join_paragraphs, split_paragraphs
+
+
+class _StubMessages:
+    """Antwortet pro Grenze mit edit(tail, head) statt eines API-Aufrufs."""
+
+    def __init__(self, edit, stop_reason="end_turn"):
+        self.edit = edit
+        self.stop_reason = stop_reason
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        prompt = kwargs["messages"][0]["content"]
+        excerpt = prompt.split("## Ausschnitt:\n", 1)[1].rsplit("\n\n## Korrigierter Ausschnitt:", 1)[0]
+        tail, head = excerpt.split(f"\n\n{_SEAM_MARKER}\n\n")
+        text = self.edit(split_paragraphs(tail), split_paragraphs(head))
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=text)],
+            stop_reason=self.stop_reason,
+            usage=None,
+        )
+
+
+@pytest.fixture
+def formatter(monkeypatch):
+    # anthropic wird nur für den Konstruktor gebraucht; der Client wird ersetzt
+    monkeypatch.setitem(sys.modules, "anthropic", types.SimpleNamespace(Anthropic=lambda api_key: None))
+    return DresingPehlFormatter(api_key="test")
+
+
+def _paragraph(n):
+    speaker = "I" if n % 2 else "B"
+    return f"{speaker}: Beitrag {n} " + "und so weiter " * 30 + f"#00:{n // 60:02d}:{n % 60:02d}#"
+
+
+def _blocks():
+    return [join_paragraphs([_paragraph(b * 10 + i) for i in range(10)]) for b in range(3)]
+
+
+def _run(formatter, edit, **kwargs):
+    formatter.client = SimpleNamespace(messages=_StubMessages(edit, **kwargs))
+    return formatter.finalize(_blocks(), workers=2)
+
+
+def test_seam_edit_is_spliced_in_place(formatter):
+    # Die Korrektur entfernt den ersten Absatz von Block B (Doppelung an der Grenze)
+    result = _run(formatter, lambda tail, head: join_paragraphs(tail + head[1:]))
+
+    paragraphs = [_paragraph(n) for n in range(30)]
+    first_heads = {10, 20}
+    expected = join_paragraphs([p for n, p in enumerate(paragraphs) if n not in first_heads])
+    assert result == expected
+    assert formatter.client.messages.calls == 2
+
+
+def test_text_outside_seams_is_byte_identical(formatter):
+    result = _run(formatter, lambda tail, head: join_paragraphs(tail + head).replace("Beitrag", "Teil"))
+
+    paragraphs = split_paragraphs(result)
+    # Nur Absätze in den Grenzfenstern wurden verändert, alle übrigen stehen unverändert da
+    changed = [n for n, p in enumerate(paragraphs) if p != _paragraph(n)]
+    assert changed and all(n in range(8, 12) or n in range(18, 22) for n in changed)
+    assert paragraphs[0] == _paragraph(0)
+    assert paragraphs[15] == _paragraph(15)
+    assert paragraphs[29] == _paragraph(29)
+
+
+@pytest.mark.parametrize("edit", [
+    lambda tail, head: "",                                           # leere Antwort
+    lambda tail, head: "B: Zusammenfassung. #00:00:10#",            # viel zu kurz
+    lambda tail, head: join_paragraphs(tail + head + tail + head),  # viel zu lang
+    lambda tail, head: join_paragraphs([p.rsplit(" #", 1)[0] for p in tail + head]),  # Zeitmarken fehlen
+])
+def test_bad_seam_edit_keeps_original(formatter, edit):
+    assert _run(formatter, edit) == join_paragraphs([_paragraph(n) for n in range(30)])
+
+
+def test_truncated_answer_keeps_original(formatter):
+    result = _run(formatter, lambda tail, head: join_paragraphs(tail), stop_reason="max_tokens")
+    assert result == join_paragraphs([_paragraph(n) for n in range(30)])
+
+
+def test_api_error_keeps_original(formatter):
+    def fail(tail, head):
+        raise RuntimeError("überlastet")
+
+    assert _run(formatter, fail) == join_paragraphs([_paragraph(n) for n in range(30)])
+
+
+def test_reject_seam_reasons():
+    original = [_paragraph(0), _paragraph(1)]
+    assert DresingPehlFormatter._reject_seam(original, original) == ""
+    assert DresingPehlFormatter._reject_seam(original, []) == "leere Antwort"
+    assert "Länge" in DresingPehlFormatter._reject_seam(original, [_paragraph(0)[:50]])
+    stripped = [p.rsplit(" #", 1)[0] for p in original]
+    assert DresingPehlFormatter._reject_seam(original, stripped) == "mehr Formatfehler als vorher"
@@ -0,0 +1,67 @@
+import json
+
+from audio_chunker import AudioChunk
+from job_manifest import JobManifest
+
+FINGERPRINT = {"audio_file": "IP-01.mp3", "audio_size": 1234, "language": "de"}
+
+
+def _chunk(index=0, start=0.0, end=300.0):
+    return AudioChunk(path=None, start_time=start, end_time=end, index=index, is_temp=False)
+
+
+def _result(text="Hallo"):
+    return {"text": text, "segments": [{"start": 0.0, "end": 1.0, "text": text}]}
+
+
+def test_resume_restores_results(tmp_path):
+    path = tmp_path / "IP-01.job.json"
+    manifest = JobManifest.open(path, FINGERPRINT, resume=True)
+    manifest.set_whisper_result(_chunk(), _result())
+    manifest.set_section_text(0, "I: Hallo. #00:00:01#")
+    manifest.set_stage_text("finalize", "fertig")
+
+    resumed = JobManifest.open(path, dict(FINGERPRINT), resume=True)
+    assert resumed.whisper_result(_chunk()) == _result()
+    assert resumed.section_text(0) == "I: Hallo. #00:00:01#"
+    assert resumed.stage_text("finalize") == "fertig"
+
+
+def test_whisper_results_are_stored_outside_the_manifest(tmp_path):
+    path = tmp_path / "IP-01.job.json"
+    manifest = JobManifest.open(path, FINGERPRINT, resume=False)
+    manifest.set_whisper_result(_chunk(), _result("Wortlaut"))
+
+    assert "Wortlaut" not in path.read_text(encoding="utf-8")
+    entry = json.loads(path.read_text(encoding="utf-8"))["chunks"]["0"]
+    assert (manifest.chunk_dir / entry["file"]).exists()
+
+
+def test_fingerprint_mismatch_resets(tmp_path):
+    path = tmp_path / "IP-01.job.json"
+    manifest = JobManifest.open(path, FINGERPRINT, resume=False)
+    manifest.set_whisper_result(_chunk(), _result())
+    manifest.set_section_text(0, "I: Hallo.")
+
+    changed = JobManifest.open(path, {**FINGERPRINT, "language": "en"}, resume=True)
+    assert changed.whisper_result(_chunk()) is None
+    assert changed.section_text(0) is None
+    assert not list(changed.chunk_dir.glob("*.json"))
+
+
+def test_whisper_result_requires_same_chunk_bounds(tmp_path):
+    path = tmp_path / "IP-01.job.json"
+    manifest = JobManifest.open(path, FINGERPRINT, resume=False)
+    manifest.set_whisper_result(_chunk(start=0.0, end=300.0), _result())
+
+    assert manifest.whisper_result(_chunk(start=0.0, end=300.0004)) == _result()
+    assert manifest.whisper_result(_chunk(start=0.0, end=285.0)) is None
+    assert manifest.whisper_result(_chunk(start=15.0, end=300.0)) is None
+    assert manifest.whisper_result(_chunk(index=1, start=0.0, end=300.0)) is None
+
+
+def test_unreadable_manifest_starts_fresh(tmp_path):
+    path = tmp_path / "IP-01.job.json"
+    path.write_text("{kaputt", encoding="utf-8")
+    manifest = JobManifest.open(path, FINGERPRINT, resume=True)
+    assert manifest.section_text(0) is None
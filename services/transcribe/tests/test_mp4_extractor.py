@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+
+import mp4_extractor
+from mp4_extractor import MP4Extractor
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Ersetzt ffprobe/ffmpeg: ffprobe meldet state["codec"], ffmpeg legt die Ausgabe an."""
+    state = {"codec": "aac", "commands": []}
+
+    def run(cmd, **kwargs):
+        state["commands"].append(cmd)
+        if cmd[0] == "ffprobe":
+            if state["codec"] is None:
+                return SimpleNamespace(returncode=1, stdout="", stderr="kein Audio")
+            return SimpleNamespace(returncode=0, stdout=f"{state['codec']}\n", stderr="")
+        if cmd[-1] != "-version":
+            with open(cmd[-1], "wb") as f:
+                f.write(b"audio")
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr(mp4_extractor.subprocess, "run", run)
+    return state
+
+
+@pytest.mark.parametrize("codec, suffix", [("aac", ".m4a"), ("mp3", ".mp3"), ("opus", ".ogg"), ("AAC", ".m4a")])
+def test_compatible_codec_is_copied_into_matching_container(fake_ffmpeg, tmp_path, codec, suffix):
+    fake_ffmpeg["codec"] = codec
+    output = MP4Extractor().extract_audio(tmp_path / "IP-01.mp4", tmp_path)
+
+    assert output == tmp_path / f"IP-01{suffix}"
+    command = fake_ffmpeg["commands"][-1]
+    assert command[command.index("-c:a") + 1] == "copy"
+
+
+@pytest.mark.parametrize("codec", ["pcm_s16le", "vorbis", None])
+def test_other_codecs_fall_back_to_libmp3lame(fake_ffmpeg, tmp_path, codec):
+    fake_ffmpeg["codec"] = codec
+    output = MP4Extractor(bitrate="96k").extract_audio(tmp_path / "IP-01.mov", tmp_path)
+
+    assert output == tmp_path / "IP-01.mp3"
+    command = fake_ffmpeg["commands"][-1]
+    assert command[command.index("-acodec") + 1] == "libmp3lame"
+    assert command[command.index("-ab") + 1] == "96k"
+    assert "-c:a" not in command
+
+
+def test_transcode_skips_probe(fake_ffmpeg, tmp_path):
+    output = MP4Extractor(stream_copy=False).extract_audio(tmp_path / "IP-01.mp4", tmp_path)
+
+    assert output == tmp_path / "IP-01.mp3"
+    assert not any(cmd[0] == "ffprobe" for cmd in fake_ffmpeg["commands"])
+
+
+def test_probe_without_ffprobe_returns_none(monkeypatch, tmp_path):
+    def missing(cmd, **kwargs):
+        raise FileNotFoundError(cmd[0])
+
+    monkeypatch.setattr(mp4_extractor.subprocess, "run", missing)
+    assert MP4Extractor.probe_audio_codec(tmp_path / "IP-01.mp4") is None
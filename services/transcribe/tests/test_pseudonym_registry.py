@@ -0,0 +1,94 @@
+import sqlite3
+
+import pytest
+
+from pseudonym_registry import derive_key, letter_code, letter_number
+
+fernet = pytest.importorskip("cryptography.fernet")
+
+from pseudonym_registry import PseudonymRegistry  # noqa: E402
+
+
+@pytest.fixture
+def key():
+    return fernet.Fernet.generate_key().decode()
+
+
+def _m(original, pseudonym, kind):
+    return {"original": original, "pseudonym": pseudonym, "type": kind}
+
+
+def test_letter_codes_round_trip():
+    assert [letter_code(n) for n in (1, 26, 27, 52, 703)] == ["A", "Z", "AA", "AZ", "AAA"]
+    assert all(letter_number(letter_code(n)) == n for n in range(1, 800))
+
+
+def test_subkeys_differ_per_purpose():
+    master = b"x" * 32
+    assert derive_key(master, b"encrypt") != derive_key(master, b"lookup")
+    assert len(derive_key(master, b"encrypt")) == 32
+
+
+def test_register_continues_numbering_and_reuses_known_codes(tmp_path, key):
+    registry = PseudonymRegistry(tmp_path / "register.sqlite", key)
+    first = registry.register([
+        _m("Florian Brugger", "KP-01", "person_other"),
+        _m("Florian", "KP-01", "person_other"),
+        _m("Alpenbank", "Org-A", "organization"),
+        _m("Graz", "Ort-A", "location"),
+    ], "IP-01")
+    assert [m["pseudonym"] for m in first] == ["KP-01", "KP-01", "Org-A", "Ort-A"]
+
+    # Zweites Interview: Codes beginnen wieder bei 1, bekannte Namen behalten ihren Code
+    second = registry.register([
+        _m("Anna Huber", "KP-01", "person_other"),
+        _m("florian", "KP-02", "person_other"),
+        _m("Nordbank", "Org-A", "organization"),
+        _m("Linz", "Ort-A", "location"),
+        _m("Max", "IP-02", "person_interviewee"),
+    ], "IP-02")
+    assert [(m["original"], m["pseudonym"]) for m in second] == [
+        ("Anna Huber", "KP-02"),
+        ("florian", "KP-01"),
+        ("Nordbank", "Org-B"),
+        ("Linz", "Ort-B"),
+        ("Max", "IP-02"),
+    ]
+    assert {m["original"] for m in registry.mappings()} >= {"Graz", "Linz", "Florian Brugger"}
+
+
+def test_register_warns_when_group_members_have_different_codes(tmp_path, key, capsys):
+    registry = PseudonymRegistry(tmp_path / "register.sqlite", key)
+    registry.register([_m("Florian", "KP-01", "person_other")], "IP-01")
+    registry.register([_m("Anna", "KP-01", "person_other"), _m("Brugger", "KP-02", "person_other")], "IP-02")
+    capsys.readouterr()
+
+    # "Florian" (KP-01) und "Brugger" (KP-03) sind nun als dieselbe Person erkannt
+    result = registry.register([
+        _m("Florian", "KP-01", "person_other"),
+        _m("Brugger", "KP-01", "person_other"),
+    ], "IP-03")
+
+    assert [m["pseudonym"] for m in result] == ["KP-01", "KP-01"]
+    output = capsys.readouterr().out
+    assert "KP-01, KP-03" in output and "IP-03" in output
+    assert "Florian" not in output and "Brugger" not in output
+
+
+def test_names_are_stored_encrypted_with_separate_lookup_key(tmp_path, key):
+    path = tmp_path / "register.sqlite"
+    PseudonymRegistry(path, key).register([_m("Florian Brugger", "KP-01", "person_other")], "IP-01")
+
+    with sqlite3.connect(path) as db:
+        lookup, original = db.execute("SELECT lookup, original FROM names").fetchone()
+    assert b"Florian" not in original
+    with pytest.raises(fernet.InvalidToken):
+        fernet.Fernet(key.encode()).decrypt(original)   # nicht mit dem Hauptschlüssel selbst
+
+    reopened = PseudonymRegistry(path, key)
+    assert reopened.mappings() == [_m("Florian Brugger", "KP-01", "person_other")]
+
+
+def test_invalid_key_is_rejected(tmp_path):
+    with pytest.raises(RuntimeError, match="PSEUDONYM_REGISTRY_KEY"):
+        PseudonymRegistry(tmp_path / "register.sqlite", "kein-schlüssel")
@@ -0,0 +1,119 @@
+from pseudonymizer import Pseudonymizer
+
+merge = Pseudonymizer._merge_mappings
+
+TRANSCRIPT = (
+    "B: Ich bin Max, seit 2019 in Graz bei der Alpenbank. Florian Brugger leitet das Team.\n\n"
+    "I: Und Ihre Kollegin?\n\n"
+    "B: Anna Huber kam aus Linz, vorher war sie bei der Nordbank. Florian hat sie geholt."
+)
+
+
+def _m(original, pseudonym, kind):
+    return {"original": original, "pseudonym": pseudonym, "type": kind}
+
+
+def test_codes_are_renumbered_by_first_occurrence_across_windows():
+    found = [
+        [_m("Anna Huber", "KP-01", "person_other"), _m("Nordbank", "Org-A", "organization")],
+        [_m("Florian Brugger", "KP-01", "person_other"), _m("Alpenbank", "Org-A", "organization")],
+    ]
+    merged = {m["original"]: m["pseudonym"] for m in merge(found, TRANSCRIPT, "IP-01")}
+    assert merged == {
+        "Alpenbank": "Org-A",
+        "Florian Brugger": "KP-01",
+        "Anna Huber": "KP-02",
+        "Nordbank": "Org-B",
+    }
+
+
+def test_same_location_code_from_different_windows_stays_distinct():
+    found = [
+        [_m("Graz", "Ort-A", "location")],
+        [_m("Linz", "Ort-A", "location")],
+    ]
+    merged = merge(found, TRANSCRIPT, "IP-01")
+    assert [(m["original"], m["pseudonym"]) for m in merged] == [("Graz", "Ort-A"), ("Linz", "Ort-B")]
+
+
+def test_other_types_keep_proposed_prefix_but_are_renumbered():
+    found = [[_m("2019", "Jahr-C", "date")], [_m("Linz", "Jahr-C", "date")]]
+    merged = merge(found, TRANSCRIPT, "IP-01")
+    assert [m["pseudonym"] for m in merged] == ["Jahr-A", "Jahr-B"]
+
+
+def test_groups_join_on_original_and_on_pseudonym_within_a_window():
+    found = [
+        [_m("Florian Brugger", "KP-03", "person_other"), _m("Florian", "KP-03", "person_other")],
+        [_m("florian", "KP-01", "person_other"), _m("Max", "IP-01", "person_interviewee")],
+    ]
+    merged = merge(found, TRANSCRIPT, "IP-01")
+    assert [(m["original"], m["pseudonym"]) for m in merged] == [
+        ("Max", "IP-01"),
+        ("Florian Brugger", "KP-01"),
+        ("Florian", "KP-01"),
+    ]
+
+
+def test_existing_codes_and_interview_id_are_not_mapped():
+    found = [[_m("KP-01", "KP-01", "person_other"), _m("IP-01", "IP-01", "person_interviewee")]]
+    assert merge(found, TRANSCRIPT, "IP-01") == []
+
+
+def test_windows_split_at_paragraph_boundaries():
+    paragraphs = [f"B: Absatz {i} " + "x" * 40 for i in range(5)]
+    windows = Pseudonymizer._windows("\n\n".join(paragraphs), limit=120)
+    assert windows == ["\n\n".join(paragraphs[i:i + 2]) for i in (0, 2)] + [paragraphs[4]]
+
+
+# ── Ersetzung ────────────────────────────────────────────────────────────────
+
+apply = Pseudonymizer._apply_mappings
+
+
+def test_apply_prefers_longest_original_and_ignores_case():
+    mappings = [
+        _m("Max", "IP-01", "person_interviewee"),
+        _m("Max Müller", "IP-01", "person_interviewee"),
+        _m("Alpenbank", "Org-A", "organization"),
+    ]
+    text = "B: Ich bin Max Müller, MAX für alle, bei der alpenbank."
+    assert apply(text, mappings) == "B: Ich bin IP-01, IP-01 für alle, bei der Org-A."
+
+
+def test_apply_replaces_whole_words_only():
+    mappings = [_m("Anna", "KP-01", "person_other")]
+    assert apply("Anna, Annabell und Susanna.", mappings) == "KP-01, Annabell und Susanna."
+
+
+def test_apply_does_not_rescan_inserted_pseudonyms():
+    # Ein Pseudonym, das selbst wie ein Original aussieht, wird nicht erneut ersetzt
+    mappings = [_m("Org", "KP-01", "person_other"), _m("Nordbank", "Org-A", "organization")]
+    assert apply("Nordbank und Org.", mappings) == "Org-A und KP-01."
+
+
+def test_apply_handles_special_characters_and_casefold_mismatch():
+    mappings = [_m("Müller (Filiale)", "Org-A", "organization"), _m("Straße", "Ort-A", "location")]
+    assert apply("Bei Müller (Filiale) in der STRASSE und Straße.", mappings) == (
+        "Bei Org-A in der STRASSE und Ort-A."
+    )
+
+
+def test_apply_handles_dotted_capital_i_and_sharp_s():
+    # "İ".casefold() ist "i̇" (zwei Zeichen) und passt nicht zum Treffer "istanbul"
+    mappings = [_m("İstanbul", "Ort-A", "location"), _m("Strauß", "KP-01", "person_other")]
+    assert apply("In istanbul, ISTANBUL und İSTANBUL.", mappings) == "In Ort-A, Ort-A und Ort-A."
+    assert apply("Herr strauß und Herr STRAUß.", mappings) == "Herr KP-01 und Herr KP-01."
+
+
+def test_apply_leaves_match_without_original_unchanged(monkeypatch):
+    # Findet die Einzelprüfung kein Original, bleibt der Treffer stehen statt abzubrechen
+    monkeypatch.setattr("pseudonymizer.re.fullmatch", lambda *args, **kwargs: None)
+    mappings = [_m("İstanbul", "Ort-A", "location")]
+    assert apply("In istanbul.", mappings) == "In istanbul."
+
+
+def test_present_lists_only_mappings_found_in_text():
+    mappings = [_m("Graz", "Ort-A", "location"), _m("Linz", "Ort-B", "location")]
+    assert Pseudonymizer._present("B: In graz.", mappings) == [mappings[0]]
+    assert apply("Kein Name.", []) == "Kein Name."
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import rate_limiter
+from rate_limiter import RateLimiter
+
+
+def test_concurrency_is_shared_between_threads_and_coroutines():
+    limiter = RateLimiter("test", max_concurrent=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def enter():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+
+    def leave():
+        nonlocal active
+        with lock:
+            active -= 1
+
+    def sync_call():
+        with limiter:
+            enter()
+            time.sleep(0.02)
+            leave()
+
+    async def async_call():
+        async with limiter:
+            enter()
+            await asyncio.sleep(0.02)
+            leave()
+
+    async def main():
+        await asyncio.gather(*(async_call() for _ in range(6)))
+
+    threads = [threading.Thread(target=sync_call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    asyncio.run(main())
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert limiter._active == 0
+
+
+def test_waiting_coroutines_do_not_occupy_executor_threads():
+    limiter = RateLimiter("test", max_concurrent=1)
+
+    async def main():
+        async with limiter:
+            waiters = [asyncio.create_task(limiter.__aenter__()) for _ in range(20)]
+            await asyncio.sleep(0.01)
+            # Der Standard-Executor bleibt frei, obwohl 20 Coroutinen warten
+            assert await asyncio.wait_for(asyncio.to_thread(lambda: "frei"), 1) == "frei"
+            for task in waiters:
+                task.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+
+    asyncio.run(main())
+    assert limiter._active == 0
+    assert limiter._async_waiters == []
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    limiter = RateLimiter("test", max_concurrent=1)
+
+    async def main():
+        async with limiter:
+            waiter = asyncio.create_task(limiter.__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+        async with limiter:
+            pass
+
+    asyncio.run(asyncio.wait_for(main(), 1))
+    assert limiter._active == 0
+
+
+def test_budget_delay_uses_sliding_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter("test", requests_per_minute=2)
+
+    assert limiter._budget_delay() == 0.0
+    now[0] += 10
+    assert limiter._budget_delay() == 0.0
+    now[0] += 5
+    assert limiter._budget_delay() == 45.0   # erster Start liegt 15 s zurück
+    now[0] += 45
+    assert limiter._budget_delay() == 0.0
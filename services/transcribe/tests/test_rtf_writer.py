@@ -0,0 +1,58 @@
+from rtf_writer import RTFWriter
+
+SAMPLE = (
+    "I: Wie erleben Sie das? #00:00:05#\n\n"
+    "B: Äußerst {gut} — mit C:\\Pfad und „Zitat“ … 🙂 #00:00:12#\n"
+    "   eingerückt\t mit Tab\n\n"
+    "I: Danke. #00:00:20#"
+)
+
+
+def _reference_unicode(text: str) -> str:
+    """Escaping der ursprünglichen Implementierung (Zeichen für Zeichen)."""
+    result = []
+    for char in text:
+        code = ord(char)
+        if code < 128:
+            result.append({"\\": "\\\\", "{": "\\{", "}": "\\}", "\n": "\\line\n"}.get(char, char))
+        else:
+            signed = code if code <= 32767 else code - 65536
+            result.append(f"\\u{signed}?")
+    return "".join(result)
+
+
+def _reference_rtf(transcript: str, interview_name: str, date_str: str) -> str:
+    lines = [
+        r"{\rtf1\ansi\ansicpg1252\uc1\deff0",
+        r"{\fonttbl{\f0\fswiss\fcharset0 Arial;}{\f1\froman\fcharset0 Times New Roman;}}",
+        r"{\colortbl;\red0\green0\blue0;}",
+        r"\f0\fs24\sl360\slmult1",
+        "",
+        f"\\b\\fs28 {_reference_unicode(interview_name)}\\b0\\fs24\\line",
+        f"Datum: {date_str}\\line",
+        "\\line",
+    ]
+    for line in transcript.split("\n"):
+        stripped = line.strip()
+        lines.append(f"{_reference_unicode(stripped)}\\line" if stripped else "\\line")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def test_escaping_matches_reference_for_all_bmp_and_astral_samples():
+    text = "".join(chr(c) for c in range(32, 0x3000)) + "\\{}\n🙂𝄞"
+    assert RTFWriter._rtf_unicode(text) == _reference_unicode(text)
+
+
+def test_plain_ascii_line_is_returned_unchanged():
+    line = "B: ganz normaler Text #00:01:02#"
+    assert RTFWriter._rtf_unicode(line) is line
+
+
+def test_document_is_byte_identical_to_reference(tmp_path):
+    path = tmp_path / "out" / "Interview_IP01.rtf"
+    RTFWriter().write(SAMPLE, path, interview_name="Interview_Ä{1}", date_str="01.02.2026")
+
+    expected = _reference_rtf(SAMPLE, "Interview_Ä{1}", "01.02.2026")
+    assert path.read_bytes() == expected.encode("ascii")
+    assert RTFWriter()._build_rtf(SAMPLE, "Interview_Ä{1}", "01.02.2026") == expected
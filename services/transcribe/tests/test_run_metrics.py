@@ -0,0 +1,77 @@
+import json
+import re
+from types import SimpleNamespace
+
+from run_metrics import RunMetrics
+
+# Zeile des Prometheus-Textformats: Name, optionale Labels, Wert
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (\S+)$')
+
+
+def _metrics():
+    metrics = RunMetrics()
+    with metrics.span("stage.merge"):
+        pass
+    with metrics.span("stage.merge"):
+        pass
+    metrics.add("whisper.upload_bytes", 2048)
+    metrics.record_usage("format", SimpleNamespace(usage=SimpleNamespace(
+        input_tokens=100, output_tokens=20, cache_read_input_tokens=0,
+    )))
+    return metrics
+
+
+def test_counters_and_usage():
+    report = _metrics().report(interview="I01")
+    assert report["interview"] == "I01"
+    assert report["spans"]["stage.merge"]["count"] == 2
+    assert report["counters"] == {
+        "format.input_tokens": 100,
+        "format.output_tokens": 20,
+        "whisper.upload_bytes": 2048,
+    }
+
+
+def test_write_json(tmp_path):
+    path = tmp_path / "I01.metrics.json"
+    _metrics().write_json(path, interview="I01")
+    assert json.loads(path.read_text(encoding="utf-8"))["counters"]["whisper.upload_bytes"] == 2048
+
+
+def test_write_prometheus_text_format(tmp_path):
+    path = tmp_path / "I01.metrics.prom"
+    _metrics().write_prometheus(path, interview_id="I01", engine='whisper "1"')
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert "# EOF" not in lines
+    assert not (tmp_path / "I01.metrics.prom.tmp").exists()
+
+    types = {}
+    samples = {}
+    for line in lines:
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+            continue
+        match = _SAMPLE.match(line)
+        assert match, line
+        samples[match.group(1)] = (match.group(2), float(match.group(3)))
+
+    # TYPE-Zeilen nennen exakt die Sample-Namen (Zähler mit _total, wie Prometheus 0.0.4)
+    assert set(types) == set(samples)
+    assert types["transcribe_run_seconds"] == "gauge"
+    assert types["transcribe_stage_merge_calls_total"] == "counter"
+    assert samples["transcribe_stage_merge_calls_total"][1] == 2
+    assert samples["transcribe_whisper_upload_bytes_total"][1] == 2048
+    assert samples["transcribe_format_input_tokens_total"][0] == '{engine="whisper \\"1\\"",interview_id="I01"}'
+
+
+def test_write_openmetrics_is_deprecated_alias(tmp_path):
+    metrics = _metrics()
+    metrics.write_openmetrics(tmp_path / "alt.prom", interview_id="I01")
+    metrics.write_prometheus(tmp_path / "neu.prom", interview_id="I01")
+
+    def without_run_seconds(path):
+        return [line for line in path.read_text(encoding="utf-8").splitlines() if "run_seconds" not in line]
+
+    assert without_run_seconds(tmp_path / "alt.prom") == without_run_seconds(tmp_path / "neu.prom")
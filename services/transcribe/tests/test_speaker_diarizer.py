@@ -0,0 +1,59 @@
+from speaker_diarizer import SpeakerSegment, SpeakerTimeline
+
+
+def _timeline():
+    return SpeakerTimeline([
+        SpeakerSegment("SPEAKER_01", 10.0, 30.0),
+        SpeakerSegment("SPEAKER_00", 0.0, 6.0),
+        SpeakerSegment("SPEAKER_00", 5.0, 9.0),     # wird mit dem vorherigen zusammengefasst
+        SpeakerSegment("SPEAKER_00", 12.0, 40.0),   # überschneidet SPEAKER_01 (gleichzeitig)
+        SpeakerSegment("SPEAKER_01", 41.0, 50.0),
+    ])
+
+
+def test_consecutive_turns_of_same_speaker_are_merged():
+    assert _timeline().segments == [
+        SpeakerSegment("SPEAKER_00", 0.0, 9.0),
+        SpeakerSegment("SPEAKER_01", 10.0, 30.0),
+        SpeakerSegment("SPEAKER_00", 12.0, 40.0),
+        SpeakerSegment("SPEAKER_01", 41.0, 50.0),
+    ]
+
+
+def test_overlapping_returns_intersecting_segments_in_start_order():
+    timeline = _timeline()
+    assert [s.start for s in timeline.overlapping(8.0, 11.0)] == [0.0, 10.0]
+    assert [s.start for s in timeline.overlapping(31.0, 35.0)] == [12.0]
+    assert [s.start for s in timeline.overlapping(35.0, 60.0)] == [12.0, 41.0]
+
+
+def test_overlapping_excludes_touching_and_outside_intervals():
+    timeline = _timeline()
+    assert timeline.overlapping(9.0, 10.0) == []
+    assert timeline.overlapping(60.0, 70.0) == []
+    assert SpeakerTimeline([]).overlapping(0.0, 10.0) == []
+
+
+def test_label_assigns_speaker_with_largest_overlap():
+    timeline = SpeakerTimeline([
+        SpeakerSegment("SPEAKER_00", 0.0, 10.0),
+        SpeakerSegment("SPEAKER_01", 10.0, 20.0),
+    ])
+    segments = [
+        {"start": 2.0, "end": 8.0, "text": "Frage"},
+        {"start": 9.0, "end": 15.0, "text": "Antwort"},   # 1 s SPEAKER_00, 5 s SPEAKER_01
+        {"start": 25.0, "end": 30.0, "text": "Nachklang"},
+    ]
+    labelled = timeline.label(segments)
+    assert [seg["speaker"] for seg in labelled] == ["SPEAKER_00", "SPEAKER_01", None]
+    assert "speaker" not in segments[0]   # Eingabe bleibt unverändert
+
+
+def test_speaker_for_sums_overlap_per_speaker():
+    timeline = SpeakerTimeline([
+        SpeakerSegment("SPEAKER_00", 0.0, 3.0),
+        SpeakerSegment("SPEAKER_01", 3.0, 7.0),
+        SpeakerSegment("SPEAKER_00", 7.0, 10.0),
+    ])
+    # SPEAKER_00: 3 + 3 s, SPEAKER_01: 4 s
+    assert timeline.speaker_for(0.0, 10.0) == "SPEAKER_00"
@@ -0,0 +1,99 @@
+from transcript_checks import Issue, TranscriptPostFormatter, speaker_of, split_paragraphs, validate
+
+
+def test_speaker_of_accepts_pipeline_labels():
+    assert speaker_of("I: Frage? #00:00:05#") == "I"
+    assert speaker_of("B: Antwort. #00:00:09#") == "B"
+    assert speaker_of("B2: Antwort. #00:00:09#") == "B2"
+    assert speaker_of("KP-03: Antwort. #00:00:09#") == "KP-03"
+    assert speaker_of("(Interviewer): Frage? #00:00:09#") == "(Interviewer)"
+
+
+def test_speaker_of_ignores_ordinary_colon_lines():
+    for line in ("Erstens: das Team.", "Fazit: es hilft.", "Beispiel: ein Bericht."):
+        assert speaker_of(line) is None
+
+
+def test_split_paragraphs_drops_empty_paragraphs():
+    assert split_paragraphs("\n\nI: a #00:00:01#\n \n\nB: b #00:00:02#\n") == [
+        "I: a #00:00:01#",
+        "B: b #00:00:02#",
+    ]
+
+
+def test_validate_accepts_well_formed_transcript():
+    text = "I: Wie erleben Sie das? #00:00:05#\n\nB: Gut.\nFazit: es hilft. #00:00:12#"
+    assert validate(text) == []
+
+
+def test_validate_reports_mechanical_issues():
+    text = (
+        "Wie erleben Sie das? #00:00:05#\n\n"
+        "B: Gut.\nI: Und weiter? #00:00:12#\n\n"
+        "B: Ja. #00:00:08#\n\n"
+        "I: Danke."
+    )
+    assert validate(text) == [
+        Issue(0, "keine Sprecherkennzeichnung"),
+        Issue(1, "Sprecherwechsel ohne Leerzeile"),
+        Issue(2, "Zeitmarke läuft rückwärts"),
+        Issue(3, "keine Zeitmarke am Absatzende"),
+    ]
+
+
+def test_validate_reports_timestamp_inside_paragraph():
+    text = "B: Erster Teil. #00:01:00# zweiter Teil. #00:01:30#"
+    assert validate(text) == [Issue(0, "Zeitmarke mitten im Absatz")]
+
+
+# ── TranscriptPostFormatter ──────────────────────────────────────────────────
+
+def test_normalize_splits_speaker_change_and_pads_timestamps():
+    post = TranscriptPostFormatter()
+    result = post.normalize(["I: Frage?  #0:1:5#\nB: Antwort.\nFazit: gut. #00:01:20#"])
+    assert result == ["I: Frage? #00:01:05#", "B: Antwort.\nFazit: gut. #00:01:20#"]
+    assert post.separated_paragraphs == 1
+
+
+def test_dedup_seam_removes_repeated_leading_sentences():
+    post = TranscriptPostFormatter()
+    previous = ["B: Wir haben im Team lange über die neuen Werkzeuge gesprochen. #00:04:58#"]
+    following = [
+        "B: Wir haben im Team lange über die neuen Werkzeuge gesprochen. "
+        "Danach kam die Schulung. #00:05:20#"
+    ]
+    assert post.dedup_seam(previous, following) == ["B: Danach kam die Schulung. #00:05:20#"]
+    assert post.removed_sentences == 1
+
+
+def test_dedup_seam_keeps_short_sentences():
+    post = TranscriptPostFormatter()
+    following = ["I: Ja, genau. Und dann? #00:05:03#"]
+    assert post.dedup_seam(["I: Ja, genau. #00:05:00#"], following) == following
+
+
+def test_merge_across_seam_keeps_only_final_timestamp():
+    post = TranscriptPostFormatter()
+    blocks = [
+        "I: Wie war das? #00:04:40#\n\nB: Am Anfang war ich skeptisch, #00:04:59#",
+        "B: dann hat es sich eingespielt. #00:05:20#\n\nI: Danke. #00:05:25#",
+    ]
+    result = post.apply(blocks)
+    assert result == [
+        "I: Wie war das? #00:04:40#\n\n"
+        "B: Am Anfang war ich skeptisch, dann hat es sich eingespielt. #00:05:20#",
+        "I: Danke. #00:05:25#",
+    ]
+    assert post.merged_paragraphs == 1
+    assert validate(split_paragraphs("\n\n".join(result))) == []
+
+
+def test_missing_timestamps_come_from_whisper_segments():
+    segments = [
+        {"start": 0.0, "end": 4.0, "text": "Wie war das?"},
+        {"start": 4.0, "end": 11.0, "text": "Am Anfang war ich skeptisch."},
+    ]
+    post = TranscriptPostFormatter(segments)
+    result = post.apply(["I: Wie war das?\n\nB: Am Anfang war ich skeptisch."])
+    assert result == ["I: Wie war das? #00:00:04#\n\nB: Am Anfang war ich skeptisch. #00:00:11#"]
+    assert post.inserted_timestamps == 2
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from transcript_model import Transcript, export, speaker_role
+
+TEXT = (
+    "I: Wie erleben Sie das? #00:00:05#\n\n"
+    "B: Gut.\nFazit: es hilft. #00:00:12#\n\n"
+    "KP-01: Kurzer Einwurf. #00:00:14#\n\n"
+    "Ohne Kennzeichnung"
+)
+
+
+def _transcript():
+    return Transcript.from_text(TEXT, interview_id="IP-01", title="Interview_IP01", date="01.02.2026")
+
+
+def test_from_text_splits_speaker_role_text_and_timestamp():
+    paragraphs = _transcript().paragraphs
+    assert [(p.speaker, p.role, p.timestamp) for p in paragraphs] == [
+        ("I", "interviewer", "00:00:05"),
+        ("B", "interviewee", "00:00:12"),
+        ("KP-01", "other", "00:00:14"),
+        ("", "", ""),
+    ]
+    assert paragraphs[1].text == "Gut.\nFazit: es hilft."
+
+
+def test_to_text_round_trips():
+    assert _transcript().to_text() == TEXT
+
+
+@pytest.mark.parametrize("speaker, role", [
+    ("I", "interviewer"), ("(Interviewer)", "interviewer"), ("B", "interviewee"),
+    ("B2", "interviewee"), ("KP-03", "other"), ("", ""),
+])
+def test_speaker_role(speaker, role):
+    assert speaker_role(speaker) == role
+
+
+def test_export_writes_each_format(tmp_path):
+    written = export(_transcript(), tmp_path / "Interview_IP01.rtf", ["rtf", "txt", "json", "jsonl"])
+    assert [p.suffix for p in written] == [".rtf", ".txt", ".json", ".jsonl"]
+
+    data = json.loads((tmp_path / "Interview_IP01.json").read_text(encoding="utf-8"))
+    assert data["paragraphs"][1] == {
+        "speaker": "B", "role": "interviewee", "text": "Gut.\nFazit: es hilft.", "timestamp": "00:00:12",
+    }
+    lines = (tmp_path / "Interview_IP01.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["index"] == 1 and len(lines) == 4
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+
+from whisper_cache import WhisperCache
+
+
+def _result(text):
+    return {"text": text, "segments": [{"start": 0.0, "end": 1.0, "text": text}]}
+
+
+def test_get_miss_and_hit(tmp_path):
+    cache = WhisperCache(tmp_path)
+    assert cache.get("abc") is None
+    cache.put("abc", _result("Hallo"))
+    assert cache.get("abc") == _result("Hallo")
+
+
+def test_key_depends_on_bytes_language_and_model(tmp_path):
+    audio = tmp_path / "chunk.ogg"
+    audio.write_bytes(b"\x00\x01" * 100)
+    key = WhisperCache.key(audio, "de", "whisper-1")
+    assert key == WhisperCache.key(audio, "de", "whisper-1")
+    assert key != WhisperCache.key(audio, "en", "whisper-1")
+    assert key != WhisperCache.key(audio, "de", "large-v3")
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = WhisperCache(tmp_path / "cache")
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, _result("x" * 100))
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    # "a" wurde zuletzt gelesen und ist damit der jüngste Eintrag
+    cache.get("a")
+
+    entry_size = cache._path("a").stat().st_size
+    cache.max_bytes = 2 * entry_size
+    cache._evict()
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_evict_ignores_inflight_and_removes_stale_temp_files(tmp_path):
+    cache = WhisperCache(tmp_path, max_mb=0)
+    inflight = tmp_path / ".tmp_inflight.tmp"
+    inflight.write_text("{}")
+    stale = tmp_path / ".tmp_crashed.tmp"
+    stale.write_text("{}")
+    old = time.time() - 7200
+    os.utime(stale, (old, old))
+
+    cache._evict()
+
+    assert inflight.exists()
+    assert not stale.exists()
+
+
+def test_concurrent_put_and_evict(tmp_path):
+    # Winziges Limit: jedes put() löst eine Räumung aus, die parallele Schreiber trifft
+    cache = WhisperCache(tmp_path)
+    cache.max_bytes = 2000
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(30):
+                cache.put(f"{n}-{i}", _result("y" * 200))
+        except Exception as exc:  # pragma: no cover - nur bei Regression
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not list(tmp_path.glob("*.tmp"))
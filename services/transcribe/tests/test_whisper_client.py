@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from run_metrics import RunMetrics
+from whisper_cache import WhisperCache
+from whisper_client import WhisperEngine
+from word_timeline import WordTimeline
+
+
+class FakeEngine(WhisperEngine):
+    MODEL = "fake"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = 0
+
+    def _request(self, audio_path, language):
+        self.requests += 1
+        return {
+            "text": "Hallo Welt",
+            "segments": [{"start": 1.0, "end": 2.5, "text": "Hallo Welt"}],
+            "language": language,
+            "words": WordTimeline.from_words([("Hallo", 1.0, 1.5), ("Welt", 1.6, 2.5)]),
+        }
+
+
+def test_backend_without_request_fails_on_construction():
+    class Incomplete(WhisperEngine):
+        MODEL = "unvollständig"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_transcribe_shifts_segments_and_words(tmp_path):
+    audio = tmp_path / "chunk.mp3"
+    audio.write_bytes(b"audio")
+    result = FakeEngine().transcribe(audio, time_offset=60.0)
+    assert result["segments"][0]["start"] == 61.0
+    assert result["words"].starts.tolist() == [61.0, 61.6]
+
+
+def test_cache_hit_skips_request_and_is_counted(tmp_path):
+    audio = tmp_path / "chunk.mp3"
+    audio.write_bytes(b"audio")
+    metrics = RunMetrics()
+    engine = FakeEngine(cache=WhisperCache(tmp_path / "cache"), metrics=metrics)
+
+    first = engine.transcribe(audio, time_offset=10.0)
+    second = asyncio.run(engine.atranscribe(audio, time_offset=10.0))
+
+    assert engine.requests == 1
+    assert second["segments"] == first["segments"]
+    assert second["words"].to_dict() == first["words"].to_dict()
+    assert metrics.counters["whisper.cache_hits"] == 1
+    assert metrics.spans["whisper.request"]["count"] == 1
+
+
+def test_with_metrics_copies_engine_with_own_metrics():
+    engine = FakeEngine()
+    metrics = RunMetrics()
+    clone = engine.with_metrics(metrics)
+    assert clone.metrics is metrics and engine.metrics is not metrics
@@ -0,0 +1,51 @@
+import json
+
+from word_timeline import PAUSE_MARKER, WordTimeline, decode_result, encode_result, mark_pauses
+
+
+def _timeline():
+    return WordTimeline.from_words([
+        (" Ich", 0.0, 0.3),
+        (" weiß", 0.4, 0.8),
+        (" nicht", 0.9, 1.2),
+        (" genau", 5.0, 5.4),   # Pause von 3,8 s davor
+        (" warum", 5.5, 6.0),
+    ])
+
+
+def test_words_are_stored_columnar():
+    timeline = _timeline()
+    assert len(timeline) == 5
+    assert [timeline.word(i) for i in range(len(timeline))] == ["Ich", "weiß", "nicht", "genau", "warum"]
+    assert timeline.text == "Ichweißnichtgenauwarum"
+
+
+def test_index_range_and_pauses():
+    timeline = _timeline()
+    assert timeline.index_range(0.4, 5.0) == range(1, 3)
+    assert timeline.pauses() == [3]
+    assert timeline.pauses(min_gap=0.05) == [1, 2, 3, 4]
+
+
+def test_shifted_moves_times_and_keeps_text():
+    shifted = _timeline().shifted(100.0)
+    assert shifted.starts[0] == 100.0 and shifted.ends[-1] == 106.0
+    assert shifted.word(3) == "genau"
+
+
+def test_encode_decode_round_trip_through_json():
+    result = {"segments": [], "words": _timeline()}
+    decoded = decode_result(json.loads(json.dumps(encode_result(result))))
+    assert isinstance(decoded["words"], WordTimeline)
+    assert decoded["words"].to_dict() == result["words"].to_dict()
+
+
+def test_mark_pauses_inserts_marker_at_word_position():
+    segments = [
+        {"start": 0.0, "end": 6.0, "text": "Ich weiß nicht genau warum"},
+        {"start": 6.0, "end": 8.0, "text": "Danach"},
+    ]
+    marked = mark_pauses(segments, _timeline())
+    assert marked[0]["text"] == f"Ich weiß nicht {PAUSE_MARKER} genau warum"
+    assert marked[1] is segments[1]
+    assert segments[0]["text"] == "Ich weiß nicht genau warum"
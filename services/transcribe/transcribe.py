@@ -6,18 +6,40 @@ Transkribiert Audiodateien nach dem einfachen Transkriptionssystem von Dresing &
 Verwendung (vom Repo-Root):
     python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3
     python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --interview-id IP-01
-    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --no-finalize
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --finalize
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --whisper-workers 6 --format-workers 2
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --stream-chunks
+    python3 services/transcribe/transcribe.py interviews/video/interview_01.mp4 --pipe
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --async --whisper-workers 8
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --audio-codec flac
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --resume
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --engine local
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --pseudonym-registry
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --formats rtf,json
+    python3 services/transcribe/transcribe.py interviews/audio/interview_01.mp3 --prometheus
+
+Zu jedem Transkript entsteht ein Laufbericht <name>.metrics.json (Dauer je Stufe und
+API-Aufruf, Anthropic-Tokens, Whisper-Upload-Bytes); mit --prometheus zusätzlich
+<name>.metrics.prom im Prometheus-Textformat.
 
 Umgebungsvariablen (in services/.env):
-    OPENAI_API_KEY     — OpenAI API-Schlüssel (Whisper)
+    OPENAI_API_KEY     — OpenAI API-Schlüssel (Whisper; nicht nötig mit --engine local)
     ANTHROPIC_API_KEY  — Anthropic API-Schlüssel (Claude)
     ANTHROPIC_MODEL    — Claude-Modell (optional, Standard: claude-opus-4-8)
+    PSEUDONYM_REGISTRY_KEY — Fernet-Schlüssel des Pseudonym-Registers (nur mit --pseudonym-registry)
 """
 
 import argparse
+import math
 import os
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from datetime import datetime
+from typing import List, Optional
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(Path(__file__).parent))
 
 
 def _load_env() -> None:
@@ -60,19 +82,19 @@ def _require_env(key: str, hint: str = "") -> str:
     return value
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Transkription nach Dresing & Pehl (2017) via Whisper + Claude."
-    )
-    parser.add_argument(
-        "audio_file",
-        help="Pfad zur Audiodatei (MP3, WAV, M4A, FLAC, ...)",
-    )
-    parser.add_argument(
-        "--interview-id",
-        default="B",
-        help="Kürzel der befragten Person (z.B. IP-01). Standard: B",
-    )
+def _export_formats(value: str) -> List[str]:
+    from transcript_model import EXPORTERS
+    formats = [name.strip().lower() for name in value.split(",") if name.strip()]
+    unknown = [name for name in formats if name not in EXPORTERS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"unbekanntes Format: {', '.join(unknown) or value!r} (möglich: {', '.join(EXPORTERS)})"
+        )
+    return list(dict.fromkeys(formats))
+
+
+def add_pipeline_arguments(parser: argparse.ArgumentParser) -> None:
+    """Optionen der Transkriptions-Pipeline (gemeinsam für Einzel- und Batch-Aufruf)."""
     parser.add_argument(
         "--output-dir",
         default=None,
@@ -83,216 +105,575 @@ def main() -> None:
         default="de",
         help="Sprache für Whisper (ISO 639-1). Standard: de",
     )
+    parser.add_argument(
+        "--finalize",
+        action="store_true",
+        help=(
+            "Zusätzlichen Konsistenz-Pass (Claude) an den Abschnittsgrenzen ausführen. "
+            "Standard: nur lokale Nachformatierung (Zeitmarken, Absätze, Doppelungen)."
+        ),
+    )
     parser.add_argument(
         "--no-finalize",
         action="store_true",
-        help="Abschließenden Konsistenz-Pass (Claude) überspringen.",
+        help="Veraltet — ohne --finalize ist der Claude-Konsistenz-Pass ohnehin aus.",
     )
     parser.add_argument(
         "--chunk-minutes",
         type=int,
+        default=None,
+        help=(
+            "Max. Länge eines Whisper-Chunks in Minuten. Standard: automatisch die größte "
+            "Länge, die bei der Datenrate des Audioformats unter das 24-MB-Limit passt. "
+            "Kleinere Werte erhöhen die Parallelität der Whisper-Uploads."
+        ),
+    )
+    parser.add_argument(
+        "--format-minutes",
+        type=int,
         default=5,
-        help="Chunk-Länge in Minuten. Standard: 5",
+        help="Länge eines Claude-Formatierungsabschnitts in Minuten. Standard: 5",
+    )
+    parser.add_argument(
+        "--no-preprocess",
+        action="store_true",
+        help=(
+            "Whisper-Vorverarbeitung (16 kHz Mono) überspringen und Chunks wie bisher "
+            "als MP3 128k exportieren. Nur dann wird die Audiospur eines Videos, wenn möglich, "
+            "ohne Neukodierung kopiert (AAC/MP3/Opus); sonst kodiert die Vorverarbeitung "
+            "ohnehin neu."
+        ),
+    )
+    parser.add_argument(
+        "--audio-codec",
+        choices=["opus", "flac"],
+        default="opus",
+        help="Codec der Whisper-Vorverarbeitung. Standard: opus",
+    )
+    parser.add_argument(
+        "--no-silence-snap",
+        action="store_true",
+        help=(
+            "Chunks fest mit 15 Sek. Überlapp schneiden statt an Sprechpausen "
+            "(ffmpeg silencedetect) ohne Überlapp."
+        ),
+    )
+    parser.add_argument(
+        "--stream-chunks",
+        action="store_true",
+        help=(
+            "Chunks per ffmpeg-Seek lazy schneiden statt die ganze Datei mit pydub "
+            "zu dekodieren (konstanter Speicherbedarf)."
+        ),
+    )
+    parser.add_argument(
+        "--pipe",
+        action="store_true",
+        help=(
+            "Videos einmal als PCM in eine Pipe dekodieren und Chunks direkt daraus kodieren, "
+            "ohne Zwischen-Audiodatei (Pausensuche per RMS). Nicht mit --diarize kombinierbar."
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["openai", "local"],
+        default="openai",
+        help=(
+            "Whisper-Backend: openai (API, Standard) oder local (faster-whisper auf der CPU, "
+            "kein Upload; benötigt pip install faster-whisper)."
+        ),
+    )
+    parser.add_argument(
+        "--local-model",
+        default="large-v3",
+        help="faster-whisper-Modell für --engine local (z.B. large-v3, medium). Standard: large-v3",
+    )
+    parser.add_argument(
+        "--whisper-workers",
+        type=int,
+        default=4,
+        help="Max. gleichzeitige Whisper-Uploads. Standard: 4",
+    )
+    parser.add_argument(
+        "--format-workers",
+        type=int,
+        default=1,
+        help=(
+            "Parallel formatierte Abschnitts-Ketten (Claude). Standard: 1 = strikte Kontinuität "
+            "über den formatierten Vorgänger; bei >1 erhält jeder Kettenanfang das Ende "
+            "des Whisper-Rohtexts als Kontext."
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help=(
+            "Whisper- und Formatierungsaufrufe eines Interviews als asyncio-Coroutinen "
+            "(AsyncOpenAI/AsyncAnthropic) statt in Thread-Pools; Worker-Zahlen gelten als "
+            "Obergrenze pro Anbieter. Konsistenz-Pass und Pseudonymisierung bleiben synchron, "
+            "Batch-Läufe nutzen eine Event-Loop pro Interview."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Verzeichnis des Whisper-Ergebnis-Caches. "
+            "Standard: ~/.cache/masterarbeit-transcribe/whisper"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=500,
+        help="Max. Größe des Whisper-Caches in MB (LRU-Verdrängung). Standard: 500",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Whisper-Cache deaktivieren (jeder Chunk wird hochgeladen).",
+    )
+    parser.add_argument(
+        "--word-timestamps",
+        action="store_true",
+        help=(
+            "Wort-Zeitstempel von Whisper anfordern; Pausen ≥ 3 Sek. werden dann lokal "
+            "als ( …) in den Rohtext eingetragen (Regel 9)."
+        ),
     )
     parser.add_argument(
         "--diarize",
         action="store_true",
         help="Speaker-Diarisierung via pyannote.audio aktivieren (benötigt HF_TOKEN in .env).",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Abgebrochenen Lauf fortsetzen: bereits transkribierte Chunks, formatierte "
+            "Abschnitte und abgeschlossene Stufen aus dem Job-Manifest (<name>.job.json) übernehmen."
+        ),
+    )
+    parser.add_argument(
+        "--formats",
+        type=_export_formats,
+        default=["rtf"],
+        metavar="LISTE",
+        help=(
+            "Ausgabeformate, kommagetrennt: rtf, txt, json, jsonl, docx (benötigt python-docx). "
+            "json/jsonl liest code_transcript.py direkt. Standard: rtf"
+        ),
+    )
+    parser.add_argument(
+        "--prometheus",
+        action="store_true",
+        help=(
+            "Laufbericht zusätzlich im Prometheus-Textformat schreiben (<name>.metrics.prom), "
+            "z.B. für den Textfile-Collector des node_exporter."
+        ),
+    )
+    parser.add_argument(
+        "--openmetrics",
+        action="store_true",
+        help="Veraltet — gleichbedeutend mit --prometheus.",
+    )
     parser.add_argument(
         "--no-pseudonymize",
         action="store_true",
         help="Pseudonymisierung (Claude) überspringen.",
     )
-    args = parser.parse_args()
-
-    # ── Pfade ──────────────────────────────────────────────────────────────────
-    audio_path = Path(args.audio_file)
-    if not audio_path.exists():
-        print(f"\nFehler: Audiodatei nicht gefunden: {audio_path}")
-        sys.exit(1)
+    parser.add_argument(
+        "--pseudonym-registry",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PFAD",
+        help=(
+            "Interviewübergreifendes, verschlüsseltes Pseudonym-Register (SQLite) nutzen: bekannte "
+            "Namen werden lokal ersetzt, neue Codes setzen die Nummerierung fort. Schlüssel in "
+            "PSEUDONYM_REGISTRY_KEY. Standard-Pfad: ~/.local/share/masterarbeit-transcribe/"
+        ),
+    )
 
-    repo_root = Path(__file__).parent.parent.parent
-    output_dir = Path(args.output_dir) if args.output_dir else repo_root / "interviews" / "transcripts"
-    output_path = output_dir / (audio_path.stem + ".rtf")
 
-    print(f"\n{'='*60}")
-    print(f"  Transkriptions-Service — Dresing & Pehl (2017)")
-    print(f"{'='*60}")
-    print(f"  Eingabedatei: {audio_path}")
-    print(f"  Interview-ID: {args.interview_id}")
-    print(f"  Ausgabe     : {output_path}")
-    print(f"{'='*60}\n")
+@dataclass
+class Services:
+    """Zugangsdaten und geteilte Ressourcen, einmal pro Prozess aufgebaut."""
+    openai_key: str
+    anthropic_key: str
+    claude_model: str
+    whisper_cache: Optional[object] = None      # WhisperCache
+    local_whisper: Optional[object] = None      # LocalWhisperClient (--engine local), einmal geladen
+    openai_limiter: Optional[object] = None     # RateLimiter für Whisper
+    anthropic_limiter: Optional[object] = None  # RateLimiter für Claude
+    diarization: Optional[object] = None        # BackgroundDiarization, über Interviews geteilt
+    pseudonym_registry: Optional[object] = None # PseudonymRegistry (--pseudonym-registry)
 
-    # ── Schritt 0: Video → Audio (falls nötig) ────────────────────────────────
-    sys.path.insert(0, str(Path(__file__).parent))
-    from mp4_extractor import is_video_file, MP4Extractor
 
-    if is_video_file(audio_path):
-        print("[0/5] Audiospur aus Video extrahieren...")
-        audio_path = MP4Extractor().extract_audio(
-            video_path=audio_path,
-            output_dir=audio_path.parent,
-        )
-        print()
-
-    # ── Umgebungsvariablen ─────────────────────────────────────────────────────
+def load_services(args: argparse.Namespace, openai_limiter=None, anthropic_limiter=None) -> Services:
+    """Lädt .env, prüft API-Schlüssel, richtet den Whisper-Cache und ggf. das lokale Modell ein."""
     _load_env()
 
-    openai_key = _require_env(
-        "OPENAI_API_KEY",
-        "  Hinweis: OpenAI API-Key erstellen unter: platform.openai.com → API Keys"
-    )
+    openai_key = ""
+    if args.engine == "openai":
+        openai_key = _require_env(
+            "OPENAI_API_KEY",
+            "  Hinweis: OpenAI API-Key erstellen unter: platform.openai.com → API Keys"
+        )
     anthropic_key = _require_env(
         "ANTHROPIC_API_KEY",
         "  Hinweis: Anthropic API-Key erstellen unter: console.anthropic.com → API Keys"
     )
     claude_model = os.environ.get("ANTHROPIC_MODEL", "claude-opus-4-8")
 
-    # ── Imports (nach Env-Check, damit Fehler frühzeitig sichtbar) ───────────
-    from audio_chunker import AudioChunker
+    whisper_cache = None
+    if not args.no_cache:
+        from whisper_cache import WhisperCache, DEFAULT_CACHE_DIR
+        cache_dir = Path(args.cache_dir) if args.cache_dir else DEFAULT_CACHE_DIR
+        whisper_cache = WhisperCache(cache_dir=cache_dir, max_mb=args.cache_max_mb)
+        print(f"  Whisper-Cache: {cache_dir}")
+
+    local_whisper = None
+    if args.engine == "local":
+        from local_whisper_client import LocalWhisperClient
+        local_whisper = LocalWhisperClient(
+            model_size=args.local_model,
+            workers=args.whisper_workers,
+            cache=whisper_cache,
+            word_timestamps=args.word_timestamps,
+        )
+
+    pseudonym_registry = None
+    if args.pseudonym_registry is not None and not args.no_pseudonymize:
+        from pseudonym_registry import DEFAULT_REGISTRY_PATH, PseudonymRegistry
+        registry_key = _require_env(
+            "PSEUDONYM_REGISTRY_KEY",
+            "  Hinweis: Schlüssel erzeugen mit: python3 -c \"from cryptography.fernet import Fernet; "
+            "print(Fernet.generate_key().decode())\""
+        )
+        registry_path = Path(args.pseudonym_registry) if args.pseudonym_registry else DEFAULT_REGISTRY_PATH
+        pseudonym_registry = PseudonymRegistry(registry_path, registry_key)
+        print(f"  Pseudonym-Register: {registry_path}")
+
+    return Services(
+        openai_key=openai_key,
+        anthropic_key=anthropic_key,
+        claude_model=claude_model,
+        whisper_cache=whisper_cache,
+        local_whisper=local_whisper,
+        openai_limiter=openai_limiter,
+        anthropic_limiter=anthropic_limiter,
+        pseudonym_registry=pseudonym_registry,
+    )
+
+
+def start_diarization():
+    """Startet den Diarisierungs-Prozess (BackgroundDiarization); HF_TOKEN aus der Umgebung."""
+    from speaker_diarizer import BackgroundDiarization, SpeakerDiarizer
+    return BackgroundDiarization(SpeakerDiarizer(hf_token=os.environ.get("HF_TOKEN", "")))
+
+
+def output_dir_for(args: argparse.Namespace) -> Path:
+    return Path(args.output_dir) if args.output_dir else REPO_ROOT / "interviews" / "transcripts"
+
+
+def transcribe_file(
+    audio_path: Path,
+    interview_id: str,
+    args: argparse.Namespace,
+    services: Services,
+) -> Path:
+    """
+    Führt die Schritte 0–5 für eine Aufnahme aus und gibt den Pfad der RTF-Datei zurück.
+    Wirft PipelineError, wenn Transkription oder Formatierung fehlschlagen.
+    """
+    from mp4_extractor import is_video_file, MP4Extractor
+    from audio_chunker import AudioChunker, MP3_128K
     from whisper_client import WhisperClient
     from dresing_pehl_formatter import DresingPehlFormatter
-    from rtf_writer import RTFWriter
+    from transcript_model import Transcript, export
+    from chunk_pipeline import ChunkPipeline
+    from async_pipeline import AsyncChunkPipeline
+    from job_manifest import JobManifest
+    from transcript_checks import TranscriptPostFormatter, validate
+    from run_metrics import RunMetrics
+
+    metrics = RunMetrics()
+    source_path = audio_path
+    output_dir = output_dir_for(args)
+    output_path = output_dir / (audio_path.stem + ".rtf")
+    interview_name = audio_path.stem
 
-    # ── Schritt 0b: Speaker-Diarisierung (optional) ───────────────────────────
-    diarization_context = ""
+    print(f"\n{'='*60}")
+    print(f"  Transkriptions-Service — Dresing & Pehl (2017)")
+    print(f"{'='*60}")
+    print(f"  Eingabedatei: {audio_path}")
+    print(f"  Interview-ID: {interview_id}")
+    print(f"  Ausgabe     : {output_path}")
+    print(f"{'='*60}\n")
+
+    # ── Schritt 0: Vorverarbeitung bzw. Video → Audio ─────────────────────────
+    use_pipe = args.pipe and is_video_file(audio_path)
+    if use_pipe and args.diarize:
+        # Die Diarisierung braucht eine Audiodatei auf der Platte
+        print("      Hinweis: --pipe ist mit --diarize nicht kombinierbar — extrahiere Audiodatei.")
+        use_pipe = False
+
+    if use_pipe:
+        print("[0/5] Video wird in Schritt 1 direkt per PCM-Pipe verarbeitet (keine Zwischendatei).")
+        if args.no_preprocess:
+            chunk_format = MP3_128K
+        else:
+            from audio_preprocessor import WHISPER_FORMATS
+            chunk_format = WHISPER_FORMATS[args.audio_codec]
+        # Wie bei der Vorverarbeitung die gemessene statt der nominellen Datenrate
+        with metrics.span("stage.chunk_plan"):
+            bytes_per_minute = AudioChunker(audio_format=chunk_format).measure_bytes_per_minute(audio_path)
+        print()
+    elif not args.no_preprocess:
+        # Audio und Video in einem ffmpeg-Durchlauf auf 16 kHz Mono bringen
+        from audio_preprocessor import AudioPreprocessor
+        print("[0/5] Whisper-Vorverarbeitung (16 kHz Mono)...")
+        preprocessor = AudioPreprocessor(codec=args.audio_codec)
+        with metrics.span("stage.preprocess"):
+            audio_path = preprocessor.preprocess(audio_path, output_dir=audio_path.parent)
+        chunk_format = preprocessor.audio_format
+        bytes_per_minute = preprocessor.bytes_per_minute(audio_path)
+        print()
+    else:
+        if is_video_file(audio_path):
+            print("[0/5] Audiospur aus Video extrahieren...")
+            with metrics.span("stage.extract"):
+                audio_path = MP4Extractor().extract_audio(
+                    video_path=audio_path,
+                    output_dir=audio_path.parent,
+                )
+            print()
+        chunk_format = MP3_128K
+        bytes_per_minute = MP3_128K.nominal_bytes_per_minute()
+
+    fit_seconds = AudioChunker.fit_duration(bytes_per_minute)
+    chunk_seconds = min(args.chunk_minutes * 60, fit_seconds) if args.chunk_minutes else fit_seconds
+
+    # ── Schritt 0b: Speaker-Diarisierung (optional, eigener Prozess) ──────────
+    background = diarization = None
     if args.diarize:
-        from speaker_diarizer import SpeakerDiarizer
-        hf_token = os.environ.get("HF_TOKEN", "")
-        print("[0b/5] Speaker-Diarisierung (pyannote.audio)...")
-        diarizer = SpeakerDiarizer(hf_token=hf_token)
-        segments = diarizer.diarize(audio_path)
-        diarization_context = diarizer.segments_to_context(segments)
+        print("[0b/5] Speaker-Diarisierung (pyannote.audio) im Hintergrund gestartet...")
+        if services.diarization is not None:
+            diarization = services.diarization.submit(audio_path)
+        else:
+            background = start_diarization()
+            diarization = background.submit(audio_path)
         print()
 
     # ── Schritt 1: Audio aufteilen ─────────────────────────────────────────────
     print("[1/5] Audio aufteilen...")
+    print(f"      Chunk-Länge: {chunk_seconds / 60:.1f} Min. "
+          f"(Datenrate {bytes_per_minute / 1024:.0f} KB/Min., "
+          f"max. {fit_seconds / 60:.1f} Min. unter 24 MB)")
     chunker = AudioChunker(
-        chunk_duration=args.chunk_minutes * 60,
+        chunk_duration=chunk_seconds,
         overlap=15,
+        audio_format=chunk_format,
+        snap_to_silence=not args.no_silence_snap,
     )
-    chunks = chunker.split(audio_path)
-    print(f"      → {len(chunks)} Chunk(s) für Verarbeitung bereit.\n")
+    if use_pipe:
+        total_seconds = chunker.probe_duration(audio_path)
+        chunks = chunker.stream_pipe(audio_path)
+        print(f"      → ca. {math.ceil(total_seconds / chunk_seconds)} Chunk(s) (PCM-Pipe).\n")
+    elif args.stream_chunks:
+        with metrics.span("stage.chunk_plan"):
+            total_seconds = chunker.probe_duration(audio_path)
+            spans = chunker.plan(total_seconds, chunker.silences(audio_path, total_seconds))
+        chunks = chunker.stream(audio_path, spans)
+        print(f"      → {len(spans)} Chunk(s) geplant (Streaming via ffmpeg).\n")
+    else:
+        with metrics.span("stage.split"):
+            chunks = chunker.split(audio_path)
+        total_seconds = max(chunk.end_time for chunk in chunks)
+        print(f"      → {len(chunks)} Chunk(s) für Verarbeitung bereit.\n")
 
     # ── Schritt 2: Transkription + Formatierung ────────────────────────────────
-    whisper = WhisperClient(api_key=openai_key)
-    formatter = DresingPehlFormatter(api_key=anthropic_key, model=claude_model)
+    print(f"[2/5] Transkription + Formatierung "
+          f"({args.whisper_workers} Whisper-Worker, {args.format_workers} Formatierungs-Kette(n)"
+          f"{', asyncio' if args.use_async else ''})...")
+    if services.local_whisper is not None:
+        # Das Modell wird über Interviews geteilt, die Messwerte nicht
+        whisper = services.local_whisper.with_metrics(metrics)
+    else:
+        whisper = WhisperClient(
+            api_key=services.openai_key,
+            cache=services.whisper_cache,
+            limiter=services.openai_limiter,
+            word_timestamps=args.word_timestamps,
+            metrics=metrics,
+        )
+    formatter = DresingPehlFormatter(
+        api_key=services.anthropic_key,
+        model=services.claude_model,
+        limiter=services.anthropic_limiter,
+        metrics=metrics,
+    )
 
-    formatted_blocks: list[str] = []
-    previous_context = ""
+    manifest = JobManifest.open(
+        path=output_path.with_suffix(".job.json"),
+        fingerprint={
+            "audio_file": source_path.name,
+            "audio_size": source_path.stat().st_size,
+            "language": args.language,
+            "format_minutes": args.format_minutes,
+            "diarize": args.diarize,
+            "word_timestamps": args.word_timestamps,
+            "engine": whisper.MODEL,
+        },
+        resume=args.resume,
+    )
 
-    total = len(chunks)
-    remaining_chunks = list(chunks)
+    pipeline_class = AsyncChunkPipeline if args.use_async else ChunkPipeline
+    pipeline = pipeline_class(
+        whisper=whisper,
+        formatter=formatter,
+        language=args.language,
+        whisper_workers=args.whisper_workers,
+        format_workers=args.format_workers,
+        format_duration=args.format_minutes * 60,
+        diarization=diarization,
+        manifest=manifest,
+    )
     try:
-        for chunk in chunks:
-            remaining_chunks = remaining_chunks[1:]
-            i = chunk.index
-            print(f"[2/5] Chunk {i + 1}/{total}  ({chunk.start_time / 60:.1f}–{chunk.end_time / 60:.1f} Min.)")
-
-            # Whisper-Transkription
-            print("      Whisper-Transkription...")
-            try:
-                raw = whisper.transcribe(
-                    audio_path=chunk.path,
-                    language=args.language,
-                    time_offset=chunk.start_time,
-                )
-            except Exception as exc:
-                print(f"      FEHLER bei Whisper-Transkription: {exc}")
-                chunk.cleanup()
-                sys.exit(1)
-
-            seg_count = len(raw["segments"])
-            print(f"      → {seg_count} Segment(s) erkannt (Sprache: {raw['language']}).")
-
-            # Dresing & Pehl Formatierung via Claude
-            print("      Formatierung nach Dresing & Pehl (Claude)...")
-            try:
-                formatted = formatter.format_chunk(
-                    raw_segments=raw["segments"],
-                    previous_context=previous_context,
-                    chunk_index=i,
-                    diarization_context=diarization_context,
-                )
-            except Exception as exc:
-                print(f"      FEHLER bei Claude-Formatierung: {exc}")
-                chunk.cleanup()
-                sys.exit(1)
-
-            formatted_blocks.append(formatted)
-            # Letzten ~400 Zeichen als Kontext für nächsten Chunk
-            previous_context = formatted[-400:] if len(formatted) > 400 else formatted
-
-            chunk.cleanup()
-            print(f"      ✓ Chunk {i + 1} abgeschlossen.\n")
+        with metrics.span("stage.transcribe_format"):
+            formatted_blocks = pipeline.run(chunks, total_duration=total_seconds)
     finally:
-        for leftover in remaining_chunks:
-            leftover.cleanup()
+        if background is not None:
+            background.close()
+    print()
 
     # ── Schritt 3: Zusammenführen ──────────────────────────────────────────────
     print("[3/5] Transkript zusammenführen...")
+    post = TranscriptPostFormatter(segments=pipeline.owned_segments())
+    with metrics.span("stage.merge"):
+        formatted_blocks = post.apply(formatted_blocks)
+    print(f"      Lokale Nachformatierung: {post.inserted_timestamps} Zeitmarke(n) ergänzt, "
+          f"{post.removed_sentences} doppelte(r) Satz/Sätze entfernt, "
+          f"{post.separated_paragraphs} Absatz/Absätze getrennt, "
+          f"{post.merged_paragraphs} Beitrag/Beiträge über Grenzen zusammengeführt.")
     full_transcript = "\n\n".join(formatted_blocks)
 
-    if not args.no_finalize:
-        print("      Abschließender Konsistenz-Pass (Claude)...")
+    finalize = args.finalize and not args.no_finalize
+    if finalize and manifest.stage_text("finalize") is not None:
+        print("      Konsistenz-Pass aus Job-Manifest übernommen.")
+        full_transcript = manifest.stage_text("finalize")
+    elif finalize:
+        print(f"      Konsistenz-Pass an {max(0, len(formatted_blocks) - 1)} Abschnittsgrenze(n) (Claude)...")
         try:
-            full_transcript = formatter.finalize(full_transcript)
+            with metrics.span("stage.finalize"):
+                full_transcript = formatter.finalize(formatted_blocks)
+            manifest.set_stage_text("finalize", full_transcript)
         except Exception as exc:
-            print(f"      Warnung: Finalisierung fehlgeschlagen ({exc}). Verwende unfinalisierten Text.")
+            print(f"      Warnung: Finalisierung fehlgeschlagen ({exc}). Verwende lokal nachformatierten Text.")
+    else:
+        print("      (Claude-Konsistenz-Pass nicht angefordert — aktivieren mit --finalize)")
+
+    issues = validate(full_transcript)
+    if issues:
+        print(f"      Lokale Prüfung: {len(issues)} Auffälligkeit(en), z.B.:")
+        for issue in issues[:5]:
+            print(f"        Absatz {issue.paragraph + 1}: {issue.message}")
     else:
-        print("      (Finalisierung übersprungen via --no-finalize)")
+        print("      Lokale Prüfung: keine Auffälligkeiten.")
 
     # ── Schritt 4: Pseudonymisierung ───────────────────────────────────────────
     print("\n[4/5] Pseudonymisierung...")
     mapping_path = output_path.with_suffix(".mapping.json")
-    if not args.no_pseudonymize:
+    if not args.no_pseudonymize and manifest.stage_text("pseudonymize") is not None \
+            and mapping_path.exists():
+        print("      Pseudonymisierung aus Job-Manifest übernommen.")
+        full_transcript = manifest.stage_text("pseudonymize")
+    elif not args.no_pseudonymize:
         from pseudonymizer import Pseudonymizer
         try:
-            pseudo = Pseudonymizer(api_key=anthropic_key, model=claude_model)
-            full_transcript = pseudo.pseudonymize(
-                transcript=full_transcript,
-                interview_id=args.interview_id,
-                mapping_output_path=mapping_path,
+            pseudo = Pseudonymizer(
+                api_key=services.anthropic_key,
+                model=services.claude_model,
+                limiter=services.anthropic_limiter,
+                registry=services.pseudonym_registry,
+                metrics=metrics,
             )
+            with metrics.span("stage.pseudonymize"):
+                full_transcript = pseudo.pseudonymize(
+                    transcript=full_transcript,
+                    interview_id=interview_id,
+                    mapping_output_path=mapping_path,
+                )
+            manifest.set_stage_text("pseudonymize", full_transcript)
             print(f"      ✓ Pseudonymisierung abgeschlossen.\n")
         except Exception as exc:
             print(f"      Warnung: Pseudonymisierung fehlgeschlagen ({exc}). Verwende nicht-pseudonymisierten Text.")
     else:
         print("      (Pseudonymisierung übersprungen via --no-pseudonymize)")
 
-    # ── Schritt 5: RTF-Ausgabe ─────────────────────────────────────────────────
-    print("[5/5] RTF-Datei schreiben...")
-    writer = RTFWriter()
-    writer.write(
-        transcript=full_transcript,
-        output_path=output_path,
-        interview_name=audio_path.stem,
+    # ── Schritt 5: Ausgabe ─────────────────────────────────────────────────────
+    print(f"[5/5] Ausgabe schreiben ({', '.join(args.formats)})...")
+    transcript = Transcript.from_text(
+        full_transcript,
+        interview_id=interview_id,
+        title=interview_name,
+        date=datetime.now().strftime("%d.%m.%Y"),
+    )
+    with metrics.span("stage.export"):
+        written = export(transcript, output_path, args.formats)
+
+    # Laufbericht: nur Zahlen und Dateinamen, keine Transkriptinhalte
+    report_meta = dict(
+        interview_id=interview_id,
+        audio_file=source_path.name,
+        audio_seconds=round(total_seconds, 1),
+        engine=whisper.MODEL,
+        formats=args.formats,
+        resumed=args.resume,
     )
+    metrics_path = output_path.with_suffix(".metrics.json")
+    metrics.write_json(metrics_path, **report_meta)
+    reports = [metrics_path]
+    if args.prometheus or args.openmetrics:
+        reports.append(output_path.with_suffix(".metrics.prom"))
+        metrics.write_prometheus(reports[-1], interview_id=interview_id, engine=whisper.MODEL)
+
+    if output_path not in written:
+        output_path = written[0]
 
     print(f"\n{'='*60}")
     print(f"  Transkription abgeschlossen!")
-    print(f"  Ausgabe: {output_path}")
+    for path in written:
+        print(f"  Ausgabe: {path}")
     if not args.no_pseudonymize and mapping_path.exists():
         print(f"  Zuordnung: {mapping_path}")
+    print(f"  Job-Manifest: {manifest.path} (vertraulich, für --resume)")
+    for path in reports:
+        print(f"  Laufbericht: {path}")
     print(f"{'='*60}")
-    print(f"\n  Nächste Schritte:")
-    print(f"  1. RTF-Datei in MAXQDA importieren")
-    print(f"  2. Transkript manuell gegen Aufnahme gegenhören")
-    print(f"  3. Speaker-Zuweisung (I:/B:) überprüfen und korrigieren")
-    print(f"  4. Pseudonymisierung gegen Zuordnungstabelle prüfen")
-    print()
+    return output_path
 
-    # KI-Nutzung protokollieren
+
+def whisper_tool_name(args: argparse.Namespace) -> str:
+    """Bezeichnung des Whisper-Backends für das KI-Protokoll."""
+    if args.engine == "local":
+        return f"Whisper {args.local_model} lokal (faster-whisper)"
+    return "OpenAI Whisper-1"
+
+
+def log_ki_usage(claude_model: str, interview_id: str, whisper_tool: str = "OpenAI Whisper-1") -> None:
+    """Protokolliert die KI-Nutzung für ein Interview (services/ki_log)."""
     import subprocess
-    ki_log = repo_root / "services" / "ki_log" / "ki_log.py"
+    ki_log = REPO_ROOT / "services" / "ki_log" / "ki_log.py"
     if ki_log.exists():
         subprocess.run(
             [
                 sys.executable, str(ki_log), "add",
                 "--kapitel",  "Kapitel 3, Methodik / Datenerhebung / Transkription",
-                "--tool",     f"OpenAI Whisper-1 + Anthropic Claude ({claude_model})",
-                "--zweck",    f"Automatische Rohtranskription nach Dresing & Pehl (2017); Interview-ID: {args.interview_id}",
+                "--tool",     f"{whisper_tool} + Anthropic Claude ({claude_model})",
+                "--zweck",    f"Automatische Rohtranskription nach Dresing & Pehl (2017); Interview-ID: {interview_id}",
                 "--pruefung", "Manuelles Gegenhören und Korrektur des Transkripts gegen Originalaufnahme",
                 "--einfluss", "Transkriptgrundlage erstellt; inhaltliche Aussagen durch manuelle Korrektur gesichert",
             ],
@@ -300,5 +681,46 @@ def main() -> None:
         )
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Transkription nach Dresing & Pehl (2017) via Whisper + Claude."
+    )
+    parser.add_argument(
+        "audio_file",
+        help="Pfad zur Audiodatei (MP3, WAV, M4A, FLAC, ...)",
+    )
+    parser.add_argument(
+        "--interview-id",
+        default="B",
+        help="Kürzel der befragten Person (z.B. IP-01). Standard: B",
+    )
+    add_pipeline_arguments(parser)
+    args = parser.parse_args()
+
+    audio_path = Path(args.audio_file)
+    if not audio_path.exists():
+        print(f"\nFehler: Audiodatei nicht gefunden: {audio_path}")
+        sys.exit(1)
+
+    from chunk_pipeline import PipelineError
+
+    services = load_services(args)
+    try:
+        transcribe_file(audio_path, args.interview_id, args, services)
+    except PipelineError as exc:
+        print(f"      FEHLER bei {exc}")
+        sys.exit(1)
+
+    print(f"\n  Nächste Schritte:")
+    print(f"  1. RTF-Datei in MAXQDA importieren")
+    print(f"  2. Transkript manuell gegen Aufnahme gegenhören")
+    print(f"  3. Speaker-Zuweisung (I:/B:) überprüfen und korrigieren")
+    print(f"  4. Pseudonymisierung gegen Zuordnungstabelle prüfen")
+    print()
+
+    # KI-Nutzung protokollieren
+    log_ki_usage(services.claude_model, args.interview_id, whisper_tool_name(args))
+
+
 if __name__ == "__main__":
     main()
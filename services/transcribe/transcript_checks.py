@@ -0,0 +1,271 @@
+"""
+Lokale Prüfungen für formatierte Transkripte nach Dresing & Pehl (2017).
+
+Prüft die mechanischen Regeln ohne API-Aufruf: jeder Absatz beginnt mit einer
+Sprecherkennzeichnung (I:, B:, B1:, ...), endet mit einer Zeitmarke #HH:MM:SS#
+(und enthält keine weitere), Zeitmarken laufen nicht rückwärts, und zwischen zwei
+Sprechern steht eine Leerzeile.
+Wird vom Finalisierungs-Pass genutzt, um Claude-Korrekturen an Abschnittsgrenzen
+abzusichern, und zum Abschluss für eine Übersicht verbleibender Auffälligkeiten.
+
+TranscriptPostFormatter behebt die mechanischen Fehler direkt (Absätze, Zeitmarken,
+Doppelungen an Abschnittsgrenzen) und läuft in Millisekunden; der Claude-Konsistenz-Pass
+ist damit nur noch optional (--finalize).
+"""
+
+import re
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+TIMESTAMP = re.compile(r"#(\d{2}):(\d{2}):(\d{2})#")
+END_TIMESTAMP = re.compile(r"#(\d{2}):(\d{2}):(\d{2})#\s*$")
+# Nur die Kennzeichnungen, die die Pipeline erzeugt (Formatierung bzw. Pseudonymisierung);
+# gewöhnliche Zeilen wie "Fazit: …" oder "Erstens: …" sind kein Sprecherwechsel.
+_SPEAKER = re.compile(r"^(I|B\d*|KP-\d+|\(Interviewer\)):\s")
+
+
+class Issue(NamedTuple):
+    paragraph: int   # 0-basierter Absatz-Index
+    message: str
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Zerlegt ein Transkript an Leerzeilen in Absätze (ohne leere Absätze)."""
+    return [p.strip() for p in PARAGRAPH_BREAK.split(text.strip()) if p.strip()]
+
+
+def join_paragraphs(paragraphs: List[str]) -> str:
+    return "\n\n".join(paragraphs)
+
+
+def timestamp_seconds(match: "re.Match") -> int:
+    h, m, s = (int(g) for g in match.groups())
+    return h * 3600 + m * 60 + s
+
+
+def paragraph_end_time(paragraph: str) -> Optional[int]:
+    """Zeitmarke am Absatzende in Sekunden, falls vorhanden."""
+    match = END_TIMESTAMP.search(paragraph)
+    return timestamp_seconds(match) if match else None
+
+
+def speaker_of(paragraph: str) -> Optional[str]:
+    match = _SPEAKER.match(paragraph)
+    return match.group(1) if match else None
+
+
+def split_label(paragraph: str) -> Tuple[str, str]:
+    """Trennt 'B: Text' in ('B: ', 'Text')."""
+    match = _SPEAKER.match(paragraph)
+    return (paragraph[:match.end()], paragraph[match.end():]) if match else ("", paragraph)
+
+
+def validate(transcript: Union[str, List[str]]) -> List[Issue]:
+    """
+    Prüft Absätze auf Sprecherkennzeichnung, Zeitmarke am Ende, Zeitmarken mitten im
+    Absatz, monotone Zeitmarken und fehlende Leerzeilen zwischen Sprechern. Gibt die gefundenen Auffälligkeiten zurück.
+    """
+    paragraphs = split_paragraphs(transcript) if isinstance(transcript, str) else transcript
+    issues: List[Issue] = []
+    last_time = -1
+    for i, paragraph in enumerate(paragraphs):
+        if speaker_of(paragraph) is None:
+            issues.append(Issue(i, "keine Sprecherkennzeichnung"))
+        lines = paragraph.splitlines()
+        if any(_SPEAKER.match(line) for line in lines[1:]):
+            issues.append(Issue(i, "Sprecherwechsel ohne Leerzeile"))
+        end_time = paragraph_end_time(paragraph)
+        if len(TIMESTAMP.findall(paragraph)) > (end_time is not None):
+            issues.append(Issue(i, "Zeitmarke mitten im Absatz"))
+        if end_time is None:
+            issues.append(Issue(i, "keine Zeitmarke am Absatzende"))
+        elif end_time < last_time:
+            issues.append(Issue(i, "Zeitmarke läuft rückwärts"))
+        if end_time is not None:
+            last_time = max(last_time, end_time)
+    return issues
+
+
+# ── Lokale Nachformatierung ───────────────────────────────────────────────────
+
+_LOOSE_TIMESTAMP = re.compile(r"#(\d{1,2}):(\d{1,2}):(\d{1,2})#")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_WORD = re.compile(r"\w+")
+
+# Wortanzahl pro Shingle für die Doppelungserkennung an Abschnittsgrenzen
+SHINGLE_WORDS = 6
+# Wörter am Ende des vorherigen Blocks, gegen die der Folgeblock geprüft wird
+SEAM_WORDS = 150
+# Whisper-Segmente, die beim Zuordnen einer fehlenden Zeitmarke durchsucht werden
+_LOOKAHEAD_SEGMENTS = 40
+
+_HASH_BASE = 1_000_003
+_HASH_MOD = (1 << 61) - 1
+
+
+def format_timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"#{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}#"
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(TIMESTAMP.sub(" ", text).casefold())
+
+
+def _shingle_hashes(words: List[str], k: int = SHINGLE_WORDS) -> List[int]:
+    """Rabin-Karp-Hashes aller k-Wort-Folgen (rollierend, stabil über Prozesse)."""
+    if len(words) < k:
+        return []
+    ids = [zlib.crc32(w.encode("utf-8")) for w in words]
+    top = pow(_HASH_BASE, k - 1, _HASH_MOD)
+    h = 0
+    for word_id in ids[:k]:
+        h = (h * _HASH_BASE + word_id) % _HASH_MOD
+    hashes = [h]
+    for i in range(k, len(ids)):
+        h = ((h - ids[i - k] * top) * _HASH_BASE + ids[i]) % _HASH_MOD
+        hashes.append(h)
+    return hashes
+
+
+class TranscriptPostFormatter:
+    """
+    Deterministische Nachformatierung der formatierten Blöcke ohne API-Aufruf:
+    - Absätze normalisieren (Sprecherwechsel ohne Leerzeile trennen, Leerraum,
+      Zeitmarken auf #HH:MM:SS# auffüllen)
+    - Doppelte Sätze am Anfang eines Blocks entfernen, die schon am Ende des
+      vorherigen Blocks stehen (rollierende Hashes über Wort-Shingles)
+    - Einen über die Blockgrenze laufenden Beitrag desselben Sprechers zusammenführen
+    - Fehlende Zeitmarken am Absatzende aus den Whisper-Segmentzeiten ergänzen
+    """
+
+    def __init__(self, segments: Optional[List[Dict[str, Any]]] = None):
+        """
+        segments: Whisper-Segmente der ganzen Aufnahme (globale Zeiten, sortiert)
+        """
+        self.segments = sorted(segments or [], key=lambda seg: seg["start"])
+        self.removed_sentences = 0
+        self.merged_paragraphs = 0
+        self.separated_paragraphs = 0
+        self.inserted_timestamps = 0
+
+    def apply(self, blocks: List[str]) -> List[str]:
+        parts = [self.normalize(split_paragraphs(block)) for block in blocks]
+        parts = [paragraphs for paragraphs in parts if paragraphs]
+
+        for i in range(1, len(parts)):
+            parts[i] = self.dedup_seam(parts[i - 1], parts[i])
+            if parts[i] and parts[i - 1]:
+                self._merge_across_seam(parts[i - 1], parts[i])
+
+        self._insert_timestamps(parts)
+        return [join_paragraphs(paragraphs) for paragraphs in parts if paragraphs]
+
+    def normalize(self, paragraphs: List[str]) -> List[str]:
+        result = []
+        for paragraph in paragraphs:
+            lines = [re.sub(r"[ \t]+", " ", line).strip() for line in paragraph.splitlines()]
+            current: List[str] = []
+            for line in lines:
+                if not line:
+                    continue
+                if current and _SPEAKER.match(line):
+                    result.append("\n".join(current))
+                    self.separated_paragraphs += 1
+                    current = []
+                current.append(_LOOSE_TIMESTAMP.sub(
+                    lambda m: format_timestamp(timestamp_seconds(m)), line
+                ))
+            if current:
+                result.append("\n".join(current))
+        return result
+
+    def dedup_seam(self, previous: List[str], following: List[str]) -> List[str]:
+        """
+        Entfernt führende Sätze aus `following`, die vollständig im Ende von `previous`
+        vorkommen. Sätze unter drei Wörtern gelten nie als Doppelung.
+        """
+        tail_words = [w for p in previous for w in _words(split_label(p)[1])][-SEAM_WORDS:]
+        tail_hashes = set(_shingle_hashes(tail_words))
+        tail_joined = f" {' '.join(tail_words)} "
+
+        following = list(following)
+        while following:
+            label, body = split_label(following[0])
+            end_match = END_TIMESTAMP.search(body)
+            stamp = body[end_match.start():].strip() if end_match else ""
+            text = body[:end_match.start()] if end_match else body
+            sentences = _SENTENCE_END.split(text.strip())
+
+            kept = list(sentences)
+            while kept and self._is_duplicate(kept[0], tail_hashes, tail_joined):
+                kept.pop(0)
+                self.removed_sentences += 1
+            if kept:
+                if len(kept) < len(sentences):
+                    rest = " ".join(kept)
+                    following[0] = f"{label}{rest} {stamp}".rstrip()
+                return following
+            following.pop(0)
+        return following
+
+    @staticmethod
+    def _is_duplicate(sentence: str, tail_hashes: set, tail_joined: str) -> bool:
+        words = _words(sentence)
+        if len(words) < 3:
+            return False
+        if len(words) < SHINGLE_WORDS:
+            return f" {' '.join(words)} " in tail_joined
+        return all(h in tail_hashes for h in _shingle_hashes(words))
+
+    def _merge_across_seam(self, previous: List[str], following: List[str]) -> None:
+        """
+        Gleicher Sprecher am Ende von Block N und Anfang von N+1 → ein Absatz. Die
+        Zeitmarke des ersten Teils entfällt; es gilt die am Ende des Folgeabsatzes.
+        """
+        label = speaker_of(previous[-1])
+        if label is None or label != speaker_of(following[0]):
+            return
+        head = END_TIMESTAMP.sub("", previous[-1]).rstrip()
+        previous[-1] = f"{head} {split_label(following.pop(0))[1]}"
+        self.merged_paragraphs += 1
+
+    def _insert_timestamps(self, parts: List[List[str]]) -> None:
+        """Ergänzt fehlende Absatz-Zeitmarken anhand der Whisper-Segmente."""
+        if not self.segments:
+            return
+        cursor = 0
+        last_time = 0.0
+        count = len(self.segments)
+        for paragraphs in parts:
+            for i, paragraph in enumerate(paragraphs):
+                end_time = paragraph_end_time(paragraph)
+                if end_time is not None:
+                    while cursor < count - 1 and self.segments[cursor]["end"] <= end_time:
+                        cursor += 1
+                    last_time = max(last_time, end_time)
+                    continue
+
+                j = self._find_segment(_words(split_label(paragraph)[1]), cursor)
+                seconds = max(self.segments[j]["end"], last_time)
+                paragraphs[i] = f"{paragraph} {format_timestamp(seconds)}"
+                self.inserted_timestamps += 1
+                last_time = seconds
+                cursor = min(j + 1, count - 1)
+
+    def _find_segment(self, words: List[str], cursor: int) -> int:
+        """
+        Segment, in dem der Absatz endet: erstes Segment ab `cursor`, das die letzten
+        Wörter des Absatzes enthält; sonst das Segment am Cursor.
+        """
+        if not words:
+            return cursor
+        needle = f" {' '.join(words[-2:])} "
+        previous = ""
+        for j in range(cursor, min(cursor + _LOOKAHEAD_SEGMENTS, len(self.segments))):
+            current = " ".join(_words(self.segments[j]["text"]))
+            if needle in f" {previous} {current} " and words[-1] in current.split():
+                return j
+            previous = current
+        return cursor
@@ -0,0 +1,156 @@
+"""
+Strukturiertes Zwischenformat des fertigen Transkripts und Exporter.
+
+Das formatierte Transkript (Absätze "B: Text #HH:MM:SS#") wird einmal in Absätze mit
+Sprecher, Text und Zeitmarke zerlegt; daraus schreiben die Exporter RTF (MAXQDA),
+Klartext, JSON, JSONL und optional DOCX. JSON/JSONL liest code_transcript.py direkt,
+ohne den Umweg über RTF und striprtf.
+
+JSON:  {"interview_id", "title", "date", "paragraphs": [{"speaker", "role", "text", "timestamp"}]}
+JSONL: ein Absatz pro Zeile ({"index", "speaker", "role", "text", "timestamp"})
+
+"role" ordnet die Sprecherkennzeichnung ein: "interviewer" (I, (Interviewer)),
+"interviewee" (B, B1, ...), "other" (übrige Kennzeichnungen, z.B. KP-xx) oder ""
+ohne Kennzeichnung. Nachgelagerte Werkzeuge filtern danach statt nach dem Label.
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from transcript_checks import END_TIMESTAMP, join_paragraphs, split_label, split_paragraphs
+
+
+_INTERVIEWER = re.compile(r"^(?:I|\(Interviewer\))$")
+_INTERVIEWEE = re.compile(r"^B\d*$")
+
+
+def speaker_role(speaker: str) -> str:
+    """Rolle einer Sprecherkennzeichnung: interviewer, interviewee, other oder ""."""
+    if not speaker:
+        return ""
+    if _INTERVIEWER.match(speaker):
+        return "interviewer"
+    if _INTERVIEWEE.match(speaker):
+        return "interviewee"
+    return "other"
+
+
+@dataclass
+class Paragraph:
+    speaker: str     # z.B. "I", "B", "B1"; leer, falls keine Sprecherkennzeichnung
+    role: str        # speaker_role(speaker)
+    text: str        # Absatztext ohne Sprecher und abschließende Zeitmarke
+    timestamp: str   # "HH:MM:SS" am Absatzende, leer falls nicht vorhanden
+
+    def to_text(self) -> str:
+        parts = [f"{self.speaker}: {self.text}" if self.speaker else self.text]
+        if self.timestamp:
+            parts.append(f"#{self.timestamp}#")
+        return " ".join(parts)
+
+
+@dataclass
+class Transcript:
+    interview_id: str
+    title: str
+    date: str
+    paragraphs: List[Paragraph] = field(default_factory=list)
+
+    @classmethod
+    def from_text(cls, text: str, interview_id: str, title: str, date: str) -> "Transcript":
+        """Zerlegt das formatierte Transkript an Leerzeilen in Absätze."""
+        paragraphs = []
+        for raw in split_paragraphs(text):
+            label, body = split_label(raw)
+            match = END_TIMESTAMP.search(body)
+            timestamp = ""
+            if match:
+                timestamp = ":".join(match.groups())
+                body = body[:match.start()]
+            speaker = label.strip().rstrip(":")
+            paragraphs.append(Paragraph(speaker, speaker_role(speaker), body.strip(), timestamp))
+        return cls(interview_id, title, date, paragraphs)
+
+    def to_text(self) -> str:
+        return join_paragraphs([p.to_text() for p in self.paragraphs])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interview_id": self.interview_id,
+            "title": self.title,
+            "date": self.date,
+            "paragraphs": [asdict(p) for p in self.paragraphs],
+        }
+
+
+# ── Exporter ─────────────────────────────────────────────────────────────────
+
+def export_rtf(transcript: Transcript, path: Path) -> None:
+    from rtf_writer import RTFWriter
+    RTFWriter().write(
+        transcript=transcript.to_text(),
+        output_path=path,
+        interview_name=transcript.title,
+        date_str=transcript.date,
+    )
+
+
+def export_txt(transcript: Transcript, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{transcript.title}\nDatum: {transcript.date}\n\n")
+        for i, paragraph in enumerate(transcript.paragraphs):
+            f.write(("\n\n" if i else "") + paragraph.to_text())
+        f.write("\n")
+
+
+def export_json(transcript: Transcript, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(transcript.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def export_jsonl(transcript: Transcript, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i, paragraph in enumerate(transcript.paragraphs, start=1):
+            f.write(json.dumps({"index": i, **asdict(paragraph)}, ensure_ascii=False) + "\n")
+
+
+def export_docx(transcript: Transcript, path: Path) -> None:
+    try:
+        import docx
+    except ImportError:
+        raise RuntimeError(
+            "python-docx ist nicht installiert (für --formats docx). Bitte ausführen:\n"
+            "  pip install python-docx"
+        )
+    document = docx.Document()
+    document.add_heading(transcript.title, level=1)
+    document.add_paragraph(f"Datum: {transcript.date}")
+    for paragraph in transcript.paragraphs:
+        document.add_paragraph(paragraph.to_text())
+    document.save(str(path))
+
+
+EXPORTERS: Dict[str, Callable[[Transcript, Path], None]] = {
+    "rtf": export_rtf,
+    "txt": export_txt,
+    "json": export_json,
+    "jsonl": export_jsonl,
+    "docx": export_docx,
+}
+
+
+def export(transcript: Transcript, output_path: Path, formats: List[str]) -> List[Path]:
+    """
+    Schreibt das Transkript in alle gewünschten Formate (Endung je Format, Basis output_path).
+    Gibt die geschriebenen Dateien zurück.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name in formats:
+        path = output_path.with_suffix(f".{name}")
+        EXPORTERS[name](transcript, path)
+        written.append(path)
+    return written
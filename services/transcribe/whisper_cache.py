@@ -0,0 +1,107 @@
+"""
+Persistenter Cache für Whisper-Transkriptionen.
+
+Schlüssel ist ein SHA-256 über die Bytes der Chunk-Datei plus Sprache und Modell.
+Gespeichert wird das Ergebnis ohne Zeitversatz (Timestamps relativ zum Chunk), damit
+derselbe Chunk auch an anderer Position wiederverwendet werden kann. Die Größe ist
+begrenzt; bei Überschreitung werden die am längsten nicht genutzten Einträge (LRU
+über die Datei-mtime) gelöscht.
+
+Der Cache enthält Klartext aus Interviews und liegt deshalb standardmäßig außerhalb
+des Repositorys (~/.cache/masterarbeit-transcribe/whisper).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "masterarbeit-transcribe" / "whisper"
+
+# Temporäre Dateien von put(); ältere gelten als Reste abgebrochener Läufe
+_TMP_PREFIX = ".tmp_"
+_TMP_SUFFIX = ".tmp"
+_STALE_TMP_SECONDS = 3600
+
+
+class WhisperCache:
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_mb: int = 500):
+        """
+        cache_dir: Verzeichnis für die Cache-Einträge (wird angelegt)
+        max_mb:    Obergrenze der Cache-Größe in MB
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(audio_path: Path, language: str, model: str) -> str:
+        """Inhaltsbasierter Schlüssel aus Audio-Bytes, Sprache und Modell."""
+        digest = hashlib.sha256()
+        with open(audio_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(f"\0{language}\0{model}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)  # als zuletzt genutzt markieren
+        except FileNotFoundError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        # Atomar schreiben, damit parallele Worker nie halbe Einträge lesen. Die Endung
+        # .tmp hält die Datei aus dem Glob von _evict() heraus, bis sie umbenannt ist.
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=_TMP_PREFIX, suffix=_TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            # Reste abgebrochener put()-Aufrufe aufräumen (laufende sind jünger)
+            stale = time.time() - _STALE_TMP_SECONDS
+            for path in self.cache_dir.glob(f"{_TMP_PREFIX}*{_TMP_SUFFIX}"):
+                try:
+                    if path.stat().st_mtime < stale:
+                        path.unlink()
+                except FileNotFoundError:
+                    continue
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
@@ -1,22 +1,47 @@
 """
 OpenAI Whisper API-Client für Transkriptions-Service.
-Transkribiert Audiochunks mit Segment-Level-Timestamps.
+Transkribiert Audiochunks mit Segment-Level-Timestamps, optional zusätzlich mit
+Wort-Timestamps (als kompakte WordTimeline unter 'words').
+Optional mit WhisperCache: unveränderte Chunks werden nicht erneut hochgeladen.
+WhisperEngine ist die gemeinsame Schnittstelle der Backends (lokale Variante ohne
+Upload: local_whisper_client.py).
 """
 
+import asyncio
+import copy
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+from run_metrics import RunMetrics
+from word_timeline import WordTimeline, decode_result, encode_result
 
-class WhisperClient:
-    def __init__(self, api_key: str):
-        try:
-            from openai import OpenAI
-        except ImportError:
-            raise RuntimeError(
-                "openai ist nicht installiert. Bitte ausführen:\n"
-                "  pip install -r services/transcribe/requirements.txt"
-            )
-        self._client = OpenAI(api_key=api_key)
+
+class WhisperEngine(ABC):
+    """
+    Gemeinsame Schnittstelle aller Whisper-Backends (OpenAI-API, lokal).
+    Unterklassen setzen MODEL und implementieren _request() (optional _arequest()
+    für echte Async-I/O); Cache-Zugriff und Zeitversatz übernehmen transcribe()
+    und atranscribe().
+    """
+    MODEL = ""
+
+    def __init__(self, cache=None, word_timestamps: bool = False, metrics=None):
+        """
+        cache:           optionaler WhisperCache (Schlüssel: Audio-Bytes + Sprache + Modell)
+        word_timestamps: zusätzlich Wort-Zeitstempel liefern (Ergebnis-Schlüssel 'words')
+        metrics:         optionales RunMetrics (Spans whisper.request, Cache-Treffer)
+        """
+        self.cache = cache
+        self.word_timestamps = word_timestamps
+        self.metrics = metrics or RunMetrics()
+
+    def with_metrics(self, metrics) -> "WhisperEngine":
+        """Kopie, die in `metrics` zählt; Modell bzw. API-Client werden geteilt."""
+        clone = copy.copy(self)
+        clone.metrics = metrics
+        return clone
 
     def transcribe(
         self,
@@ -25,43 +50,160 @@ class WhisperClient:
         time_offset: float = 0.0,
     ) -> Dict[str, Any]:
         """
-        Transkribiert eine Audiodatei via OpenAI Whisper API.
+        Transkribiert eine Audiodatei.
         time_offset: Zeitversatz in Sekunden (für Chunks: Startzeit des Chunks)
 
         Gibt Dict zurück mit:
           - 'text': vollständiger Rohtext
           - 'segments': Liste mit {start, end, text} (Timestamps global adjustiert)
           - 'language': erkannte Sprache
+          - 'words': WordTimeline (nur mit word_timestamps, Timestamps global adjustiert)
         """
-        client = self._client
-
-        with open(audio_path, "rb") as f:
-            response = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=f,
-                language=language,
-                response_format="verbose_json",
-                timestamp_granularities=["segment"],
+        key, result = self._cached(audio_path, language)
+        if result is None:
+            with self.metrics.span("whisper.request"):
+                result = self._request(audio_path, language)
+            self._store(key, result)
+        return self._shift(result, time_offset)
+
+    async def atranscribe(
+        self,
+        audio_path: Path,
+        language: str = "de",
+        time_offset: float = 0.0,
+    ) -> Dict[str, Any]:
+        """Wie transcribe(), für die asyncio-Pipeline (Datei-I/O im Thread)."""
+        key, result = await asyncio.to_thread(self._cached, audio_path, language)
+        if result is None:
+            with self.metrics.span("whisper.request"):
+                result = await self._arequest(audio_path, language)
+            await asyncio.to_thread(self._store, key, result)
+        return self._shift(result, time_offset)
+
+    def _cached(self, audio_path: Path, language: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        if self.cache is None:
+            return "", None
+        key = self.cache.key(audio_path, language, self.cache_model)
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, None
+        self.metrics.add("whisper.cache_hits")
+        return key, decode_result(cached)
+
+    def _store(self, key: str, result: Dict[str, Any]) -> None:
+        if self.cache is not None:
+            self.cache.put(key, encode_result(result))
+
+    @staticmethod
+    def _shift(result: Dict[str, Any], time_offset: float) -> Dict[str, Any]:
+        shifted = {
+            "text": result["text"],
+            "segments": [
+                {**seg, "start": seg["start"] + time_offset, "end": seg["end"] + time_offset}
+                for seg in result["segments"]
+            ],
+            "language": result["language"],
+        }
+        if "words" in result:
+            shifted["words"] = result["words"].shifted(time_offset)
+        return shifted
+
+    @property
+    def cache_model(self) -> str:
+        """Modellkennung im Cache-Schlüssel; Wort-Timestamps ergeben eigene Einträge."""
+        return self.MODEL + ("+words" if self.word_timestamps else "")
+
+    @abstractmethod
+    def _request(self, audio_path: Path, language: str) -> Dict[str, Any]:
+        """Backend-Aufruf; Timestamps relativ zum Dateianfang."""
+
+    async def _arequest(self, audio_path: Path, language: str) -> Dict[str, Any]:
+        """Asynchroner Backend-Aufruf; ohne eigene Async-Variante im Worker-Thread."""
+        return await asyncio.to_thread(self._request, audio_path, language)
+
+
+class WhisperClient(WhisperEngine):
+    MODEL = "whisper-1"
+
+    def __init__(
+        self,
+        api_key: str,
+        cache=None,
+        limiter=None,
+        word_timestamps: bool = False,
+        metrics=None,
+    ):
+        """
+        cache:           optionaler WhisperCache (Schlüssel: Audio-Bytes + Sprache + Modell)
+        limiter:         optionaler RateLimiter, geteilt mit anderen Clients desselben Anbieters
+        word_timestamps: zusätzlich Wort-Zeitstempel anfordern (Ergebnis-Schlüssel 'words')
+        metrics:         optionales RunMetrics (zusätzlich whisper.upload_bytes)
+        """
+        super().__init__(cache=cache, word_timestamps=word_timestamps, metrics=metrics)
+        try:
+            from openai import OpenAI
+        except ImportError:
+            raise RuntimeError(
+                "openai ist nicht installiert. Bitte ausführen:\n"
+                "  pip install -r services/transcribe/requirements.txt"
+            )
+        self._client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self._async_client = None   # AsyncOpenAI, erst in der asyncio-Pipeline angelegt
+        self._limiter = limiter or nullcontext()
+
+    def _request(self, audio_path: Path, language: str) -> Dict[str, Any]:
+        """Whisper-API-Aufruf; Timestamps relativ zum Dateianfang."""
+        with self._limiter, open(audio_path, "rb") as f:
+            response = self._client.audio.transcriptions.create(file=f, **self._request_args(language))
+        self.metrics.add("whisper.upload_bytes", audio_path.stat().st_size)
+        return self._parse(response)
+
+    async def _arequest(self, audio_path: Path, language: str) -> Dict[str, Any]:
+        """Whisper-API-Aufruf über den AsyncOpenAI-Client."""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+        audio = await asyncio.to_thread(audio_path.read_bytes)
+        async with self._limiter:
+            response = await self._async_client.audio.transcriptions.create(
+                file=(audio_path.name, audio), **self._request_args(language)
             )
+        self.metrics.add("whisper.upload_bytes", len(audio))
+        return self._parse(response)
 
+    def _request_args(self, language: str) -> Dict[str, Any]:
+        return {
+            "model": self.MODEL,
+            "language": language,
+            "response_format": "verbose_json",
+            "timestamp_granularities": ["segment", "word"] if self.word_timestamps else ["segment"],
+        }
+
+    def _parse(self, response) -> Dict[str, Any]:
         segments: List[Dict[str, Any]] = []
         if hasattr(response, "segments") and response.segments:
             for seg in response.segments:
                 segments.append({
-                    "start": seg.start + time_offset,
-                    "end": seg.end + time_offset,
+                    "start": seg.start,
+                    "end": seg.end,
                     "text": seg.text.strip(),
                 })
         else:
             # Fallback: kein Segment-Timestamp verfügbar — gesamten Text als ein Segment
             segments.append({
-                "start": time_offset,
-                "end": time_offset,
+                "start": 0.0,
+                "end": 0.0,
                 "text": response.text.strip(),
             })
 
-        return {
+        result = {
             "text": response.text,
             "segments": segments,
             "language": getattr(response, "language", "de"),
         }
+        if self.word_timestamps:
+            result["words"] = WordTimeline.from_words(
+                (w.word, w.start, w.end) for w in (getattr(response, "words", None) or [])
+            )
+        return result
@@ -0,0 +1,125 @@
+"""
+Kompakte Wort-Zeitstempel für Whisper-Ergebnisse.
+
+Mit --word-timestamps liefert Whisper für jedes Wort Start und Ende. Statt tausender
+kleiner Dicts liegen die Wörter spaltenweise vor: zwei array('d') für Start- und
+Endzeiten und ein Offset-Array in einen gemeinsamen Text-Puffer (Wort i ist
+text[offsets[i]:offsets[i + 1]]). Daraus lassen sich Pausen nach Regel 9 (≥ 3 Sek.)
+lokal bestimmen und als ( …) in den Rohtext eintragen.
+
+Für Cache und Job-Manifest wird die Struktur als JSON-Dict gespeichert
+(encode_result / decode_result).
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Mindestlänge einer Pause nach Dresing & Pehl, Regel 9
+PAUSE_SECONDS = 3.0
+PAUSE_MARKER = "( …)"
+
+
+class WordTimeline:
+    def __init__(self, text: str = "", offsets=None, starts=None, ends=None):
+        self.text = text
+        self.offsets = array("L", offsets if offsets is not None else [0])
+        self.starts = array("d", starts or [])
+        self.ends = array("d", ends or [])
+
+    @classmethod
+    def from_words(cls, words: Iterable[Tuple[str, float, float]]) -> "WordTimeline":
+        """Baut die Zeitachse aus (wort, start, ende)-Tupeln in zeitlicher Reihenfolge."""
+        timeline = cls()
+        parts: List[str] = []
+        position = 0
+        for word, start, end in words:
+            word = word.strip()
+            parts.append(word)
+            position += len(word)
+            timeline.offsets.append(position)
+            timeline.starts.append(start)
+            timeline.ends.append(end)
+        timeline.text = "".join(parts)
+        return timeline
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def word(self, i: int) -> str:
+        return self.text[self.offsets[i]:self.offsets[i + 1]]
+
+    def shifted(self, offset: float) -> "WordTimeline":
+        """Kopie mit um `offset` Sekunden verschobenen Zeiten (Chunk → globale Zeit)."""
+        return WordTimeline(
+            self.text,
+            self.offsets,
+            array("d", (t + offset for t in self.starts)),
+            array("d", (t + offset for t in self.ends)),
+        )
+
+    def index_range(self, start: float, end: float) -> range:
+        """Indizes der Wörter, die in [start, end) beginnen."""
+        return range(bisect_left(self.starts, start), bisect_left(self.starts, end))
+
+    def pauses(self, min_gap: float = PAUSE_SECONDS) -> List[int]:
+        """Indizes i, vor deren Wort eine Pause von mindestens `min_gap` Sekunden liegt."""
+        return [
+            i for i in range(1, len(self.starts))
+            if self.starts[i] - self.ends[i - 1] >= min_gap
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "offsets": self.offsets.tolist(),
+            "starts": self.starts.tolist(),
+            "ends": self.ends.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WordTimeline":
+        return cls(data["text"], data["offsets"], data["starts"], data["ends"])
+
+
+def encode_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Whisper-Ergebnis JSON-tauglich machen (WordTimeline → Dict)."""
+    if isinstance(result.get("words"), WordTimeline):
+        return {**result, "words": result["words"].to_dict()}
+    return result
+
+
+def decode_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Gegenstück zu encode_result."""
+    if isinstance(result.get("words"), dict):
+        return {**result, "words": WordTimeline.from_dict(result["words"])}
+    return result
+
+
+def mark_pauses(
+    segments: List[Dict[str, Any]],
+    words: WordTimeline,
+    min_gap: float = PAUSE_SECONDS,
+) -> List[Dict[str, Any]]:
+    """
+    Trägt Pausen ≥ min_gap als ( …) in den Segmenttext ein (Kopien der Segmente).
+    Die Position im Segment ergibt sich aus der Anzahl der Wörter, die im Segment
+    vor der Pause beginnen.
+    """
+    pause_starts = [words.starts[i] for i in words.pauses(min_gap)]
+    if not pause_starts:
+        return segments
+
+    marked = []
+    for seg in segments:
+        inside = [t for t in pause_starts if seg["start"] <= t < seg["end"]]
+        if not inside:
+            marked.append(seg)
+            continue
+        tokens = seg["text"].split()
+        # Von hinten einfügen, damit frühere Positionen gültig bleiben
+        for t in reversed(inside):
+            position = len(words.index_range(seg["start"], t))
+            tokens.insert(min(position, len(tokens)), PAUSE_MARKER)
+        marked.append({**seg, "text": " ".join(tokens)})
+    return marked